@@ -0,0 +1,235 @@
+# benchmarks/bench_checklist_results.py
+"""
+계약서 체크리스트 결과 조회 방식 비교 벤치마크.
+
+- legacy: 계약서-결과-체크리스트-값 4중 LEFT JOIN (값 행마다 계약서 컬럼 반복)
+- flat:   계약서 행 + 결과-값 JOIN 행 (2회 조회)
+- nested: 계약서 행 + 결과당 한 행, 값은 JSON_ARRAYAGG (2회 조회)
+
+합성 계약서(기본 결과 100개 × 값 20개)를 만들어 측정한 뒤 삭제합니다.
+측정하는 동안 합성 체크리스트 문항이 공용 checklist 테이블에 들어가 사용자에게도 보이므로,
+운영 DB나 다른 사람이 함께 쓰는 DB에서는 실행하지 마세요. database.py가 가리키는 DB에
+쓴다는 것을 확인하는 의미로 --confirm-write를 지정해야 실행됩니다.
+src 디렉토리에서 실행합니다:
+
+    python -m benchmarks.bench_checklist_results --confirm-write --results 100 --values 20 --iterations 50
+"""
+import argparse
+import statistics
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+from base_repository import BaseRepository
+from repositories.checklist_result_repository import ChecklistResultRepository
+from services.reference_cache import checklist_cache
+
+
+def _legacy_find(cursor, contract_id: int) -> Dict[str, Any]:
+    """변경 전 find_all_checklist_results_by_contract와 같은 조회"""
+    cursor.execute("""
+        SELECT
+            c.id AS contract_id,
+            c.contract_name,
+            c.file_name,
+            c.uploader_id,
+            c.checklist_processer_id,
+            c.uploaded_at,
+            c.checklist_processed_at,
+            c.checklist_printable_file_path,
+            c.current_state,
+
+            cr.id AS checklist_result_id,
+            cr.checklist_id,
+            cr.memo,
+
+            cl.id AS checklist_id,
+            cl.question,
+
+            crv.id AS checklist_result_value_id,
+            crv.clause_num,
+            crv.located_page
+
+        FROM contract c
+        LEFT JOIN checklist_result cr ON cr.contract_id = c.id
+        LEFT JOIN checklist cl ON cl.id = cr.checklist_id
+        LEFT JOIN checklist_result_value crv ON crv.checklist_result_id = cr.id
+        WHERE c.id = %s
+        ORDER BY cr.id, crv.id
+    """, (contract_id,))
+    rows = cursor.fetchall()
+    if not rows:
+        return {}
+
+    contract_info = {
+        "contract_id": rows[0]["contract_id"],
+        "contract_name": rows[0]["contract_name"],
+        "file_name": rows[0]["file_name"],
+        "uploader_id": rows[0]["uploader_id"],
+        "checklist_processer_id": rows[0]["checklist_processer_id"],
+        "uploaded_at": str(rows[0]["uploaded_at"]),
+        "checklist_processed_at": (
+            str(rows[0]["checklist_processed_at"]) if rows[0]["checklist_processed_at"] else None
+        ),
+        "checklist_printable_file_path": rows[0]["checklist_printable_file_path"],
+        "current_state": rows[0]["current_state"]
+    }
+
+    checklist_results: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        cr_id = row["checklist_result_id"]
+        if cr_id is None:
+            continue
+        if cr_id not in checklist_results:
+            checklist_results[cr_id] = {
+                "id": cr_id,
+                "memo": row["memo"],
+                "checklist": {"id": row["checklist_id"], "question": row["question"]},
+                "values": []
+            }
+        if row["checklist_result_value_id"] is not None:
+            checklist_results[cr_id]["values"].append({
+                "id": row["checklist_result_value_id"],
+                "clause_num": row["clause_num"],
+                "located_page": row["located_page"]
+            })
+
+    return {"contract": contract_info, "checklist_results": list(checklist_results.values())}
+
+
+def _two_query(nest_values: bool) -> Callable[[Any, int], Dict[str, Any]]:
+    def find(cursor, contract_id: int) -> Dict[str, Any]:
+        contract = ChecklistResultRepository._fetch_contract_info(cursor, contract_id)
+        if not contract:
+            return {}
+        if nest_values:
+            results = ChecklistResultRepository._fetch_results_nested(cursor, contract_id)
+        else:
+            results = ChecklistResultRepository._fetch_results_flat(cursor, contract_id)
+        return {"contract": contract, "checklist_results": results}
+    return find
+
+
+STRATEGIES: List[Tuple[str, Callable[[Any, int], Dict[str, Any]]]] = [
+    ("legacy", _legacy_find),
+    ("flat", _two_query(nest_values=False)),
+    ("nested", _two_query(nest_values=True)),
+]
+
+
+class _CountingCursor:
+    """fetch한 행 수와 대략적인 전송량(값의 문자열 길이 합)을 세는 cursor 래퍼"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.rows = 0
+        self.chars = 0
+
+    def execute(self, *args, **kwargs):
+        return self._cursor.execute(*args, **kwargs)
+
+    def _count(self, rows):
+        for row in rows:
+            self.rows += 1
+            self.chars += sum(len(str(v)) for v in row.values() if v is not None)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row:
+            self._count([row])
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(rows)
+        return rows
+
+
+def create_synthetic_contract(results: int, values: int) -> Tuple[int, List[int]]:
+    tag = uuid.uuid4().hex[:8]
+    long_name = f"bench/{tag}/" + "계약서" * 200
+    with BaseRepository.DB() as (cursor, conn):
+        cursor.execute(
+            'INSERT INTO contract (contract_name, file_name, current_state) VALUES (%s, %s, 1)',
+            (long_name, f"bench-{tag}.pdf")
+        )
+        contract_id = cursor.lastrowid
+
+        checklist_ids = []
+        for idx in range(results):
+            cursor.execute(
+                'INSERT INTO checklist (question) VALUES (%s)',
+                (f"[bench {tag}] 체크리스트 문항 {idx} " + "확인하였는가 " * 20,)
+            )
+            checklist_ids.append(cursor.lastrowid)
+
+        for checklist_id in checklist_ids:
+            cursor.execute(
+                'INSERT INTO checklist_result (contract_id, checklist_id, memo) VALUES (%s, %s, %s)',
+                (contract_id, checklist_id, "메모 " * 20)
+            )
+            result_id = cursor.lastrowid
+            cursor.executemany(
+                'INSERT INTO checklist_result_value (checklist_result_id, clause_num, located_page) VALUES (%s, %s, %s)',
+                [(result_id, f"제{n}조 제{n % 5}항", n) for n in range(values)]
+            )
+        conn.commit()
+    # 체크리스트 문항을 직접 추가했으므로 실행 중인 서버의 체크리스트 캐시도 다시 읽도록 버전을 올림
+    checklist_cache.invalidate()
+    return contract_id, checklist_ids
+
+
+def delete_synthetic_contract(contract_id: int, checklist_ids: List[int]):
+    with BaseRepository.DB() as (cursor, conn):
+        cursor.execute('DELETE FROM contract WHERE id = %s', (contract_id,))
+        if checklist_ids:
+            cursor.execute(
+                f'DELETE FROM checklist WHERE id IN ({", ".join(["%s"] * len(checklist_ids))})',
+                checklist_ids
+            )
+        conn.commit()
+    checklist_cache.invalidate()
+
+
+def run(results: int, values: int, iterations: int):
+    contract_id, checklist_ids = create_synthetic_contract(results, values)
+    print(f"합성 계약서 {contract_id}: 결과 {results}개 × 값 {values}개, 반복 {iterations}회")
+    try:
+        outputs = {}
+        print(f"{'strategy':<8} {'rows':>7} {'chars':>10} {'median ms':>10} {'p95 ms':>8}")
+        for name, find in STRATEGIES:
+            with BaseRepository.DB() as (cursor, _):
+                counter = _CountingCursor(cursor)
+                outputs[name] = find(counter, contract_id)
+                timings = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    find(cursor, contract_id)
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{name:<8} {counter.rows:>7} {counter.chars:>10} "
+                  f"{statistics.median(timings):>10.2f} {p95:>8.2f}")
+
+        if any(output != outputs["legacy"] for output in outputs.values()):
+            print("경고: 조회 방식별 결과가 서로 다릅니다.")
+    finally:
+        delete_synthetic_contract(contract_id, checklist_ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="체크리스트 결과 조회 방식 비교")
+    parser.add_argument("--results", type=int, default=100, help="계약서당 체크리스트 결과 수")
+    parser.add_argument("--values", type=int, default=20, help="결과당 값 수")
+    parser.add_argument("--iterations", type=int, default=50, help="방식별 반복 측정 횟수")
+    parser.add_argument(
+        "--confirm-write", action="store_true",
+        help="database.py가 가리키는 DB에 합성 데이터를 쓰고 지우는 것을 확인 (공용 DB에서는 사용 금지)"
+    )
+    args = parser.parse_args()
+    if not args.confirm_write:
+        parser.error(
+            "이 벤치마크는 checklist 테이블에 합성 문항을 추가했다가 삭제합니다. "
+            "전용 벤치마크 DB인 경우에만 --confirm-write를 지정하세요."
+        )
+    run(args.results, args.values, args.iterations)
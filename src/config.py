@@ -7,3 +7,54 @@ load_dotenv()
 # OCR 관련 설정
 OCR_LICENSE_KEY = os.getenv("OCR_LICENSE_KEY", "your_default_license_key")
 OCR_SERVER_ADDR = os.getenv("OCR_SERVER_ADDR", "http://ocr-server-address")
+# 업로더별 OCR 라운드당 연속 처리 페이지 수 ("업로더ID:가중치"를 쉼표로 구분, 미지정 업로더는 1)
+OCR_UPLOADER_WEIGHTS = {
+    int(owner): int(weight)
+    for owner, weight in (
+        pair.split(":", 1) for pair in os.getenv("OCR_UPLOADER_WEIGHTS", "").split(",") if pair.strip()
+    )
+}
+
+
+# OCR 페이지 이미지 캐시 설정
+PAGE_IMAGE_CACHE_DIR = os.getenv("PAGE_IMAGE_CACHE_DIR", os.path.join("cache", "page_images"))
+PAGE_IMAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_IMAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# 파일 업로드 설정
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# 일괄 업로드 ZIP 파일 제한 (요청 하나에 포함된 모든 ZIP의 파일 수 / 압축 해제 후 전체 크기)
+ZIP_MAX_ENTRIES = int(os.getenv("ZIP_MAX_ENTRIES", "500"))
+ZIP_MAX_UNCOMPRESSED_BYTES = int(os.getenv("ZIP_MAX_UNCOMPRESSED_BYTES", str(2 * 1024 * 1024 * 1024)))
+
+# 파일 저장소 설정 (local: 로컬 디스크, s3: S3 호환 스토리지)
+BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", os.path.join("storage", "blobs"))
+BLOB_S3_BUCKET = os.getenv("BLOB_S3_BUCKET", "poc-blobs")
+BLOB_S3_ENDPOINT_URL = os.getenv("BLOB_S3_ENDPOINT_URL")  # MinIO 등 S3 호환 서버 주소
+BLOB_S3_ACCESS_KEY = os.getenv("BLOB_S3_ACCESS_KEY")
+BLOB_S3_SECRET_KEY = os.getenv("BLOB_S3_SECRET_KEY")
+BLOB_S3_REGION = os.getenv("BLOB_S3_REGION", "us-east-1")
+
+# AI 서버 연동 설정
+AI_SERVER_URL = os.getenv("AI_SERVER_URL", "http://192.168.0.196:8001")
+AI_MAX_CONNECTIONS = int(os.getenv("AI_MAX_CONNECTIONS", "20"))
+AI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("AI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+AI_KEEPALIVE_EXPIRY = float(os.getenv("AI_KEEPALIVE_EXPIRY", "30"))
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "10"))
+AI_READ_TIMEOUT = float(os.getenv("AI_READ_TIMEOUT", "900"))
+AI_DOWNLOAD_RETRIES = int(os.getenv("AI_DOWNLOAD_RETRIES", "3"))
+AI_ANALYSIS_CONCURRENCY = int(os.getenv("AI_ANALYSIS_CONCURRENCY", "4"))
+AI_ANALYSIS_MAX_PENDING = int(os.getenv("AI_ANALYSIS_MAX_PENDING", "100"))
+# 작업 완료 콜백을 보낼 수 있는 호스트 목록 (쉼표 구분, host 또는 host:port). 비어 있으면 콜백을 받지 않음
+AI_CALLBACK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.getenv("AI_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+# AI 서버 연동 전까지 운용지시서/특별자산 분석에 고정된 예시 결과를 사용할지 여부
+# AI 서버의 추출 결과 형식이 정해지기 전까지는 "false"로 설정하면 애플리케이션이 시작되지 않음
+AI_ANALYSIS_USE_DUMMY_RESULT = os.getenv("AI_ANALYSIS_USE_DUMMY_RESULT", "true").lower() in ("1", "true", "yes")
+
+# 특별자산 분석 결과(result_content, saved_json) 압축 저장 기준 크기 (bytes)
+RESULT_COMPRESS_MIN_BYTES = int(os.getenv("RESULT_COMPRESS_MIN_BYTES", "1024"))
+
+# 기준 데이터(체크리스트, 약관제한목록) 캐시가 DB 버전을 다시 확인하는 주기 (초)
+REFERENCE_CACHE_POLL_SECONDS = float(os.getenv("REFERENCE_CACHE_POLL_SECONDS", "2"))
@@ -2,9 +2,15 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import user, checklist, termsNconditons, contract, keypoint_result, checklist_result, ocr, pef, special
+from routers import user, checklist, termsNconditons, contract, keypoint_result, checklist_result, ocr, pef, special, file
 from services.system_service import SystemService
 from services.ocr_service import OcrService
+from services.ai_client import get_ai_client
+from services.ai_job_service import AiJobService
+from services.ai_worker import get_ai_worker
+from services.pef_service import PEFService
+from services.special_service import SpecialService
+from config import AI_ANALYSIS_USE_DUMMY_RESULT
 import os
 from dotenv import load_dotenv
 
@@ -20,6 +26,14 @@ app = FastAPI(title="IBK API", description="IBK Backend API Server")
 # 애플리케이션 시작 시 시스템 계정 및 OCR 서비스 초기화
 @app.on_event("startup")
 async def startup_event():
+    # AI 서버 /process/는 아직 PEF 추출 결과(pef_data, transaction_data)나
+    # 특별자산 분석 결과(content, saved_json 등)를 반환하지 않으므로, 예시 결과 없이 시작하면 모든 분석이 실패함
+    if not AI_ANALYSIS_USE_DUMMY_RESULT:
+        raise RuntimeError(
+            "AI_ANALYSIS_USE_DUMMY_RESULT=false는 아직 지원하지 않습니다. "
+            "AI 서버의 PEF/특별자산 추출 API가 준비될 때까지 true로 설정하세요."
+        )
+
     print("애플리케이션 시작: 시스템 계정 초기화 중...")
     SystemService.initialize_system_account()
     print("시스템 초기화 완료")
@@ -35,6 +49,32 @@ async def startup_event():
     else:
         print("OCR_LICENSE_KEY 또는 OCR_BASE_URL 환경 변수가 설정되지 않아 OCR 서비스를 초기화하지 않습니다.")
 
+    # AI 서버 연결 풀 생성 (애플리케이션 수명 동안 공유)
+    await get_ai_client().start()
+    # 운용지시서 AI 분석 작업자 시작
+    await get_ai_worker().start()
+    # 재시작 전에 끝나지 않은 운용지시서 분석을 다시 등록
+    try:
+        await PEFService.recover_pef_analyses()
+    except Exception as e:
+        print(f"PEF 지시서 분석 복구 실패: {str(e)}")
+    try:
+        await SpecialService.recover_special_analyses()
+    except Exception as e:
+        print(f"특별자산 지시서 분석 복구 실패: {str(e)}")
+    # 재시작 전에 끝나지 않은 AI 처리 작업은 다시 실행할 수 없으므로 실패로 기록
+    try:
+        await AiJobService.fail_interrupted_jobs()
+    except Exception as e:
+        print(f"중단된 AI 작업 정리 실패: {str(e)}")
+
+# 애플리케이션 종료 시 진행 중인 AI 작업 정리 및 연결 풀 종료
+@app.on_event("shutdown")
+async def shutdown_event():
+    await get_ai_worker().stop()
+    await AiJobService.shutdown()
+    await get_ai_client().close()
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -54,6 +94,7 @@ app.include_router(checklist_result.router, prefix="/checklist-results", tags=["
 app.include_router(ocr.router, prefix="/ocr", tags=["OCR"])
 app.include_router(pef.router, prefix="/pefs", tags=["PEF 운용지시서"])
 app.include_router(special.router, prefix="/special", tags=["특별자산 운용지시서"])
+app.include_router(file.router, prefix="/files", tags=["Files"])
 
 
 @app.get("/")
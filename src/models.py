@@ -1,5 +1,6 @@
 from typing import Optional, List, Any
 from datetime import datetime, date
+from decimal import Decimal
 from enum import Enum
 from pydantic import BaseModel, Field
 
@@ -34,6 +35,7 @@ class Contract(BaseModel):
     id: Optional[int] = None
     contract_name: str # = 파일 위치, 생성 규칙 : 
     file_name: str
+    blob_sha256: Optional[str] = None
     embedding_id: Optional[str] = None
     uploader_id: int
     keypoint_processer_id: Optional[int] = None
@@ -56,6 +58,16 @@ class Checklist_Result_Value(BaseModel):
     clause_num: str
     located_page: int
 
+class Checklist_Result_Bulk_Item(BaseModel):
+    checklist_id: int
+    memo: Optional[str] = None
+    values: List[Checklist_Result_Value] = []
+
+class Checklist_Result_Bulk_Create(BaseModel):
+    contract_id: int
+    results: List[Checklist_Result_Bulk_Item]
+    replace_values: bool = False  # True면 기존 결과 값을 지우고 새 값으로 교체
+
 class KeypointResultCreate(BaseModel):
     contract_id: int
     termsNconditions_id: int
@@ -65,15 +77,29 @@ class AIKeypointResultCreate(BaseModel):
     termsNconditions_id: int
     match_rate: float
 
+class AIKeypointMatch(BaseModel):
+    termsNconditions_id: int
+    match_rate: float
+
+class AIKeypointResultBulkCreate(BaseModel):
+    contract_id: int
+    matches: List[AIKeypointMatch]
+    top_k: Optional[int] = Field(None, ge=1)  # 매치 레이트 상위 K개만 저장
+    min_match_rate: Optional[float] = Field(None, ge=0.0, le=100.0)  # 이 값 이상만 저장
+    replace: bool = False  # True면 이번에 저장하지 않은 기존 AI 결과를 삭제
+
 
 class InstructionPEF(BaseModel):
     id: Optional[int] = None
     performer_id: int
     file_name: str
+    blob_sha256: Optional[str] = None
     created_at: Optional[datetime] = None
     is_fund_item: Optional[str] = "F"
     company_detail: Optional[str] = ""
     other_specs_text: Optional[str] = ""
+    analysis_status: Optional[str] = None
+    analysis_error: Optional[str] = None
 
 class TransactionHistory(BaseModel):
     id: Optional[int] = None
@@ -84,13 +110,20 @@ class TransactionHistory(BaseModel):
     account_number: str
     holder_name: str
     amount: str
+    amount_value: Optional[Decimal] = None
     process_date: date
 
+class InstructionPEFDetail(InstructionPEF):
+    transactions: List[TransactionHistory] = []
+
 class InstructionSpecial(BaseModel):
     id: Optional[int] = None
     performer_id : int
     file_name: str
+    blob_sha256: Optional[str] = None
     uploaded_at: Optional[datetime] = datetime.now()
+    analysis_status: Optional[str] = None
+    analysis_error: Optional[str] = None
 
 class InstructionSpecialResult(BaseModel):
     id: Optional[int] = None
@@ -101,11 +134,32 @@ class InstructionSpecialResult(BaseModel):
     all_qualities: Optional[str] = "Unknown dpi"
     average_quality: Optional[str] = "Unknown dpi"
     saved_json: Optional[str] = ""
+    version: Optional[int] = None
 
 class Attachment(BaseModel):
     id: Optional[int] = None
     instruction_special_id: Optional[int] = None
     file_name: str
+    blob_sha256: Optional[str] = None
+
+
+# ========= AI Job Related Models ==================
+class AiJobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETE = "COMPLETE"
+    ERROR = "ERROR"
+
+class AiJob(BaseModel):
+    id: str
+    job_type: str
+    job_status: AiJobStatus
+    requested_by: Optional[int] = None
+    result: Optional[Any] = None
+    error_message: Optional[str] = None
+    callback_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 
 # ========= OCR Related Models ==================
@@ -118,6 +172,11 @@ class OcrFileStatus(str, Enum):
     COMPLETE = "COMPLETE" 
     ERROR = "ERROR"
 
+class OcrPriority(str, Enum):
+    HIGH = "HIGH"
+    NORMAL = "NORMAL"
+    LOW = "LOW"
+
 class OcrStatus(str, Enum):
     SUCCESS = "SUCCESS"
     FAIL = "FAIL"
@@ -134,6 +193,23 @@ class OcrBox(BaseModel):
     left_bottom: Point
     confidence_score: float = 0.0
 
+class OcrLine(BaseModel):
+    text: str = ""
+    box_indices: List[int] = Field(default_factory=list)  # 읽기 순서로 정렬된 박스 인덱스
+    left: int = 0
+    top: int = 0
+    right: int = 0
+    bottom: int = 0
+
+class OcrParagraph(BaseModel):
+    text: str = ""
+    line_indices: List[int] = Field(default_factory=list)
+
+class OcrLayout(BaseModel):
+    lines: List[OcrLine] = Field(default_factory=list)
+    paragraphs: List[OcrParagraph] = Field(default_factory=list)
+    text: str = ""  # 줄은 개행, 문단은 빈 줄로 구분된 텍스트
+
 class OcrResult(BaseModel):
     fid: str = ""
     total_pages: int = 0
@@ -150,6 +226,7 @@ class OcrPageBase(BaseModel):
     ocr_status: OcrStatus
     page_file_data: str
     rotate: float = 0.0
+    layout_text: str = ""
 
 class OcrPage(OcrPageBase):
     id: Optional[int] = None
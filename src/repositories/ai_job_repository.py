@@ -0,0 +1,108 @@
+from base_repository import BaseRepository
+from typing import Optional, Dict, Any, List
+from models import AiJobStatus
+
+
+class AiJobRepository(BaseRepository):
+
+    @staticmethod
+    def create_job(job_id: str, job_type: str, requested_by: Optional[int],
+                   request_json: Optional[str], callback_url: Optional[str]) -> bool:
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    '''
+                    INSERT INTO ai_job (id, job_type, job_status, requested_by, request_json, callback_url)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ''',
+                    (job_id, job_type, AiJobStatus.PENDING.value, requested_by, request_json, callback_url)
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def update_status(job_id: str, job_status: AiJobStatus,
+                      result_json: Optional[str] = None,
+                      error_message: Optional[str] = None) -> bool:
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    '''
+                    UPDATE ai_job
+                    SET job_status = %s,
+                        result_json = COALESCE(%s, result_json),
+                        error_message = %s
+                    WHERE id = %s
+                    ''',
+                    (job_status.value, result_json, error_message, job_id)
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def fail_unfinished_jobs(error_message: str) -> List[Dict[str, Any]]:
+        """
+        서버 재시작으로 중단된 작업(PENDING, RUNNING)을 ERROR로 기록합니다.
+        작업 내용은 프로세스 메모리에만 있으므로 다시 실행할 수 없습니다.
+        (서버 시작 시 다른 프로세스가 작업을 진행하고 있지 않다는 전제에서 호출)
+
+        Returns:
+            List[Dict[str, Any]]: ERROR로 바뀐 작업의 id, job_type, callback_url
+        """
+        statuses = (AiJobStatus.PENDING.value, AiJobStatus.RUNNING.value)
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    'SELECT id, job_type, callback_url FROM ai_job WHERE job_status IN (%s, %s) FOR UPDATE',
+                    statuses
+                )
+                rows = cursor.fetchall()
+                cursor.execute(
+                    'UPDATE ai_job SET job_status = %s, error_message = %s WHERE job_status IN (%s, %s)',
+                    (AiJobStatus.ERROR.value, error_message, *statuses)
+                )
+                conn.commit()
+                return rows
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def save_result_file(file_name: str, blob_sha256: str, size: int) -> Optional[str]:
+        """
+        AI 결과 파일의 blob을 기록합니다. 같은 이름의 결과가 이미 있으면 교체합니다.
+
+        Returns:
+            Optional[str]: 교체되어 참조를 해제해야 하는 이전 blob 해시
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    'SELECT blob_sha256 FROM ai_result_file WHERE file_name = %s FOR UPDATE',
+                    (file_name,)
+                )
+                previous = cursor.fetchone()
+                cursor.execute(
+                    '''
+                    INSERT INTO ai_result_file (file_name, blob_sha256, size) VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE blob_sha256 = VALUES(blob_sha256), size = VALUES(size)
+                    ''',
+                    (file_name, blob_sha256, size)
+                )
+                conn.commit()
+                return previous["blob_sha256"] if previous else None
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def find_by_id(job_id: str) -> Optional[Dict[str, Any]]:
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute('SELECT * FROM ai_job WHERE id = %s', (job_id,))
+            return cursor.fetchone()
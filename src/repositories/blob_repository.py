@@ -0,0 +1,93 @@
+from base_repository import BaseRepository
+from typing import Callable, Optional, Dict, Any
+
+
+class BlobRepository(BaseRepository):
+    """
+    내용 주소(SHA-256) 기반 파일 저장소의 참조 카운트를 관리합니다.
+    """
+
+    @staticmethod
+    def add_ref(sha256: str, size: int) -> int:
+        """
+        blob 참조를 하나 추가합니다. 처음 등록되는 blob이면 행을 생성합니다.
+
+        Returns:
+            int: 추가 후 참조 수
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    '''
+                    INSERT INTO file_blob (sha256, size, ref_count) VALUES (%s, %s, 1)
+                    ON DUPLICATE KEY UPDATE ref_count = ref_count + 1
+                    ''',
+                    (sha256, size)
+                )
+                cursor.execute('SELECT ref_count FROM file_blob WHERE sha256 = %s', (sha256,))
+                row = cursor.fetchone()
+                conn.commit()
+                return row["ref_count"] if row else 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def release_ref(sha256: str) -> int:
+        """
+        blob 참조를 하나 해제합니다.
+
+        Returns:
+            int: 해제 후 남은 참조 수 (등록되지 않은 blob이면 0)
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    'UPDATE file_blob SET ref_count = GREATEST(ref_count - 1, 0) WHERE sha256 = %s',
+                    (sha256,)
+                )
+                cursor.execute('SELECT ref_count FROM file_blob WHERE sha256 = %s', (sha256,))
+                row = cursor.fetchone()
+                conn.commit()
+                return row["ref_count"] if row else 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def delete_if_unreferenced(sha256: str, delete_content: Callable[[str], None]) -> bool:
+        """
+        참조가 없는 blob의 행과 실제 내용을 삭제합니다.
+        행을 잠근 상태에서 내용을 지우므로, 같은 blob을 동시에 다시 등록하는
+        add_ref는 삭제가 끝날 때까지 대기한 뒤 새 행을 만듭니다.
+
+        Args:
+            sha256: blob 해시
+            delete_content: 저장소에서 내용을 지우는 함수
+        Returns:
+            bool: 삭제 여부
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    'SELECT ref_count FROM file_blob WHERE sha256 = %s FOR UPDATE',
+                    (sha256,)
+                )
+                row = cursor.fetchone()
+                if not row or row["ref_count"] > 0:
+                    conn.rollback()
+                    return False
+
+                delete_content(sha256)
+                cursor.execute('DELETE FROM file_blob WHERE sha256 = %s', (sha256,))
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def find_by_sha256(sha256: str) -> Optional[Dict[str, Any]]:
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute('SELECT * FROM file_blob WHERE sha256 = %s', (sha256,))
+            return cursor.fetchone()
@@ -1,4 +1,5 @@
 from base_repository import BaseRepository
+from repositories.contract_summary_repository import ContractSummaryRepository
 from typing import Optional, Dict, Any, List
 
 class ChecklistRepository:
@@ -51,9 +52,17 @@ class ChecklistRepository:
     def delete_question(question_id: int) -> bool:
         cursor, conn = BaseRepository.open_db()
         try:
+            # 연쇄 삭제되는 결과가 있는 계약서의 검토 요약도 함께 갱신
+            cursor.execute('SELECT DISTINCT contract_id FROM checklist_result WHERE checklist_id=%s', (question_id,))
+            contract_ids = [row["contract_id"] for row in cursor.fetchall()]
             cursor.execute('DELETE FROM checklist WHERE id=%s', (question_id,))  # 수정: 튜플로 변경
+            deleted = cursor.rowcount > 0
+            ContractSummaryRepository.refresh(cursor, contract_ids)
             conn.commit()
-            return cursor.rowcount > 0
+            return deleted
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             BaseRepository.close_db(conn=conn, cursor=cursor)
 
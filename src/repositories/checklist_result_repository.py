@@ -1,6 +1,11 @@
+import json
 from typing import Optional, Dict, Any, List
-from models import Checklist_Result_Value
+from models import Checklist_Result_Value, Checklist_Result_Bulk_Item
 from base_repository import BaseRepository
+from repositories.contract_summary_repository import ContractSummaryRepository
+
+# 한 번의 INSERT 문에 담는 결과 값 최대 행 수
+RESULT_VALUE_INSERT_CHUNK_SIZE = 1000
 
 
 class ChecklistResultRepository():
@@ -39,12 +44,89 @@ class ChecklistResultRepository():
                             (checklist_result_id, crv.clause_num, crv.located_page)
                         )
 
+                ContractSummaryRepository.refresh(cursor, [contract_id])
                 conn.commit()
                 return True
             except Exception:
                 conn.rollback()
                 raise
 
+    @staticmethod
+    def create_results_bulk(
+        contract_id: int,
+        items: List[Checklist_Result_Bulk_Item],
+        replace_values: bool = False
+    ) -> Dict[int, int]:
+        """
+        한 계약서의 여러 체크리스트 결과를 하나의 트랜잭션으로 저장합니다.
+        checklist_result는 INSERT ... ON DUPLICATE KEY UPDATE로 upsert하고,
+        결과 값은 multi-row INSERT로 한 번에 추가합니다.
+
+        Returns:
+            Dict[int, int]: checklist_id -> checklist_result_id
+        """
+        if not items:
+            return {}
+
+        # 같은 체크리스트가 여러 번 들어오면 값을 합침
+        merged: Dict[int, Dict[str, Any]] = {}
+        for item in items:
+            entry = merged.setdefault(item.checklist_id, {"memo": None, "values": []})
+            if item.memo is not None:
+                entry["memo"] = item.memo
+            entry["values"].extend(item.values)
+        checklist_ids = list(merged)
+
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                placeholders = ", ".join(["(%s, %s, %s)"] * len(checklist_ids))
+                params = []
+                for checklist_id in checklist_ids:
+                    params.extend((contract_id, checklist_id, merged[checklist_id]["memo"]))
+                # memo를 보내지 않은 경우 기존 메모 유지
+                cursor.execute(
+                    f'''
+                    INSERT INTO checklist_result (contract_id, checklist_id, memo)
+                    VALUES {placeholders} AS new
+                    ON DUPLICATE KEY UPDATE memo = COALESCE(new.memo, checklist_result.memo)
+                    ''',
+                    params
+                )
+
+                # upsert에서는 lastrowid로 기존 행 ID를 알 수 없으므로 한 번 더 조회
+                id_placeholders = ", ".join(["%s"] * len(checklist_ids))
+                cursor.execute(
+                    f'SELECT id, checklist_id FROM checklist_result WHERE contract_id = %s AND checklist_id IN ({id_placeholders})',
+                    [contract_id] + checklist_ids
+                )
+                result_ids = {row["checklist_id"]: row["id"] for row in cursor.fetchall()}
+
+                if replace_values:
+                    cursor.execute(
+                        f'DELETE FROM checklist_result_value WHERE checklist_result_id IN ({id_placeholders})',
+                        list(result_ids.values())
+                    )
+
+                values = [
+                    (result_ids[checklist_id], crv.clause_num, crv.located_page)
+                    for checklist_id in checklist_ids
+                    for crv in merged[checklist_id]["values"]
+                ]
+                for start in range(0, len(values), RESULT_VALUE_INSERT_CHUNK_SIZE):
+                    chunk = values[start:start + RESULT_VALUE_INSERT_CHUNK_SIZE]
+                    cursor.execute(
+                        'INSERT INTO checklist_result_value (checklist_result_id, clause_num, located_page) VALUES '
+                        + ", ".join(["(%s, %s, %s)"] * len(chunk)),
+                        [value for row in chunk for value in row]
+                    )
+
+                ContractSummaryRepository.refresh(cursor, [contract_id])
+                conn.commit()
+                return result_ids
+            except Exception:
+                conn.rollback()
+                raise
+
     @staticmethod
     def update_memo(checklist_result_id: int, memo: str) -> bool:
         with BaseRepository.DB() as (cursor, conn):
@@ -60,100 +142,168 @@ class ChecklistResultRepository():
                 raise
 
     @staticmethod
-    def find_all_checklist_results_by_contract(contract_id: int) -> Optional[Dict[str, Any]]:
+    def find_all_checklist_results_by_contract(contract_id: int, nest_values: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        계약서 정보와 체크리스트 결과(값 포함)를 조회합니다.
+        계약서 행과 결과 목록을 따로 조회하여 결과/값 행마다 계약서 컬럼이 반복되지 않도록 합니다.
+
+        :param nest_values: True면 결과 값을 JSON_ARRAYAGG로 묶어 결과당 한 행으로 받고,
+                            False면 결과-값을 평평하게 JOIN한 행을 받아 여기서 묶음
+        :return: {"contract": ..., "checklist_results": [...]}, 계약서가 없으면 {}
+        """
         with BaseRepository.DB() as (cursor, _):
-            cursor.execute("""
-                SELECT 
-                    c.id AS contract_id,
-                    c.contract_name,
-                    c.file_name,
-                    c.uploader_id,
-                    c.checklist_processer_id,
-                    c.uploaded_at,
-                    c.checklist_processed_at,
-                    c.checklist_printable_file_path,
-                    c.current_state,
-
-                    cr.id AS checklist_result_id,
-                    cr.checklist_id,
-                    cr.memo,
-
-                    cl.id AS checklist_id,
-                    cl.question,
-
-                    crv.id AS checklist_result_value_id,
-                    crv.clause_num,
-                    crv.located_page
-
-                FROM contract c
-                LEFT JOIN checklist_result cr ON cr.contract_id = c.id
-                LEFT JOIN checklist cl ON cl.id = cr.checklist_id
-                LEFT JOIN checklist_result_value crv ON crv.checklist_result_id = cr.id
-                WHERE c.id = %s
-                ORDER BY cr.id, crv.id
-            """, (contract_id,))
-
-            rows = cursor.fetchall()
-            if not rows:
+            contract = ChecklistResultRepository._fetch_contract_info(cursor, contract_id)
+            if not contract:
                 return {}
+            if nest_values:
+                checklist_results = ChecklistResultRepository._fetch_results_nested(cursor, contract_id)
+            else:
+                checklist_results = ChecklistResultRepository._fetch_results_flat(cursor, contract_id)
+
+        return {
+            "contract": contract,
+            "checklist_results": checklist_results
+        }
+
+    @staticmethod
+    def _fetch_contract_info(cursor, contract_id: int) -> Optional[Dict[str, Any]]:
+        cursor.execute("""
+            SELECT
+                id AS contract_id,
+                contract_name,
+                file_name,
+                uploader_id,
+                checklist_processer_id,
+                uploaded_at,
+                checklist_processed_at,
+                checklist_printable_file_path,
+                current_state
+            FROM contract
+            WHERE id = %s
+        """, (contract_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        row["uploaded_at"] = str(row["uploaded_at"])
+        row["checklist_processed_at"] = (
+            str(row["checklist_processed_at"]) if row["checklist_processed_at"] else None
+        )
+        return row
+
+    @staticmethod
+    def _fetch_results_nested(cursor, contract_id: int) -> List[Dict[str, Any]]:
+        """결과당 한 행, 값은 JSON_ARRAYAGG 서브쿼리로 묶어서 조회"""
+        cursor.execute("""
+            SELECT
+                cr.id,
+                cr.memo,
+                cl.id AS checklist_id,
+                cl.question,
+                (SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                     'id', crv.id, 'clause_num', crv.clause_num, 'located_page', crv.located_page))
+                 FROM checklist_result_value crv
+                 WHERE crv.checklist_result_id = cr.id) AS values_json
+            FROM checklist_result cr
+            LEFT JOIN checklist cl ON cl.id = cr.checklist_id
+            WHERE cr.contract_id = %s
+            ORDER BY cr.id
+        """, (contract_id,))
+
+        results = []
+        for row in cursor.fetchall():
+            values = json.loads(row["values_json"]) if row["values_json"] else []
+            results.append({
+                "id": row["id"],
+                "memo": row["memo"],
+                "checklist": {
+                    "id": row["checklist_id"],
+                    "question": row["question"]
+                },
+                # JSON_ARRAYAGG는 순서를 보장하지 않으므로 기존 조회와 같은 순서로 정렬
+                "values": sorted(values, key=lambda v: v["id"])
+            })
+        return results
+
+    @staticmethod
+    def _fetch_results_flat(cursor, contract_id: int) -> List[Dict[str, Any]]:
+        """결과-값을 JOIN한 평평한 행을 받아 결과별로 묶음"""
+        cursor.execute("""
+            SELECT
+                cr.id AS checklist_result_id,
+                cr.memo,
+                cl.id AS checklist_id,
+                cl.question,
+                crv.id AS checklist_result_value_id,
+                crv.clause_num,
+                crv.located_page
+            FROM checklist_result cr
+            LEFT JOIN checklist cl ON cl.id = cr.checklist_id
+            LEFT JOIN checklist_result_value crv ON crv.checklist_result_id = cr.id
+            WHERE cr.contract_id = %s
+            ORDER BY cr.id, crv.id
+        """, (contract_id,))
+
+        checklist_results: Dict[int, Dict[str, Any]] = {}
+        for row in cursor.fetchall():
+            cr_id = row["checklist_result_id"]
+            if cr_id not in checklist_results:
+                checklist_results[cr_id] = {
+                    "id": cr_id,
+                    "memo": row["memo"],
+                    "checklist": {
+                        "id": row["checklist_id"],
+                        "question": row["question"]
+                    },
+                    "values": []
+                }
 
-            contract_info = {
-                "contract_id": rows[0]["contract_id"],
-                "contract_name": rows[0]["contract_name"],
-                "file_name": rows[0]["file_name"],
-                "uploader_id": rows[0]["uploader_id"],
-                "checklist_processer_id": rows[0]["checklist_processer_id"],
-                "uploaded_at": str(rows[0]["uploaded_at"]),
-                "checklist_processed_at": (
-                    str(rows[0]["checklist_processed_at"]) if rows[0]["checklist_processed_at"] else None
-                ),
-                "checklist_printable_file_path": rows[0]["checklist_printable_file_path"],
-                "current_state": rows[0]["current_state"]
-            }
-
-            checklist_results: Dict[int, Dict[str, Any]] = {}
-
-            for row in rows:
-                cr_id = row["checklist_result_id"]
-                if cr_id is None:
-                    continue
-
-                if cr_id not in checklist_results:
-                    checklist_results[cr_id] = {
-                        "id": cr_id,
-                        "memo": row["memo"],
-                        "checklist": {
-                            "id": row["checklist_id"],
-                            "question": row["question"]
-                        },
-                        "values": []
-                    }
-
-                if row["checklist_result_value_id"] is not None:
-                    checklist_results[cr_id]["values"].append({
-                        "id": row["checklist_result_value_id"],
-                        "clause_num": row["clause_num"],
-                        "located_page": row["located_page"]
-                    })
-
-            return {
-                "contract": contract_info,
-                "checklist_results": list(checklist_results.values())
-            }
+            if row["checklist_result_value_id"] is not None:
+                checklist_results[cr_id]["values"].append({
+                    "id": row["checklist_result_value_id"],
+                    "clause_num": row["clause_num"],
+                    "located_page": row["located_page"]
+                })
+        return list(checklist_results.values())
 
     @staticmethod
     def delete_checklist_result_value(value_id: int) -> bool:
         with BaseRepository.DB() as (cursor, conn):
-            cursor.execute('DELETE FROM checklist_result_value WHERE id = %s', (value_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            try:
+                cursor.execute(
+                    '''
+                    SELECT cr.contract_id FROM checklist_result_value crv
+                    JOIN checklist_result cr ON cr.id = crv.checklist_result_id
+                    WHERE crv.id = %s
+                    ''',
+                    (value_id,)
+                )
+                row = cursor.fetchone()
+                cursor.execute('DELETE FROM checklist_result_value WHERE id = %s', (value_id,))
+                deleted = cursor.rowcount > 0
+                if row:
+                    ContractSummaryRepository.refresh(cursor, [row["contract_id"]])
+                conn.commit()
+                return deleted
+            except Exception:
+                conn.rollback()
+                raise
 
     @staticmethod
     def delete_checklist_result(result_id: int) -> bool:
         with BaseRepository.DB() as (cursor, conn):
-            cursor.execute('DELETE FROM checklist_result WHERE id = %s', (result_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+            try:
+                cursor.execute('SELECT contract_id FROM checklist_result WHERE id = %s', (result_id,))
+                row = cursor.fetchone()
+                cursor.execute('DELETE FROM checklist_result WHERE id = %s', (result_id,))
+                deleted = cursor.rowcount > 0
+                if row:
+                    ContractSummaryRepository.refresh(cursor, [row["contract_id"]])
+                conn.commit()
+                return deleted
+            except Exception:
+                conn.rollback()
+                raise
 
     @staticmethod
     def get_value_by_value_id(value_id: int) -> Optional[Dict[str, Any]]:
@@ -1,17 +1,18 @@
 from base_repository import BaseRepository
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Set
 
 class ContractRepository:
     @staticmethod
-    def create_contract(uploader_id: int, contract_name: str, file_name: str):
+    def create_contract(uploader_id: int, contract_name: str, file_name: str,
+                        blob_sha256: Optional[str] = None):
         cursor, conn = BaseRepository.open_db()
         try:
             cursor.execute(
                 '''
-                INSERT INTO contract (contract_name, file_name, uploader_id)
-                VALUES (%s, %s, %s)
+                INSERT INTO contract (contract_name, file_name, uploader_id, blob_sha256)
+                VALUES (%s, %s, %s, %s)
                 ''',
-                (contract_name, file_name, uploader_id)
+                (contract_name, file_name, uploader_id, blob_sha256)
             )
             
             # 삽입된 행의 ID 가져오기
@@ -27,6 +28,124 @@ class ContractRepository:
         finally:
             BaseRepository.close_db(conn=conn, cursor=cursor)
 
+    @staticmethod
+    def create_contracts(uploader_id: int, contracts: List[Tuple[str, str, Optional[str]]]) -> List[int]:
+        """
+        여러 계약서를 하나의 multi-row INSERT로 저장합니다.
+
+        Args:
+            uploader_id: 업로드한 사용자 ID
+            contracts: (contract_name, file_name, blob_sha256) 목록
+        Returns:
+            List[int]: 입력 순서와 같은 순서의 계약서 ID 목록
+        """
+        if not contracts:
+            return []
+
+        cursor, conn = BaseRepository.open_db()
+        try:
+            placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(contracts))
+            params = []
+            for contract_name, file_name, blob_sha256 in contracts:
+                params.extend((contract_name, file_name, uploader_id, blob_sha256))
+
+            cursor.execute(
+                f'INSERT INTO contract (contract_name, file_name, uploader_id, blob_sha256) VALUES {placeholders}',
+                params
+            )
+            # InnoDB는 행 수가 정해진 단일 INSERT 문에 연속된 AUTO_INCREMENT 값을 할당하며,
+            # lastrowid는 그 중 첫 번째 ID
+            first_id = cursor.lastrowid
+            conn.commit()
+            return [first_id + i for i in range(len(contracts))]
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            BaseRepository.close_db(conn=conn, cursor=cursor)
+
+    @staticmethod
+    def find_existing_file_paths(contracts: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """
+        이미 등록된 (contract_name, file_name) 조합을 한 번의 조회로 찾습니다.
+        """
+        if not contracts:
+            return set()
+
+        cursor, conn = BaseRepository.open_db()
+        try:
+            conditions = " OR ".join(["(contract_name=%s AND file_name=%s)"] * len(contracts))
+            params = [value for pair in contracts for value in pair]
+            cursor.execute(f'SELECT contract_name, file_name FROM contract WHERE {conditions}', params)
+            return {(row["contract_name"], row["file_name"]) for row in cursor.fetchall()}
+        finally:
+            BaseRepository.close_db(conn=conn, cursor=cursor)
+
+    @staticmethod
+    def create_upload_batch(batch_id: str, uploader_id: int, items: List[Dict[str, Any]]) -> bool:
+        """
+        일괄 업로드 정보와 파일별 처리 결과를 저장합니다.
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    'INSERT INTO contract_upload_batch (id, uploader_id, total_files) VALUES (%s, %s, %s)',
+                    (batch_id, uploader_id, len(items))
+                )
+                if items:
+                    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(items))
+                    params = []
+                    for item in items:
+                        params.extend((
+                            batch_id, item["file_name"], item["contract_name"],
+                            item.get("contract_id"), item["upload_status"], item.get("message")
+                        ))
+                    cursor.execute(
+                        f'''
+                        INSERT INTO contract_upload_batch_item
+                        (batch_id, file_name, contract_name, contract_id, upload_status, message)
+                        VALUES {placeholders}
+                        ''',
+                        params
+                    )
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def get_upload_batch(batch_id: str, uploader_id: int) -> Optional[Dict[str, Any]]:
+        """
+        일괄 업로드 정보와 파일별 업로드/OCR 상태를 조회합니다.
+        다른 사용자가 올린 배치는 조회되지 않습니다.
+        """
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(
+                'SELECT * FROM contract_upload_batch WHERE id = %s AND uploader_id = %s',
+                (batch_id, uploader_id)
+            )
+            batch = cursor.fetchone()
+            if not batch:
+                return None
+
+            cursor.execute(
+                '''
+                SELECT
+                    i.id, i.file_name, i.contract_name, i.contract_id, i.upload_status, i.message,
+                    o.id AS ocr_file_id, o.ocr_file_status, o.total_page
+                FROM contract_upload_batch_item i
+                LEFT JOIN ocr_files o ON o.id = (
+                    SELECT MAX(id) FROM ocr_files WHERE contract_id = i.contract_id
+                )
+                WHERE i.batch_id = %s
+                ORDER BY i.id
+                ''',
+                (batch_id,)
+            )
+            batch["items"] = cursor.fetchall()
+            return batch
+
     @staticmethod
     def get_all_contracts() -> List[Dict[str, Any]]:
         cursor, conn = BaseRepository.open_db()
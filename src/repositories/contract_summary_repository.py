@@ -0,0 +1,96 @@
+from typing import Optional, Dict, Any, List, Iterable
+from base_repository import BaseRepository
+
+# 계약서별 집계를 다시 계산하는 INSERT ... SELECT (WHERE 절은 호출하는 쪽에서 붙임)
+_REFRESH_SQL = '''
+    INSERT INTO contract_review_summary
+        (contract_id, checklist_result_count, checklist_value_count, keypoint_match_count, top_match_rate)
+    SELECT * FROM (
+        SELECT
+            c.id AS summary_contract_id,
+            (SELECT COUNT(*) FROM checklist_result cr WHERE cr.contract_id = c.id) AS result_count,
+            (SELECT COUNT(*) FROM checklist_result_value crv
+                JOIN checklist_result cr ON cr.id = crv.checklist_result_id
+                WHERE cr.contract_id = c.id) AS value_count,
+            (SELECT COUNT(*) FROM keypoint_result kr WHERE kr.contract_id = c.id) AS match_count,
+            (SELECT MAX(kr.match_rate) FROM keypoint_result kr WHERE kr.contract_id = c.id) AS top_rate
+        FROM contract c
+        {where}
+    ) AS s
+    ON DUPLICATE KEY UPDATE
+        checklist_result_count = s.result_count,
+        checklist_value_count = s.value_count,
+        keypoint_match_count = s.match_count,
+        top_match_rate = s.top_rate
+'''
+
+
+class ContractSummaryRepository:
+
+    @staticmethod
+    def refresh(cursor, contract_ids: Iterable[Optional[int]]):
+        '''
+        주어진 계약서들의 검토 요약을 다시 계산합니다.
+        체크리스트/키포인트 결과를 변경한 트랜잭션 안에서 같은 cursor로 호출해야
+        결과와 요약이 함께 커밋되거나 함께 롤백됩니다.
+        '''
+        ids = sorted({contract_id for contract_id in contract_ids if contract_id is not None})
+        if not ids:
+            return
+        cursor.execute(
+            _REFRESH_SQL.format(where=f'WHERE c.id IN ({", ".join(["%s"] * len(ids))})'),
+            ids
+        )
+
+    @staticmethod
+    def rebuild_all() -> int:
+        '''
+        모든 계약서의 검토 요약을 다시 계산합니다. (기존 데이터 이관 또는 불일치 복구용)
+
+        returns: 갱신한 계약서 수
+        '''
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(_REFRESH_SQL.format(where=''))
+                cursor.execute('SELECT COUNT(*) AS cnt FROM contract_review_summary')
+                count = cursor.fetchone()["cnt"]
+                conn.commit()
+                return count
+            except Exception:
+                conn.rollback()
+                raise
+
+    @staticmethod
+    def list_summaries(limit: int, offset: int) -> List[Dict[str, Any]]:
+        '''
+        계약서 목록과 검토 요약을 최신 계약서 순으로 조회합니다.
+        요약 행이 아직 없는 계약서(결과가 하나도 없는 계약서)는 0건으로 반환합니다.
+        '''
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(
+                '''
+                SELECT
+                    c.id AS contract_id,
+                    c.contract_name,
+                    c.file_name,
+                    c.current_state,
+                    c.uploaded_at,
+                    COALESCE(s.checklist_result_count, 0) AS checklist_result_count,
+                    COALESCE(s.checklist_value_count, 0) AS checklist_value_count,
+                    COALESCE(s.keypoint_match_count, 0) AS keypoint_match_count,
+                    s.top_match_rate,
+                    s.updated_at AS summary_updated_at
+                FROM contract c
+                LEFT JOIN contract_review_summary s ON s.contract_id = c.id
+                ORDER BY c.id DESC
+                LIMIT %s OFFSET %s
+                ''',
+                (limit, offset)
+            )
+            return cursor.fetchall()
+
+    @staticmethod
+    def count_contracts() -> int:
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute('SELECT COUNT(*) AS cnt FROM contract')
+            return cursor.fetchone()["cnt"]
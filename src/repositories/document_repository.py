@@ -0,0 +1,61 @@
+from base_repository import BaseRepository
+from typing import Optional, Dict, Any
+
+
+class DocumentRepository:
+
+    @staticmethod
+    def create_document(document_name: str, file_name: str, doc_type: str, user_id: int,
+                        blob_sha256: Optional[str]) -> int:
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    '''
+                    INSERT INTO document (document_name, file_name, blob_sha256, embedding_id, doc_type, user_id, current_state)
+                    VALUES (%s, %s, %s, NULL, %s, %s, 0)
+                    ''',
+                    (document_name, file_name, blob_sha256, doc_type, user_id)
+                )
+                document_id = cursor.lastrowid
+                conn.commit()
+                return document_id
+            except Exception:
+                conn.rollback()
+                raise
+
+    @staticmethod
+    def find_by_id(document_id: int) -> Optional[Dict[str, Any]]:
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute('SELECT * FROM document WHERE id = %s', (document_id,))
+            return cursor.fetchone()
+
+    @staticmethod
+    def find_latest_by_file_name(file_name: str) -> Optional[Dict[str, Any]]:
+        '''
+        같은 이름으로 여러 번 업로드된 경우 가장 최근 문서를 반환합니다.
+        '''
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(
+                'SELECT * FROM document WHERE file_name = %s AND blob_sha256 IS NOT NULL ORDER BY id DESC LIMIT 1',
+                (file_name,)
+            )
+            return cursor.fetchone()
+
+    @staticmethod
+    def delete_document(document_id: int) -> Optional[str]:
+        '''
+        문서를 삭제하고, 해제해야 할 blob 해시를 반환합니다. 문서가 없으면 None을 반환합니다.
+        '''
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute('SELECT blob_sha256 FROM document WHERE id = %s FOR UPDATE', (document_id,))
+                row = cursor.fetchone()
+                if not row:
+                    conn.rollback()
+                    return None
+                cursor.execute('DELETE FROM document WHERE id = %s', (document_id,))
+                conn.commit()
+                return row["blob_sha256"] or ""
+            except Exception:
+                conn.rollback()
+                raise
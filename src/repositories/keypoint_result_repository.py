@@ -1,6 +1,11 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from database import get_db_connection
 from base_repository import BaseRepository
+from repositories.contract_summary_repository import ContractSummaryRepository
+
+# 한 번의 INSERT 문에 담는 키포인트 결과 최대 행 수
+KEYPOINT_UPSERT_CHUNK_SIZE = 1000
+
 class KeypointResultRepository:
 
     @staticmethod
@@ -11,12 +16,56 @@ class KeypointResultRepository:
                     'INSERT INTO keypoint_result(contract_id, termsNconditions_id, match_rate) VALUES(%s, %s, %s)',
                     (contract_id, terms_id, match_rate)
                 )
+                ContractSummaryRepository.refresh(cursor, [contract_id])
                 conn.commit()
                 return True
             except Exception as e:
                 conn.rollback()
                 raise e
             
+    @staticmethod
+    def upsert_results_by_ai(contract_id: int, matches: List[Tuple[int, float]], replace: bool = False) -> int:
+        '''
+        한 계약서의 AI 키포인트 결과를 하나의 트랜잭션으로 저장합니다.
+        (contract_id, termsNconditions_id)가 이미 있으면 match_rate만 갱신하되,
+        사용자가 직접 추가한 결과(match_rate NULL)는 AI 결과로 덮어쓰지 않습니다.
+
+        matches: (termsNconditions_id, match_rate) 목록
+        replace: True면 matches에 없는 기존 AI 결과(match_rate가 있는 행)를 삭제
+                 사용자가 직접 추가한 결과(match_rate NULL)는 유지
+        returns: 삭제된 기존 결과 수
+        '''
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                removed = 0
+                if replace:
+                    params: List[Any] = [contract_id]
+                    sql = 'DELETE FROM keypoint_result WHERE contract_id=%s AND match_rate IS NOT NULL'
+                    if matches:
+                        sql += f' AND termsNconditions_id NOT IN ({", ".join(["%s"] * len(matches))})'
+                        params.extend(terms_id for terms_id, _ in matches)
+                    cursor.execute(sql, params)
+                    removed = cursor.rowcount
+
+                for start in range(0, len(matches), KEYPOINT_UPSERT_CHUNK_SIZE):
+                    chunk = matches[start:start + KEYPOINT_UPSERT_CHUNK_SIZE]
+                    cursor.execute(
+                        f'''
+                        INSERT INTO keypoint_result(contract_id, termsNconditions_id, match_rate)
+                        VALUES {", ".join(["(%s, %s, %s)"] * len(chunk))} AS new
+                        ON DUPLICATE KEY UPDATE
+                            match_rate = IF(keypoint_result.match_rate IS NULL, NULL, new.match_rate)
+                        ''',
+                        [value for terms_id, match_rate in chunk for value in (contract_id, terms_id, match_rate)]
+                    )
+
+                ContractSummaryRepository.refresh(cursor, [contract_id])
+                conn.commit()
+                return removed
+            except Exception as e:
+                conn.rollback()
+                raise e
+
     @staticmethod
     def create_result_by_user(contract_id: int, terms_id: int) -> bool:
         with BaseRepository.DB() as (cursor, conn):
@@ -33,6 +82,7 @@ class KeypointResultRepository:
                         (contract_id, terms_id)
                     )
 
+                    ContractSummaryRepository.refresh(cursor, [contract_id])
                     conn.commit()
                     return True
                 else:
@@ -113,6 +163,15 @@ class KeypointResultRepository:
     @staticmethod
     def delete_keypoint_result(result_id: int) -> bool:
         with BaseRepository.DB() as (cursor, conn):
-            cursor.execute('DELETE FROM keypoint_result WHERE id= %s', (result_id, ))
-            conn.commit()
-            return cursor.rowcount > 0
+            try:
+                cursor.execute('SELECT contract_id FROM keypoint_result WHERE id = %s', (result_id, ))
+                row = cursor.fetchone()
+                cursor.execute('DELETE FROM keypoint_result WHERE id= %s', (result_id, ))
+                deleted = cursor.rowcount > 0
+                if row:
+                    ContractSummaryRepository.refresh(cursor, [row["contract_id"]])
+                conn.commit()
+                return deleted
+            except Exception:
+                conn.rollback()
+                raise
@@ -1,4 +1,5 @@
 # repositories/ocr_repository.py (신규 파일)
+import json
 import logging
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
@@ -50,6 +51,50 @@ class OcrRepository:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def save_ocr_files(ocr_files: List[OcrFileCreate]) -> List[int]:
+        """여러 OCR 파일 정보를 하나의 INSERT 문으로 저장 (입력 순서대로 ID 반환)"""
+        if not ocr_files:
+            return []
+
+        conn = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(ocr_files))
+            query = f"""
+            INSERT INTO ocr_files
+            (file_name, file_path, engine_type, ocr_file_status, created_date, contract_id)
+            VALUES {placeholders}
+            """
+
+            values = []
+            for ocr_file in ocr_files:
+                values.extend((
+                    ocr_file.file_name,
+                    ocr_file.file_path,
+                    ocr_file.engine_type.value,
+                    ocr_file.ocr_file_status.value,
+                    ocr_file.created_date,
+                    ocr_file.contract_id
+                ))
+
+            cursor.execute(query, values)
+            first_id = cursor.lastrowid
+            conn.commit()
+
+            return [first_id + i for i in range(len(ocr_files))]
+
+        except Error as e:
+            logger.error(f"OCR 파일 일괄 저장 중 오류 발생: {str(e)}")
+            if conn:
+                conn.rollback()
+            return []
+        finally:
+            if conn:
+                conn.close()
+
     @staticmethod
     def update_ocr_file(file_id: int, update_data: OcrFileUpdate) -> bool:
         """OCR 파일 정보 업데이트"""
@@ -100,8 +145,9 @@ class OcrRepository:
     @staticmethod
     def save_ocr_page(ocr_file_id: int, page: int, full_text: str, executed_at: datetime,
                     execute_seconds: float, ocr_status: OcrStatus, page_file_data: str,
-                    rotate: float) -> Optional[int]:
-        """OCR 페이지 정보 저장"""
+                    rotate: float, layout_text: Optional[str] = None,
+                    layout_json: Optional[str] = None) -> Optional[int]:
+        """OCR 페이지 정보 저장 (읽기 순서 레이아웃 포함)"""
         conn = None
         try:
             conn = get_db_connection()
@@ -110,8 +156,8 @@ class OcrRepository:
             query = """
             INSERT INTO ocr_pages 
             (ocr_file_id, page, full_text, executed_at, execute_seconds, 
-             ocr_status, page_file_data, rotate)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+             ocr_status, page_file_data, rotate, layout_text, layout_json)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
             values = (
@@ -122,7 +168,9 @@ class OcrRepository:
                 execute_seconds,
                 ocr_status.value,
                 page_file_data,
-                rotate
+                rotate,
+                layout_text,
+                layout_json
             )
             
             cursor.execute(query, values)
@@ -235,6 +283,38 @@ class OcrRepository:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def get_full_text_by_contract_id(contract_id: int) -> Optional[str]:
+        """계약서의 최신 OCR 파일에 속한 모든 페이지 텍스트를 페이지 순서대로 이어 붙여 조회"""
+        conn = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            
+            query = """
+            SELECT p.full_text FROM ocr_pages p
+            JOIN (
+                SELECT id FROM ocr_files
+                WHERE contract_id = %s
+                ORDER BY created_date DESC
+                LIMIT 1
+            ) f ON f.id = p.ocr_file_id
+            ORDER BY p.page
+            """
+            
+            cursor.execute(query, (contract_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                return None
+            return "\n".join(row["full_text"] or "" for row in rows)
+            
+        except Error as e:
+            logger.error(f"계약서 ID로 OCR 텍스트 조회 중 오류 발생: {str(e)}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
     @staticmethod
     def get_ocr_pages_by_file_id(file_id: int) -> List[Dict[str, Any]]:
         """파일 ID로 OCR 페이지 목록 조회"""
@@ -260,6 +340,27 @@ class OcrRepository:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def get_ocr_page_by_id(page_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 OCR 페이지 조회"""
+        conn = None
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            
+            query = "SELECT * FROM ocr_pages WHERE id = %s"
+            cursor.execute(query, (page_id,))
+            
+            result = cursor.fetchone()
+            return result
+            
+        except Error as e:
+            logger.error(f"OCR 페이지 조회 중 오류 발생: {str(e)}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
     @staticmethod
     def get_ocr_boxes_by_page_id(page_id: int) -> List[Dict[str, Any]]:
         """페이지 ID로 OCR 박스 목록 조회"""
@@ -301,6 +402,10 @@ class OcrRepository:
             page_id = page["id"]
             boxes = OcrRepository.get_ocr_boxes_by_page_id(page_id)
             
+            # 저장된 레이아웃 JSON은 구조체로 변환하여 반환
+            if page.get("layout_json"):
+                page["layout_json"] = json.loads(page["layout_json"])
+            
             pages_with_boxes.append({
                 "page_info": page,
                 "boxes": boxes
@@ -1,10 +1,80 @@
+import re
 from base_repository import BaseRepository
 from typing import Optional, List, Dict, Any
-from models import TransactionHistory
+from decimal import Decimal, InvalidOperation
+from models import TransactionHistory, AiJobStatus
 from datetime import date
 
+# 한 번의 INSERT 문에 담는 거래 내역 최대 행 수 (max_allowed_packet을 넘지 않도록)
+TRANSACTION_INSERT_CHUNK_SIZE = 500
+
+# 거래 내역 집계 시 허용하는 그룹 기준 (요청 값 -> SQL 컬럼)
+TRANSACTION_GROUP_COLUMNS = {
+    "deal_type": "deal_type",
+    "bank_name": "bank_name",
+    "holder_name": "holder_name",
+    "process_date": "process_date",
+}
+
+_AMOUNT_STRIP_RE = re.compile(r"[,\s원₩]|KRW", re.IGNORECASE)
+
+
+def parse_amount(amount) -> Optional[Decimal]:
+    """
+    "279,620,789", "1,000원", "(500)" 같은 금액 문자열을 Decimal로 변환 (변환할 수 없으면 None)
+    """
+    if amount is None:
+        return None
+    text = _AMOUNT_STRIP_RE.sub("", str(amount))
+    negative = text.startswith("(") and text.endswith(")")
+    if negative:
+        text = text[1:-1]
+    if not text:
+        return None
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not value.is_finite():
+        return None
+    return -value if negative else value
+
+
 class PEFRepository(BaseRepository):
 
+    @staticmethod
+    def _insert_transactions(cursor, instruction_pef_id: int, transactions: List[TransactionHistory]) -> int:
+        """
+        거래 내역을 chunk 단위 multi-row INSERT로 저장 (commit은 호출하는 쪽에서 처리)
+        :return: 저장된 행 수
+        """
+        inserted = 0
+        for start in range(0, len(transactions), TRANSACTION_INSERT_CHUNK_SIZE):
+            chunk = transactions[start:start + TRANSACTION_INSERT_CHUNK_SIZE]
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+            params = []
+            for tx in chunk:
+                params.extend((
+                    instruction_pef_id,
+                    tx.deal_type,
+                    tx.deal_object,
+                    tx.bank_name,
+                    tx.account_number,
+                    tx.holder_name,
+                    tx.amount,
+                    parse_amount(tx.amount),
+                    tx.process_date  # type: date
+                ))
+            cursor.execute(f"""
+            INSERT INTO transaction_history (
+                instruction_pef_id, deal_type, deal_object,
+                bank_name, account_number, holder_name,
+                amount, amount_value, process_date
+            ) VALUES {placeholders}
+            """, params)
+            inserted += cursor.rowcount
+        return inserted
+
     @staticmethod
     def create_with_transactions(
         performer_id: int,
@@ -12,46 +82,44 @@ class PEFRepository(BaseRepository):
         is_fund_item: Optional[str],
         company_detail: Optional[str],
         other_specs_text: Optional[str],
-        transactions: Optional[List[TransactionHistory]] = None
+        transactions: Optional[List[TransactionHistory]] = None,
+        blob_sha256: Optional[str] = None,
+        instruction_pef_id: Optional[int] = None
     ) -> int:
         """
         instruction_pef + 연결된 transaction_history 리스트를 함께 저장
-        :return: 생성된 instruction_pef.id
+        instruction_pef_id가 주어지면 분석 대기 중인 기존 지시서에 AI 분석 결과를 채우고 완료 처리
+        :return: 생성(또는 갱신)된 instruction_pef.id
         """
         with BaseRepository.DB() as (cursor, conn):
             try:
                 # 1. instruction_pef 저장
-                insert_instruction_sql = """
-                INSERT INTO instruction_pef (
-                    performer_id, file_name, is_fund_item, company_detail, other_specs_text
-                ) VALUES (%s, %s, %s, %s, %s)
-                """
-                cursor.execute(insert_instruction_sql, (
-                    performer_id, file_name, is_fund_item or 'F',
-                    company_detail, other_specs_text
-                ))
-                instruction_pef_id = cursor.lastrowid
+                if instruction_pef_id is None:
+                    insert_instruction_sql = """
+                    INSERT INTO instruction_pef (
+                        performer_id, file_name, blob_sha256, is_fund_item, company_detail, other_specs_text
+                    ) VALUES (%s, %s, %s, %s, %s, %s)
+                    """
+                    cursor.execute(insert_instruction_sql, (
+                        performer_id, file_name, blob_sha256, is_fund_item or 'F',
+                        company_detail, other_specs_text
+                    ))
+                    instruction_pef_id = cursor.lastrowid
+                else:
+                    update_instruction_sql = """
+                    UPDATE instruction_pef
+                    SET is_fund_item = %s, company_detail = %s, other_specs_text = %s,
+                        analysis_status = %s, analysis_error = NULL
+                    WHERE id = %s
+                    """
+                    cursor.execute(update_instruction_sql, (
+                        is_fund_item or 'F', company_detail, other_specs_text,
+                        AiJobStatus.COMPLETE.value, instruction_pef_id
+                    ))
 
                 # 2. transaction_history 저장 (조건부)
                 if transactions:
-                    insert_transaction_sql = """
-                    INSERT INTO transaction_history (
-                        instruction_pef_id, deal_type, deal_object,
-                        bank_name, account_number, holder_name,
-                        amount, process_date
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """
-                    for tx in transactions:
-                        cursor.execute(insert_transaction_sql, (
-                            instruction_pef_id,
-                            tx.deal_type,
-                            tx.deal_object,
-                            tx.bank_name,
-                            tx.account_number,
-                            tx.holder_name,
-                            tx.amount,
-                            tx.process_date  # type: date
-                        ))
+                    PEFRepository._insert_transactions(cursor, instruction_pef_id, transactions)
 
                 conn.commit()
                 return instruction_pef_id
@@ -60,6 +128,85 @@ class PEFRepository(BaseRepository):
                 conn.rollback()
                 raise e
 
+    @staticmethod
+    def create_pending_instruction(performer_id: int, file_name: str, blob_sha256: Optional[str]) -> int:
+        """
+        AI 분석 전 instruction_pef를 분석 대기(PENDING) 상태로 저장
+        :return: 생성된 instruction_pef.id
+        """
+        sql = """
+        INSERT INTO instruction_pef (performer_id, file_name, blob_sha256, analysis_status)
+        VALUES (%s, %s, %s, %s)
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(sql, (performer_id, file_name, blob_sha256, AiJobStatus.PENDING.value))
+                conn.commit()
+                return cursor.lastrowid
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def update_analysis_status(instruction_pef_id: int, analysis_status: AiJobStatus,
+                               analysis_error: Optional[str] = None) -> bool:
+        sql = "UPDATE instruction_pef SET analysis_status = %s, analysis_error = %s WHERE id = %s"
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(sql, (analysis_status.value, analysis_error, instruction_pef_id))
+                conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def claim_analysis(instruction_pef_id: int) -> bool:
+        """
+        분석 대기(PENDING) 중인 지시서를 분석 중(RUNNING)으로 바꿉니다.
+        다른 작업이 이미 가져간 경우 False를 반환하여 같은 지시서를 두 번 분석하지 않도록 합니다.
+        """
+        sql = "UPDATE instruction_pef SET analysis_status = %s, analysis_error = NULL WHERE id = %s AND analysis_status = %s"
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(sql, (AiJobStatus.RUNNING.value, instruction_pef_id, AiJobStatus.PENDING.value))
+                conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def find_unfinished_analyses() -> List[Dict[str, Any]]:
+        """
+        서버 재시작으로 중단된 분석을 찾습니다.
+        분석 중(RUNNING)이던 지시서는 대기(PENDING)로 되돌린 뒤, 대기 중인 지시서 전체를 반환합니다.
+        (서버 시작 시 다른 프로세스가 분석을 진행하고 있지 않다는 전제에서 호출)
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    "UPDATE instruction_pef SET analysis_status = %s WHERE analysis_status = %s",
+                    (AiJobStatus.PENDING.value, AiJobStatus.RUNNING.value)
+                )
+                cursor.execute(
+                    "SELECT id, performer_id, file_name, blob_sha256 FROM instruction_pef WHERE analysis_status = %s ORDER BY id",
+                    (AiJobStatus.PENDING.value,)
+                )
+                rows = cursor.fetchall()
+                conn.commit()
+                return rows
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def get_analysis_status(instruction_pef_id: int) -> Optional[Dict[str, Any]]:
+        sql = "SELECT id, file_name, analysis_status, analysis_error FROM instruction_pef WHERE id = %s"
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (instruction_pef_id,))
+            return cursor.fetchone()
+
     @staticmethod
     def create_transaction_history(
         instruction_pef_id: int,
@@ -75,15 +222,15 @@ class PEFRepository(BaseRepository):
         INSERT INTO transaction_history (
             instruction_pef_id, deal_type, deal_object,
             bank_name, account_number, holder_name,
-            amount, process_date
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            amount, amount_value, process_date
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         try:
             with BaseRepository.DB() as (cursor, conn):
                 cursor.execute(sql, (
                     instruction_pef_id, deal_type, deal_object,
                     bank_name, account_number, holder_name,
-                    amount, process_date
+                    amount, parse_amount(amount), process_date
                 ))
                 conn.commit()
                 return True
@@ -91,6 +238,23 @@ class PEFRepository(BaseRepository):
             conn.rollback()
             raise e
 
+    @staticmethod
+    def create_transaction_histories(instruction_pef_id: int, transactions: List[TransactionHistory]) -> int:
+        """
+        기존 instruction_pef에 여러 거래 내역을 하나의 트랜잭션으로 추가
+        :return: 저장된 행 수
+        """
+        if not transactions:
+            return 0
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                inserted = PEFRepository._insert_transactions(cursor, instruction_pef_id, transactions)
+                conn.commit()
+                return inserted
+            except Exception as e:
+                conn.rollback()
+                raise e
+
     @staticmethod
     def get_all_pef_instructions() -> List[Dict[str, Any]]:
         sql = "SELECT * FROM instruction_pef ORDER BY id DESC"
@@ -98,6 +262,91 @@ class PEFRepository(BaseRepository):
             cursor.execute(sql)
             return cursor.fetchall()
 
+    @staticmethod
+    def get_pef_instruction_by_id(instruction_pef_id: int) -> Optional[Dict[str, Any]]:
+        sql = "SELECT * FROM instruction_pef WHERE id = %s"
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (instruction_pef_id,))
+            return cursor.fetchone()
+
+    @staticmethod
+    def get_pef_instruction_with_transactions(instruction_pef_id: int) -> Optional[Dict[str, Any]]:
+        """
+        instruction_pef와 연결된 transaction_history를 한 번의 조회(LEFT JOIN)로 가져옵니다.
+        :return: instruction_pef 컬럼 + transactions(거래 내역 dict 목록), 지시서가 없으면 None
+        """
+        sql = """
+        SELECT
+            p.*,
+            t.id AS tx_id, t.deal_type, t.deal_object, t.bank_name, t.account_number,
+            t.holder_name, t.amount, t.amount_value, t.process_date
+        FROM instruction_pef p
+        LEFT JOIN transaction_history t ON t.instruction_pef_id = p.id
+        WHERE p.id = %s
+        ORDER BY t.id ASC
+        """
+        tx_columns = ("deal_type", "deal_object", "bank_name", "account_number",
+                      "holder_name", "amount", "amount_value", "process_date")
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (instruction_pef_id,))
+            rows = cursor.fetchall()
+
+        if not rows:
+            return None
+
+        instruction = {k: v for k, v in rows[0].items() if k != "tx_id" and k not in tx_columns}
+        instruction["transactions"] = [
+            dict({"id": row["tx_id"], "instruction_pef_id": instruction_pef_id},
+                 **{k: row[k] for k in tx_columns})
+            for row in rows if row["tx_id"] is not None
+        ]
+        return instruction
+
+    @staticmethod
+    def aggregate_transactions(
+        group_by: List[str],
+        instruction_pef_id: Optional[int] = None,
+        deal_type: Optional[str] = None,
+        bank_name: Optional[str] = None,
+        holder_name: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        거래 내역 금액 합계/건수를 SQL에서 집계
+        :param group_by: TRANSACTION_GROUP_COLUMNS 중 그룹 기준 목록 (비어 있으면 전체 합계 1행)
+        :return: 그룹 컬럼 + total_amount, transaction_count, unparsed_count
+        """
+        group_columns = [TRANSACTION_GROUP_COLUMNS[g] for g in group_by]
+
+        conditions, params = [], []
+        for column, value in (("instruction_pef_id", instruction_pef_id), ("deal_type", deal_type),
+                              ("bank_name", bank_name), ("holder_name", holder_name)):
+            if value is not None:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if date_from is not None:
+            conditions.append("process_date >= %s")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("process_date <= %s")
+            params.append(date_to)
+
+        select_columns = group_columns + [
+            "COALESCE(SUM(amount_value), 0) AS total_amount",
+            "COUNT(*) AS transaction_count",
+            "SUM(amount_value IS NULL) AS unparsed_count",
+        ]
+        sql = f"SELECT {', '.join(select_columns)} FROM transaction_history"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if group_columns:
+            sql += f" GROUP BY {', '.join(group_columns)} ORDER BY {', '.join(group_columns)}"
+
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
     @staticmethod
     def get_transaction_histories_by_pef_instruction_id(instruction_pef_id: int) -> List[Dict[str, Any]]:
         sql = "SELECT * FROM transaction_history WHERE instruction_pef_id = %s ORDER BY id ASC"
@@ -117,6 +366,7 @@ class PEFRepository(BaseRepository):
             account_number = %s,
             holder_name = %s,
             amount = %s,
+            amount_value = %s,
             process_date = %s
         WHERE id = %s
         """
@@ -129,6 +379,7 @@ class PEFRepository(BaseRepository):
                     transaction_history.account_number,
                     transaction_history.holder_name,
                     transaction_history.amount,
+                    parse_amount(transaction_history.amount),
                     transaction_history.process_date,
                     transaction_history.id
                 ))
@@ -138,6 +389,14 @@ class PEFRepository(BaseRepository):
             conn.rollback()
             raise e
 
+    @staticmethod
+    def get_blob_sha256(instruction_pef_id: int) -> Optional[str]:
+        sql = "SELECT blob_sha256 FROM instruction_pef WHERE id = %s"
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (instruction_pef_id,))
+            row = cursor.fetchone()
+            return row["blob_sha256"] if row else None
+
     @staticmethod
     def delete_instruction_pef(instruction_pef_id: int) -> bool:
         sql = "DELETE FROM instruction_pef WHERE id = %s"
@@ -0,0 +1,36 @@
+from base_repository import BaseRepository
+
+
+class ReferenceVersionRepository:
+
+    @staticmethod
+    def get_version(name: str) -> int:
+        '''
+        기준 데이터의 현재 버전을 조회합니다. 한 번도 변경되지 않았으면 0을 반환합니다.
+        '''
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute('SELECT version FROM reference_data_version WHERE name = %s', (name,))
+            row = cursor.fetchone()
+            return row["version"] if row else 0
+
+    @staticmethod
+    def bump_version(name: str) -> int:
+        '''
+        기준 데이터의 버전을 1 올리고 새 버전을 반환합니다.
+        '''
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    '''
+                    INSERT INTO reference_data_version (name, version) VALUES (%s, 1)
+                    ON DUPLICATE KEY UPDATE version = version + 1
+                    ''',
+                    (name,)
+                )
+                cursor.execute('SELECT version FROM reference_data_version WHERE name = %s', (name,))
+                version = cursor.fetchone()["version"]
+                conn.commit()
+                return version
+            except Exception:
+                conn.rollback()
+                raise
@@ -1,15 +1,102 @@
+import json
+import zlib
+import base64
 from base_repository import BaseRepository
-from typing import Optional, List, Dict, Any
-from models import InstructionSpecialResult, Attachment
+from typing import Optional, List, Dict, Any, Tuple, Callable, Set
+from models import InstructionSpecialResult, Attachment, AiJobStatus
 from datetime import date
+from config import RESULT_COMPRESS_MIN_BYTES
+from mysql.connector import IntegrityError, errorcode
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 zlib으로 압축
+    zstandard = None
+
+# 상세 조회 시 항상 포함하는 결과 컬럼 (result_content, saved_json은 요청에 따라 포함)
+RESULT_SUMMARY_COLUMNS = ("id", "instruction_special_id", "created_at", "usability", "all_qualities", "average_quality", "version")
+# 압축 저장을 지원하는 결과 컬럼 (압축된 값은 <컬럼>_z에 저장)
+RESULT_PAYLOAD_COLUMNS = ("result_content", "saved_json")
+
+# 압축 데이터 앞의 1바이트 형식 표시
+_CODEC_ZSTD = b"S"
+_CODEC_ZLIB = b"Z"
+
+
+def compress_payload(text: Optional[str]) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    결과 텍스트를 저장 형태로 변환합니다.
+    RESULT_COMPRESS_MIN_BYTES 미만이면 (원문, None), 이상이면 (None, 압축 데이터)를 반환합니다.
+    """
+    if text is None:
+        return None, None
+    raw = text.encode("utf-8")
+    if len(raw) < RESULT_COMPRESS_MIN_BYTES:
+        return text, None
+    if zstandard is not None:
+        return None, _CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(raw)
+    return None, _CODEC_ZLIB + zlib.compress(raw, 6)
+
+
+def decompress_payload(data: Optional[bytes]) -> Optional[str]:
+    """compress_payload로 압축한 데이터를 원문으로 되돌립니다."""
+    if data is None:
+        return None
+    data = bytes(data)
+    codec, body = data[:1], data[1:]
+    if codec == _CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 결과를 읽으려면 zstandard를 설치해야 합니다: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(body).decode("utf-8")
+    raise ValueError("알 수 없는 압축 형식입니다.")
+
+
+def _restore_payloads(row: Dict[str, Any], base64_encoded: bool = False) -> Dict[str, Any]:
+    """조회한 결과 행의 <컬럼>_z 값을 풀어 원래 컬럼에 넣습니다."""
+    for column in RESULT_PAYLOAD_COLUMNS:
+        if f"{column}_z" not in row:
+            continue
+        compressed = row.pop(f"{column}_z")
+        if compressed is not None:
+            if base64_encoded:
+                compressed = base64.b64decode(compressed)
+            row[column] = decompress_payload(compressed)
+    return row
+
+class ResultVersionConflictError(Exception):
+    """수정하려는 결과의 버전이 요청한 버전과 다른 경우 (다른 사용자가 먼저 수정함)"""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"결과가 이미 수정되었습니다. 현재 버전: {current_version}")
+        self.current_version = current_version
+
 
 class SpecialRepository(BaseRepository):
 
+    @staticmethod
+    def _insert_result(cursor, instruction_special_id: int, result: InstructionSpecialResult):
+        """결과 한 건 저장 (큰 result_content / saved_json은 압축하여 저장, commit은 호출하는 쪽에서 처리)"""
+        result_content, result_content_z = compress_payload(result.result_content)
+        saved_json, saved_json_z = compress_payload(result.saved_json)
+        insert_result_sql = """
+        INSERT INTO instruction_special_result (
+            instruction_special_id, result_content, result_content_z,
+            all_qualities, average_quality, saved_json, saved_json_z
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+        cursor.execute(insert_result_sql, (
+            instruction_special_id, result_content, result_content_z,
+            result.all_qualities, result.average_quality, saved_json, saved_json_z
+        ))
+
     @staticmethod
     def create_with_result(
         performer_id: int,
         file_name: str,
-        result: Optional[InstructionSpecialResult] = None
+        result: Optional[InstructionSpecialResult] = None,
+        blob_sha256: Optional[str] = None
     ) -> int:
         """
         instruction_special +  instruction_special_result 함께 저장
@@ -19,20 +106,15 @@ class SpecialRepository(BaseRepository):
                 # 1. instruction_special 저장
                 insert_instruction_sql = """
                 INSERT INTO instruction_special (
-                    performer_id, file_name
-                ) VALUES (%s, %s)
+                    performer_id, file_name, blob_sha256
+                ) VALUES (%s, %s, %s)
                 """
-                cursor.execute(insert_instruction_sql, (performer_id, file_name))
+                cursor.execute(insert_instruction_sql, (performer_id, file_name, blob_sha256))
                 instruction_special_id = cursor.lastrowid
 
                 # 2. result 저장 (조건부)
                 if result:
-                    insert_result_sql = """
-                    INSERT INTO instruction_special_result (
-                        instruction_special_id, result_content, all_qualities, average_quality, saved_json
-                    ) VALUES (%s, %s, %s, %s, %s)
-                    """
-                    cursor.execute(insert_result_sql, (instruction_special_id, result.result_content, result.all_qualities, result.average_quality, result.saved_json))
+                    SpecialRepository._insert_result(cursor, instruction_special_id, result)
 
                 conn.commit()
                 return instruction_special_id
@@ -40,6 +122,84 @@ class SpecialRepository(BaseRepository):
                 conn.rollback()
                 raise e
             
+    @staticmethod
+    def create_pending_instruction(performer_id: int, file_name: str, blob_sha256: Optional[str]) -> int:
+        """
+        AI 분석 전 instruction_special을 분석 대기(PENDING) 상태로 저장
+        """
+        sql = """
+        INSERT INTO instruction_special (performer_id, file_name, blob_sha256, analysis_status)
+        VALUES (%s, %s, %s, %s)
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(sql, (performer_id, file_name, blob_sha256, AiJobStatus.PENDING.value))
+                conn.commit()
+                return cursor.lastrowid
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def update_analysis_status(instruction_special_id: int, analysis_status: AiJobStatus,
+                               analysis_error: Optional[str] = None) -> bool:
+        sql = "UPDATE instruction_special SET analysis_status = %s, analysis_error = %s WHERE id = %s"
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(sql, (analysis_status.value, analysis_error, instruction_special_id))
+                conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def claim_analysis(instruction_special_id: int) -> bool:
+        """
+        분석 대기(PENDING) 중인 지시서를 분석 중(RUNNING)으로 바꿉니다.
+        다른 작업이 이미 가져간 경우 False를 반환하여 같은 지시서를 두 번 분석하지 않도록 합니다.
+        """
+        sql = "UPDATE instruction_special SET analysis_status = %s, analysis_error = NULL WHERE id = %s AND analysis_status = %s"
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(sql, (AiJobStatus.RUNNING.value, instruction_special_id, AiJobStatus.PENDING.value))
+                conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def find_unfinished_analyses() -> List[Dict[str, Any]]:
+        """
+        서버 재시작으로 중단된 분석을 찾습니다.
+        분석 중(RUNNING)이던 지시서는 대기(PENDING)로 되돌린 뒤, 대기 중인 지시서 전체를 반환합니다.
+        (서버 시작 시 다른 프로세스가 분석을 진행하고 있지 않다는 전제에서 호출)
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    "UPDATE instruction_special SET analysis_status = %s WHERE analysis_status = %s",
+                    (AiJobStatus.PENDING.value, AiJobStatus.RUNNING.value)
+                )
+                cursor.execute(
+                    "SELECT id, performer_id, file_name, blob_sha256 FROM instruction_special WHERE analysis_status = %s ORDER BY id",
+                    (AiJobStatus.PENDING.value,)
+                )
+                rows = cursor.fetchall()
+                conn.commit()
+                return rows
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def get_analysis_status(instruction_special_id: int) -> Optional[Dict[str, Any]]:
+        sql = "SELECT id, file_name, analysis_status, analysis_error FROM instruction_special WHERE id = %s"
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (instruction_special_id,))
+            return cursor.fetchone()
+
     @staticmethod
     def create_attachment(
         instruction_special_id: int,
@@ -52,10 +212,10 @@ class SpecialRepository(BaseRepository):
             try:
                 insert_sql = """
                 INSERT INTO attachment (
-                    instruction_special_id, file_name
-                ) VALUES (%s, %s)
+                    instruction_special_id, file_name, blob_sha256
+                ) VALUES (%s, %s, %s)
                 """
-                cursor.execute(insert_sql, (instruction_special_id, attachment.file_name))
+                cursor.execute(insert_sql, (instruction_special_id, attachment.file_name, attachment.blob_sha256))
                 attachment_id = cursor.lastrowid
                 conn.commit()
                 return attachment_id
@@ -63,6 +223,89 @@ class SpecialRepository(BaseRepository):
                 conn.rollback()
                 raise e
     
+    @staticmethod
+    def create_attachments(
+        instruction_special_id: int,
+        attachments: List[Attachment]
+    ) -> List[Optional[int]]:
+        """
+        여러 attachment를 하나의 multi-row INSERT로 저장
+        동시에 같은 이름이 등록되어 중복 키 오류가 나면 행 단위로 다시 저장하여
+        중복된 파일만 제외합니다.
+        :return: 입력 순서와 같은 순서의 attachment ID 목록 (이름이 중복되어 저장하지 못한 항목은 None)
+        """
+        if not attachments:
+            return []
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                placeholders = ", ".join(["(%s, %s, %s)"] * len(attachments))
+                params = []
+                for attachment in attachments:
+                    params.extend((instruction_special_id, attachment.file_name, attachment.blob_sha256))
+                try:
+                    cursor.execute(
+                        f"INSERT INTO attachment (instruction_special_id, file_name, blob_sha256) VALUES {placeholders}",
+                        params
+                    )
+                except IntegrityError as e:
+                    if e.errno != errorcode.ER_DUP_ENTRY:
+                        raise
+                    # 실패한 문장은 아무 행도 넣지 않았으므로 같은 트랜잭션에서 행 단위로 다시 시도
+                    attachment_ids = SpecialRepository._insert_attachments_one_by_one(
+                        cursor, instruction_special_id, attachments
+                    )
+                else:
+                    # 단일 INSERT 문의 AUTO_INCREMENT 값은 연속으로 할당됨
+                    first_id = cursor.lastrowid
+                    attachment_ids = [first_id + i for i in range(len(attachments))]
+                conn.commit()
+                return attachment_ids
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def _insert_attachments_one_by_one(
+        cursor,
+        instruction_special_id: int,
+        attachments: List[Attachment]
+    ) -> List[Optional[int]]:
+        attachment_ids: List[Optional[int]] = []
+        for attachment in attachments:
+            try:
+                cursor.execute(
+                    "INSERT INTO attachment (instruction_special_id, file_name, blob_sha256) VALUES (%s, %s, %s)",
+                    (instruction_special_id, attachment.file_name, attachment.blob_sha256)
+                )
+                attachment_ids.append(cursor.lastrowid)
+            except IntegrityError as e:
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                attachment_ids.append(None)
+        return attachment_ids
+
+    @staticmethod
+    def find_existing_attachment_names(instruction_special_id: int, file_names: List[str]) -> Set[str]:
+        """
+        지시서에 이미 등록된 첨부 파일 이름을 한 번의 조회로 찾습니다
+        ((instruction_special_id, file_name)은 UNIQUE)
+        """
+        if not file_names:
+            return set()
+        placeholders = ", ".join(["%s"] * len(file_names))
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(
+                f"SELECT file_name FROM attachment WHERE instruction_special_id = %s AND file_name IN ({placeholders})",
+                [instruction_special_id] + list(file_names)
+            )
+            return {row["file_name"] for row in cursor.fetchall()}
+
+    @staticmethod
+    def exists(instruction_special_id: int) -> bool:
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute("SELECT 1 FROM instruction_special WHERE id = %s", (instruction_special_id,))
+            return cursor.fetchone() is not None
+
     @staticmethod
     def create_another_result(
         instruction_special_id: int,
@@ -71,12 +314,7 @@ class SpecialRepository(BaseRepository):
         if result:
             with BaseRepository.DB() as (cursor, conn):
                 try:
-                    insert_result_sql = """
-                    INSERT INTO instruction_special_result (
-                        instruction_special_id, result_content, all_qualities, average_quality, saved_json
-                    ) VALUES (%s, %s, %s, %s, %s)
-                    """
-                    cursor.execute(insert_result_sql, (instruction_special_id, result.result_content, result.all_qualities, result.average_quality, result.saved_json))
+                    SpecialRepository._insert_result(cursor, instruction_special_id, result)
                     conn.commit()
                     return True
                 except Exception as e:
@@ -84,6 +322,26 @@ class SpecialRepository(BaseRepository):
                     raise e
         return False
         
+    @staticmethod
+    def complete_analysis(instruction_special_id: int, result: InstructionSpecialResult) -> int:
+        """
+        AI 분석 결과를 저장하고 지시서를 완료(COMPLETE) 상태로 바꾸는 작업을 하나의 트랜잭션으로 처리
+        :return: 생성된 instruction_special_result.id
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                SpecialRepository._insert_result(cursor, instruction_special_id, result)
+                result_id = cursor.lastrowid
+                cursor.execute(
+                    "UPDATE instruction_special SET analysis_status = %s, analysis_error = NULL WHERE id = %s",
+                    (AiJobStatus.COMPLETE.value, instruction_special_id)
+                )
+                conn.commit()
+                return result_id
+            except Exception as e:
+                conn.rollback()
+                raise e
+
     @staticmethod
     def update_result_content(
         instruction_special_id: int,
@@ -95,9 +353,10 @@ class SpecialRepository(BaseRepository):
         """
         with BaseRepository.DB() as (cursor, conn):
             try:
+                plain, compressed = compress_payload(new_content)
                 cursor.execute(
-                    "UPDATE instruction_special_result SET result_content = %s WHERE id=%s AND instruction_special_id=%s",
-                    (new_content, result_id, instruction_special_id,)
+                    "UPDATE instruction_special_result SET result_content = %s, result_content_z = %s, version = version + 1 WHERE id=%s AND instruction_special_id=%s",
+                    (plain, compressed, result_id, instruction_special_id,)
                 )
                 affected_rows = cursor.rowcount
                 conn.commit()
@@ -118,7 +377,7 @@ class SpecialRepository(BaseRepository):
         with BaseRepository.DB() as (cursor, conn):
             try:
                 cursor.execute(
-                    "UPDATE instruction_special_result SET usability = %s WHERE id=%s AND instruction_special_id=%s",
+                    "UPDATE instruction_special_result SET usability = %s, version = version + 1 WHERE id=%s AND instruction_special_id=%s",
                     (usability, result_id, instruction_special_id,)
                 )
                 affected_rows = cursor.rowcount
@@ -139,9 +398,10 @@ class SpecialRepository(BaseRepository):
         """
         with BaseRepository.DB() as (cursor, conn):
             try:
+                plain, compressed = compress_payload(new_json)
                 cursor.execute(
-                    "UPDATE instruction_special_result SET saved_json = %s WHERE id=%s AND instruction_special_id=%s",
-                    (new_json, result_id, instruction_special_id,)
+                    "UPDATE instruction_special_result SET saved_json = %s, saved_json_z = %s, version = version + 1 WHERE id=%s AND instruction_special_id=%s",
+                    (plain, compressed, result_id, instruction_special_id,)
                 )
                 affected_rows = cursor.rowcount
                 conn.commit()
@@ -150,6 +410,107 @@ class SpecialRepository(BaseRepository):
                 conn.rollback()
                 raise e
     
+    @staticmethod
+    def patch_result_json(
+        instruction_special_id: int,
+        result_id: int,
+        apply_patch: Callable[[Optional[str]], str],
+        expected_version: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        saved_json을 행 잠금 상태에서 읽어 apply_patch로 수정한 뒤 저장
+        :param apply_patch: 현재 saved_json 문자열을 받아 새 문자열을 반환하는 함수
+        :param expected_version: 지정하면 현재 버전과 같을 때만 저장
+        :return: 저장 후 버전, 결과가 없으면 None
+        :raises ResultVersionConflictError: 현재 버전이 expected_version과 다른 경우
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    """
+                    SELECT saved_json, saved_json_z, version FROM instruction_special_result
+                    WHERE id=%s AND instruction_special_id=%s FOR UPDATE
+                    """,
+                    (result_id, instruction_special_id)
+                )
+                row = cursor.fetchone()
+                if not row:
+                    conn.rollback()
+                    return None
+                if expected_version is not None and row["version"] != expected_version:
+                    raise ResultVersionConflictError(row["version"])
+
+                current = _restore_payloads(row)["saved_json"]
+                plain, compressed = compress_payload(apply_patch(current))
+                cursor.execute(
+                    """
+                    UPDATE instruction_special_result
+                    SET saved_json = %s, saved_json_z = %s, version = version + 1
+                    WHERE id=%s
+                    """,
+                    (plain, compressed, result_id)
+                )
+                conn.commit()
+                return row["version"] + 1
+            except Exception as e:
+                conn.rollback()
+                raise e
+
+    @staticmethod
+    def get_special_instruction_detail(
+        instruction_special_id: int,
+        include_content: bool = True,
+        include_json: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        instruction_special, 결과 목록, 첨부 파일 목록을 한 번의 조회로 가져옵니다.
+        결과와 첨부 파일은 JSON_ARRAYAGG 서브쿼리로 묶어 한 행으로 받습니다.
+        :param include_content: result_content 포함 여부
+        :param include_json: saved_json 포함 여부
+        :return: instruction_special 컬럼 + results(최신순), attachments, 지시서가 없으면 None
+        """
+        result_columns = list(RESULT_SUMMARY_COLUMNS)
+        if include_content:
+            result_columns.append("result_content")
+        if include_json:
+            result_columns.append("saved_json")
+        result_object = ", ".join(f"'{column}', r.{column}" for column in result_columns)
+        # 압축된 값은 JSON 안에 넣을 수 있도록 base64로 꺼낸 뒤 여기서 풂
+        result_object += "".join(
+            f", '{column}_z', TO_BASE64(r.{column}_z)"
+            for column in RESULT_PAYLOAD_COLUMNS if column in result_columns
+        )
+
+        sql = f"""
+        SELECT
+            s.*,
+            (SELECT JSON_ARRAYAGG(JSON_OBJECT({result_object}))
+             FROM instruction_special_result r
+             WHERE r.instruction_special_id = s.id) AS results_json,
+            (SELECT JSON_ARRAYAGG(JSON_OBJECT(
+                 'id', a.id, 'instruction_special_id', a.instruction_special_id,
+                 'file_name', a.file_name, 'blob_sha256', a.blob_sha256))
+             FROM attachment a
+             WHERE a.instruction_special_id = s.id) AS attachments_json
+        FROM instruction_special s
+        WHERE s.id = %s
+        """
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (instruction_special_id,))
+            row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        results_json = row.pop("results_json")
+        attachments_json = row.pop("attachments_json")
+        # JSON_ARRAYAGG는 순서를 보장하지 않으므로 기존 조회와 같은 순서로 정렬
+        results = [_restore_payloads(r, base64_encoded=True) for r in json.loads(results_json or "[]")]
+        row["results"] = sorted(results, key=lambda r: r["id"], reverse=True)
+        row["attachments"] = sorted(json.loads(attachments_json) if attachments_json else [],
+                                    key=lambda a: a["id"])
+        return row
+
     @staticmethod
     def get_all_special_instructions() -> List[Dict[str, Any]]:
         sql = "SELECT * FROM instruction_special ORDER BY id DESC"
@@ -158,18 +519,40 @@ class SpecialRepository(BaseRepository):
             return cursor.fetchall()
     
     @staticmethod
-    def get_all_results_by_special_instruction_id(instruction_special_id: int) -> List[Dict[str, Any]]:
-        sql = "SELECT * FROM instruction_special_result WHERE instruction_special_id = %s ORDER BY id DESC"
+    def get_all_results_by_special_instruction_id(
+        instruction_special_id: int,
+        include_payload: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        :param include_payload: False면 result_content, saved_json을 빼고 조회 (목록 화면용)
+        """
+        columns = "*" if include_payload else ", ".join(RESULT_SUMMARY_COLUMNS)
+        sql = f"SELECT {columns} FROM instruction_special_result WHERE instruction_special_id = %s ORDER BY id DESC"
         with BaseRepository.DB() as (cursor, _):
             cursor.execute(sql, (instruction_special_id,))
-            return cursor.fetchall()
+            return [_restore_payloads(row) for row in cursor.fetchall()]
     
     @staticmethod
     def get_result_by_id(result_id: int) -> Dict[str, Any]:
         sql = "SELECT * FROM instruction_special_result WHERE id = %s"
         with BaseRepository.DB() as (cursor, _):
             cursor.execute(sql, (result_id,))
-            return cursor.fetchone()
+            row = cursor.fetchone()
+            return _restore_payloads(row) if row else row
+
+    @staticmethod
+    def get_result_payload(result_id: int, column: str) -> Optional[Dict[str, Any]]:
+        """
+        결과 한 건의 result_content 또는 saved_json만 조회 (지연 로딩용)
+        :return: {"id", "instruction_special_id", column}, 결과가 없으면 None
+        """
+        if column not in RESULT_PAYLOAD_COLUMNS:
+            raise ValueError(f"지원하지 않는 컬럼입니다: {column}")
+        sql = f"SELECT id, instruction_special_id, {column}, {column}_z FROM instruction_special_result WHERE id = %s"
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (result_id,))
+            row = cursor.fetchone()
+            return _restore_payloads(row) if row else None
     
     @staticmethod
     def get_attachments_by_instruction_id(instruction_special_id: int) -> List[Dict[str, Any]]:
@@ -178,6 +561,14 @@ class SpecialRepository(BaseRepository):
             cursor.execute(sql, (instruction_special_id,))
             return cursor.fetchall()
         
+    @staticmethod
+    def get_attachment_blob_sha256(attachment_id: int) -> Optional[str]:
+        sql = "SELECT blob_sha256 FROM attachment WHERE id = %s"
+        with BaseRepository.DB() as (cursor, _):
+            cursor.execute(sql, (attachment_id,))
+            row = cursor.fetchone()
+            return row["blob_sha256"] if row else None
+
     @staticmethod
     def delete_result_by_id(result_id: int) -> bool:
         with BaseRepository.DB() as (cursor, conn):
@@ -190,6 +581,41 @@ class SpecialRepository(BaseRepository):
                 conn.rollback()
                 raise e
 
+    @staticmethod
+    def delete_special_instruction_with_blobs(instruction_special_id: int) -> Optional[List[str]]:
+        """
+        지시서를 삭제하고, 지시서 원본과 첨부 파일이 참조하던 blob 해시 목록을 반환합니다. (참조 해제용)
+        지시서 행을 잠근 뒤 같은 트랜잭션에서 해시를 읽고 삭제하므로, 그 사이에 추가되는
+        첨부 파일은 삭제가 끝날 때까지 대기하여 참조가 누락되지 않습니다.
+        :return: blob 해시 목록 (지시서가 없으면 None)
+        """
+        with BaseRepository.DB() as (cursor, conn):
+            try:
+                cursor.execute(
+                    "SELECT blob_sha256 FROM instruction_special WHERE id = %s FOR UPDATE",
+                    (instruction_special_id,)
+                )
+                instruction = cursor.fetchone()
+                if not instruction:
+                    conn.rollback()
+                    return None
+
+                cursor.execute(
+                    "SELECT blob_sha256 FROM attachment WHERE instruction_special_id = %s AND blob_sha256 IS NOT NULL FOR UPDATE",
+                    (instruction_special_id,)
+                )
+                blob_sha256s = [row["blob_sha256"] for row in cursor.fetchall()]
+                if instruction["blob_sha256"]:
+                    blob_sha256s.insert(0, instruction["blob_sha256"])
+
+                # 첨부 파일은 CASCADE로 함께 삭제
+                cursor.execute("DELETE FROM instruction_special WHERE id = %s", (instruction_special_id,))
+                conn.commit()
+                return blob_sha256s
+            except Exception as e:
+                conn.rollback()
+                raise e
+
     @staticmethod
     def delete_special_instruction(instruction_special_id: int) -> bool:
         with BaseRepository.DB() as (cursor, conn):
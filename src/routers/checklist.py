@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, Query
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Header, Response, status
 from models import User, Checklist
 from services.checklist_service import ChecklistService
 from auth.jwt_utils import get_current_user
+from services.file_download import etag_matches
 from auth.dependencies import get_system_user
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 router = APIRouter()
 
@@ -29,13 +30,26 @@ async def add_checklist(
 
     
 @router.get("/get-all", response_model=List[Checklist])
-async def get_all_checklist(current_user: Dict[str, Any] = Depends(get_current_user)):
-    """모든 체크리스트 항목을 조회합니다."""
+async def get_all_checklist(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    모든 체크리스트 항목을 조회합니다.
+    응답의 ETag를 If-None-Match로 보내면 목록이 바뀌지 않은 경우 304를 반환합니다.
+    """
     try:
-        return ChecklistService.get_all_questions()
+        items, etag = ChecklistService.get_all_questions_with_etag()
     except Exception as e:
         raise HTTPException(status_code=500, detail="서버 오류가 발생했습니다.")
 
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return items
+
 @router.put("/edit", response_model=Dict[str, str])
 async def update_checklist(
     checklist: Checklist,
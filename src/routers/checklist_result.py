@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Path, Query
 from services.checklist_result_service import ChecklistResultService
 from auth.jwt_utils import get_current_user
 from typing import List, Dict, Any, Optional
-from models import Checklist_Result_Value
+from models import Checklist_Result_Value, Checklist_Result_Bulk_Create
 
 router = APIRouter()
 
@@ -34,6 +34,33 @@ async def create_checklist_result(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다.\n{e}")
 
+@router.post("/create-bulk", response_model=Dict[str, Any])
+async def create_checklist_results_bulk(
+    request: Checklist_Result_Bulk_Create,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """한 계약서의 체크리스트 결과를 한 번에 생성/갱신합니다."""
+    try:
+        current_user_id = current_user["id"]
+        result_ids = ChecklistResultService.create_results_bulk(
+            user_id=current_user_id,
+            contract_id=request.contract_id,
+            items=request.results,
+            replace_values=request.replace_values
+        )
+        return {
+            "message": "체크리스트 결과가 성공적으로 저장되었습니다.",
+            "contract_id": request.contract_id,
+            "checklist_result_ids": {str(k): v for k, v in result_ids.items()},
+            "value_count": sum(len(item.values) for item in request.results)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"서버 오류가 발생했습니다.\n{e}")
+
 @router.patch("/update-memo/{checklist_result_id}", response_model=Dict[str, str], dependencies=[Depends(get_current_user)])
 async def update_checklist_result_memo(
     checklist_result_id: int = Path(..., description="메모를 업데이트할 체크리스트 결과 ID"),
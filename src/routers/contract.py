@@ -1,61 +1,184 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from services.contract_service import ContractService
 from services.user_service import UserService
+from services.system_service import SystemService
+from services.file_writer import FileTooLargeError
+from services.file_download import file_download_response, guess_media_type
 from auth.jwt_utils import get_current_user
+from auth.dependencies import get_system_user
 import os
-from typing import List, Dict, Any
-from models import Contract, OcrResultResponse
+import zipfile
+from typing import List, Dict, Any, Optional
+from models import Contract, OcrResultResponse, OcrPriority
+from config import ZIP_MAX_ENTRIES, ZIP_MAX_UNCOMPRESSED_BYTES
 
 import logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+async def _check_priority_allowed(user_id: int, priority: OcrPriority):
+    """
+    HIGH 우선순위는 다른 사용자의 OCR 작업을 모두 앞지르므로 시스템 관리자만 지정할 수 있습니다.
+    """
+    if priority == OcrPriority.HIGH and not await run_in_threadpool(SystemService.is_system_user, user_id):
+        raise HTTPException(status_code=403, detail="HIGH 우선순위는 시스템 관리자만 지정할 수 있습니다.")
+
 @router.post("/upload")
 async def upload_contract(
     current_user: Dict[str, Any] = Depends(get_current_user),
     contract_name: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    priority: OcrPriority = Form(OcrPriority.NORMAL)
 ):
-     # 임시 파일로 저장
-    temp_file_path = f"temp/{file.filename}"
-    os.makedirs("temp", exist_ok=True)
-    
     try:
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(await file.read())
-        
-        logger.info(f"파일 업로드: {file.filename}, 크기: {os.path.getsize(temp_file_path)} 바이트")
-        
-        # 계약서 업로드 및 OCR 처리
-        returned_result = ContractService.upload_contract(
-            uploader_id= current_user["id"],
+        await _check_priority_allowed(current_user["id"], priority)
+
+        # 업로드 스트림을 그대로 넘겨 최종 경로에 한 번만 기록 (파일 저장은 블로킹 작업이므로 스레드풀에서 실행)
+        returned_result = await run_in_threadpool(
+            ContractService.upload_contract,
+            uploader_id=current_user["id"],
             contract_name=contract_name,
-            file_name=file.filename,
-            file_path=temp_file_path
+            file_name=os.path.basename(file.filename),
+            file=file.file,
+            priority=priority
         )
         
-        logger.info(f"업로드 결과 타입: {type(result)}")
-        logger.info(f"업로드 결과: {result}")
+        logger.info(f"업로드 결과: {returned_result}")
         
         # 딕셔너리 반환
         if hasattr(returned_result, "dict"):
             result = returned_result.dict()
-        elif hasattr(result, "model_dump"):
+        elif hasattr(returned_result, "model_dump"):
             result = returned_result.model_dump()
         else:
             result = returned_result
 
         return result
     
+    except HTTPException:
+        raise
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         logger.error(f"계약서 업로드 중 오류 발생: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"계약서 업로드 중 오류 발생: {str(e)}")
     finally:
-        # 임시 파일 삭제
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        await file.close()
+
+@router.post("/upload-batch")
+async def upload_contracts_batch(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    files: List[UploadFile] = File(...),
+    contract_names: Optional[List[str]] = Form(None),
+    priority: OcrPriority = Form(OcrPriority.LOW)
+):
+    """
+    여러 계약서를 한 번에 업로드합니다.
+    일반 파일과 ZIP 파일을 함께 보낼 수 있으며, ZIP 파일은 내부 파일 각각을 계약서로 등록합니다.
+    contract_names를 생략하면 파일 이름(확장자 제외)을 계약 이름으로 사용합니다.
+    ZIP 내부 파일 수와 압축 해제 후 전체 크기가 제한(ZIP_MAX_ENTRIES, ZIP_MAX_UNCOMPRESSED_BYTES)을
+    넘으면 아무 파일도 저장하지 않고 거부합니다.
+    """
+    if contract_names and len(contract_names) != len(files):
+        raise HTTPException(status_code=400, detail="contract_names 개수가 파일 개수와 일치하지 않습니다.")
+    await _check_priority_allowed(current_user["id"], priority)
+
+    archives = []
+    zip_entries = 0
+    zip_bytes = 0
+    try:
+        entries = []
+        for idx, upload in enumerate(files):
+            contract_name = contract_names[idx] if contract_names else None
+
+            if upload.filename and upload.filename.lower().endswith(".zip"):
+                try:
+                    archive = zipfile.ZipFile(upload.file)
+                except zipfile.BadZipFile:
+                    raise HTTPException(status_code=400, detail=f"잘못된 ZIP 파일입니다: {upload.filename}")
+                archives.append(archive)
+                for member in archive.infolist():
+                    if member.is_dir():
+                        continue
+                    member_name = os.path.basename(member.filename)
+                    if not member_name:
+                        continue
+                    # 헤더의 크기 값보다 많이 풀리지 않으므로 (zipfile이 보장) 저장 전에 합계로 판단
+                    zip_entries += 1
+                    zip_bytes += member.file_size
+                    if zip_entries > ZIP_MAX_ENTRIES:
+                        raise HTTPException(
+                            status_code=413, detail=f"ZIP 내부 파일은 최대 {ZIP_MAX_ENTRIES}개까지 업로드할 수 있습니다."
+                        )
+                    if zip_bytes > ZIP_MAX_UNCOMPRESSED_BYTES:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"ZIP 압축 해제 크기가 허용 범위({ZIP_MAX_UNCOMPRESSED_BYTES} bytes)를 초과했습니다."
+                        )
+                    name = os.path.splitext(member_name)[0]
+                    if contract_name:
+                        name = f"{contract_name}_{name}"
+                    entries.append((name, member_name, archive.open(member)))
+            else:
+                file_name = os.path.basename(upload.filename)
+                entries.append((contract_name or os.path.splitext(file_name)[0], file_name, upload.file))
+
+        # 파일 저장과 DB 작업은 블로킹 작업이므로 스레드풀에서 실행
+        result = await run_in_threadpool(
+            ContractService.upload_contracts_batch,
+            current_user["id"], entries, priority
+        )
+        return result.dict()
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"계약서 일괄 업로드 중 오류 발생: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"계약서 일괄 업로드 중 오류 발생: {str(e)}")
+    finally:
+        for archive in archives:
+            archive.close()
+
+@router.get("/batches/{batch_id}")
+async def get_upload_batch(batch_id: str, current_user: Dict[str, Any] = Depends(get_current_user)):
+    """
+    일괄 업로드 배치의 파일별 업로드/OCR 처리 상태를 조회합니다.
+    """
+    try:
+        return ContractService.get_upload_batch(user_id=current_user["id"], batch_id=batch_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{e}")
+
+@router.api_route("/{contract_id}/file", methods=["GET", "HEAD"])
+async def download_contract_file(
+    request: Request,
+    contract_id: int,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    계약서 원본 파일을 내려받습니다.
+    PDF 뷰어가 필요한 구간만 받을 수 있도록 Range 요청을 지원하며,
+    ETag는 파일 내용 해시이므로 If-None-Match로 재검증할 수 있습니다.
+    """
+    try:
+        path, sha256, file_name = await run_in_threadpool(
+            ContractService.get_contract_file, current_user["id"], contract_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return file_download_response(
+        request, path, etag=sha256,
+        media_type=guess_media_type(file_name),
+        filename=file_name
+    )
 
 @router.get("/{contract_id}/ocr", response_model=OcrResultResponse)
 async def get_contract_ocr_result(contract_id: int):
@@ -101,6 +224,32 @@ async def read_all_contracts(current_user: Dict[str, Any] = Depends(get_current_
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"{e}")
     
+@router.get("/review-summary", response_model=Dict[str, Any])
+async def read_contract_review_summaries(
+    limit: int = Query(50, ge=1, le=500, description="조회할 최대 계약서 수"),
+    offset: int = Query(0, ge=0, description="건너뛸 계약서 수"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """계약서별 체크리스트/키포인트 결과 요약을 최신 계약서 순으로 조회합니다."""
+    try:
+        return ContractService.get_review_summaries(user_id=current_user["id"], limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{e}")
+
+@router.post("/review-summary/rebuild", response_model=Dict[str, Any])
+async def rebuild_contract_review_summaries(current_user: Dict[str, Any] = Depends(get_system_user)):
+    """모든 계약서의 검토 요약을 다시 계산합니다. 시스템 관리자만 접근 가능합니다."""
+    try:
+        return ContractService.rebuild_review_summaries(user_id=current_user["id"])
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{e}")
+    
 @router.get("/uploaded", response_model=List[Contract])
 async def read_only_uploaded_contracts(current_user: Dict[str, Any] = Depends(get_current_user)):
     try:
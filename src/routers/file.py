@@ -1,19 +1,20 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
 from fastapi.responses import JSONResponse
-import httpx
-import os
-import shutil
+from fastapi.concurrency import run_in_threadpool
+import re
+from urllib.parse import quote
 from typing import Optional
 from pydantic import BaseModel
-from database import get_db_connection
+from repositories.document_repository import DocumentRepository
+from services.blob_store import get_blob_store
+from services.file_writer import FileTooLargeError
+from services.file_download import file_download_response, guess_media_type
+from services.ai_client import get_ai_client, AiServerError, AiDownloadIntegrityError
+from repositories.ai_job_repository import AiJobRepository
+from services.ai_job_service import AiJobService
 from auth.jwt_utils import get_current_user  # 이제 이 함수는 위에서 정의했음
 
 router = APIRouter()
-UPLOAD_DIR = "./contracts/original/"
-AI_SERVER_URL = "http://192.168.0.196:8001"  # AI 서버 주소
-
-# 필요한 디렉토리 생성
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 class ProcessResult(BaseModel):
     success: bool
@@ -29,134 +30,191 @@ async def upload_file(
 ):
     """파일 업로드 및 문서 정보 DB 저장"""
 
-    file_location = f"{UPLOAD_DIR}/{file.filename}"
-
-    # 파일 저장
-    with open(file_location, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # DB 연결
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    insert_query = """
-        INSERT INTO document (document_name, file_name, embedding_id, doc_type, user_id, current_state)
-        VALUES (%s, %s, NULL, %s, %s, 0)
-    """
-    values = (document_name, file.filename, doc_type, current_user['id'])
+    # 파일 저장 (내용 해시 기준 blob 저장소, 같은 이름의 업로드가 서로 덮어쓰지 않음)
+    blob_store = get_blob_store()
+    try:
+        blob = await run_in_threadpool(blob_store.put_stream, file.file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
 
     try:
-        cursor.execute(insert_query, values)
-        conn.commit()
-        document_id = cursor.lastrowid
+        document_id = await run_in_threadpool(
+            DocumentRepository.create_document,
+            document_name, file.filename, doc_type, current_user['id'], blob.sha256
+        )
     except Exception as e:
-        conn.rollback()
+        blob_store.release(blob.sha256)
         raise HTTPException(status_code=500, detail=f"DB 오류: {str(e)}")
-    finally:
-        cursor.close()
-        conn.close()
 
     return JSONResponse(content={
         "message": "파일 업로드 및 도큐먼트 저장 완료",
         "document_id": document_id,
         "filename": file.filename,
-        "url": f"/files/{file.filename}"
+        "sha256": blob.sha256,
+        "url": f"/files/blobs/{blob.sha256}"
     })
-@router.post("/process-document/")
+
+@router.delete("/documents/{document_id}")
+async def delete_document(document_id: int, current_user: dict = Depends(get_current_user)):
+    """문서를 삭제하고 파일 blob 참조를 해제합니다. 업로드한 사용자만 삭제할 수 있습니다."""
+    document = await run_in_threadpool(DocumentRepository.find_by_id, document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="존재하지 않는 문서입니다.")
+    if document["user_id"] != current_user["id"]:
+        raise HTTPException(status_code=403, detail="문서를 삭제할 권한이 없습니다.")
+
+    blob_sha256 = await run_in_threadpool(DocumentRepository.delete_document, document_id)
+    if blob_sha256 is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 문서입니다.")
+    await run_in_threadpool(get_blob_store().release, blob_sha256)
+    return {"message": "문서가 삭제되었습니다.", "document_id": document_id}
+
+@router.api_route("/blobs/{sha256}", methods=["GET", "HEAD"])
+async def download_blob(request: Request, sha256: str, filename: Optional[str] = None):
+    """
+    blob 저장소의 파일 다운로드 (Range, If-None-Match 지원).
+    내용 해시가 곧 ETag이므로 같은 URL의 내용은 바뀌지 않습니다.
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}", sha256):
+        raise HTTPException(status_code=400, detail="잘못된 파일 해시입니다.")
+
+    blob_store = get_blob_store()
+    if not await run_in_threadpool(blob_store.exists, sha256):
+        return JSONResponse(content={"error": "File not found"}, status_code=404)
+
+    path = await run_in_threadpool(blob_store.local_path, sha256)
+    return file_download_response(
+        request, path, etag=sha256,
+        media_type=guess_media_type(filename),
+        filename=filename,
+        cache_control="private, max-age=31536000, immutable"
+    )
+
+@router.post("/process-document/", status_code=202)
 async def process_document(
-    filename: str = Form(...),
-    source_type: str = Form(...)  # "운용지시서" or "계약서"
+    document_id: int = Form(...),
+    source_type: str = Form(...),  # "운용지시서" or "계약서"
+    callback_url: Optional[str] = Form(None),
+    current_user: dict = Depends(get_current_user)
 ):
-    """백엔드에서 업로드된 파일을 AI 서버로 전송하여 처리 요청"""
+    """
+    /files/upload로 업로드된 문서의 AI 서버 처리를 작업으로 등록합니다.
+    처리가 끝날 때까지 기다리지 않고 작업 ID를 바로 반환하며, 결과는
+    /files/jobs/{job_id} 조회 또는 callback_url 콜백으로 받습니다.
+    """
     
-    # 업로드된 파일 경로 확인
-    file_path = f"{UPLOAD_DIR}/{filename}"
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail=f"File {filename} not found in upload directory")
+    # 업로드된 문서와 파일 blob 확인
+    document = await run_in_threadpool(DocumentRepository.find_by_id, document_id)
+    if not document or not document.get("blob_sha256"):
+        raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
+    if document["user_id"] != current_user["id"]:
+        raise HTTPException(status_code=403, detail="문서를 처리할 권한이 없습니다.")
+    filename = document["file_name"]
     
     # 파일 타입 검증
     if not filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
-    
-    # AI 서버에 파일 전송
+
+    blob_store = get_blob_store()
+    if not await run_in_threadpool(blob_store.exists, document["blob_sha256"]):
+        raise HTTPException(status_code=404, detail=f"File {filename} not found in blob store")
+    file_path = await run_in_threadpool(blob_store.local_path, document["blob_sha256"])
+
+    async def run():
+        result = await get_ai_client().process_document(file_path, filename, source_type)
+        return ProcessResult(**result).dict()
+
     try:
-        async with httpx.AsyncClient() as client:
-            with open(file_path, "rb") as f:
-                files = {"file": (filename, f, "application/pdf")}
-                data = {"source_type": source_type}
-                
-                # 5분 타임아웃 설정 (대용량 문서 처리 시간 고려)
-                response = await client.post(
-                    f"{AI_SERVER_URL}/process/", 
-                    files=files, 
-                    data=data,
-                    timeout=900.0
-                )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return ProcessResult(**result)
-            else:
-                raise HTTPException(
-                    status_code=response.status_code, 
-                    detail=f"AI server error: {response.text}"
-                )
-    
-    except httpx.TimeoutException:
-        raise HTTPException(status_code=504, detail="Processing timeout. The document may be too large or complex.")
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=502, detail=f"Error connecting to AI server: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Processing request failed: {str(e)}")
+        job = await AiJobService.submit(
+            job_type="process_document",
+            run=run,
+            requested_by=current_user["id"],
+            request={"document_id": document_id, "filename": filename, "source_type": source_type},
+            callback_url=callback_url
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "job_id": job.id,
+        "job_status": job.job_status,
+        "status_url": f"/files/jobs/{job.id}"
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    """AI 처리 작업의 상태와 결과 조회"""
+    job = await run_in_threadpool(AiJobService.get_job, current_user["id"], job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="존재하지 않는 작업입니다.")
+    return job
 
 @router.get("/results/{filename}")
 async def get_result_from_ai_server(filename: str):
-    """AI 서버에서 처리 결과 파일 가져오기"""
+    """
+    AI 서버에서 처리 결과 파일 가져오기.
+    결과는 청크 단위로 blob 저장소에 바로 기록되며, 연결이 끊기면 이어서 받습니다.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{AI_SERVER_URL}/results/{filename}",
-                timeout=60.0
-            )
-            
-            if response.status_code == 200:
-                # 결과 파일을 백엔드 서버에 저장
-                result_path = f"{UPLOAD_DIR}/results"
-                os.makedirs(result_path, exist_ok=True)
-                local_file_path = f"{result_path}/{filename}"
-                
-                with open(local_file_path, "wb") as f:
-                    f.write(response.content)
-                
-                return JSONResponse(
-                    content={
-                        "message": "Result file retrieved successfully",
-                        "filename": filename,
-                        "url": f"/files/results/{filename}"
-                    }
-                )
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Error retrieving result from AI server: {response.text}"
-                )
+        blob = await get_ai_client().download_result(filename)
+    except AiServerError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=f"Error retrieving result from AI server: {e.detail}"
+        )
+    except AiDownloadIntegrityError as e:
+        raise HTTPException(status_code=502, detail=f"Result file integrity check failed: {str(e)}")
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=502, detail=f"Result file is too large: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve result: {str(e)}")
 
+    try:
+        previous_sha256 = await run_in_threadpool(
+            AiJobRepository.save_result_file, filename, blob.sha256, blob.size
+        )
+    except Exception as e:
+        get_blob_store().release(blob.sha256)
+        raise HTTPException(status_code=500, detail=f"Failed to record result: {str(e)}")
+
+    if previous_sha256:
+        await run_in_threadpool(get_blob_store().release, previous_sha256)
+
+    return JSONResponse(
+        content={
+            "message": "Result file retrieved successfully",
+            "filename": filename,
+            "sha256": blob.sha256,
+            "size": blob.size,
+            "url": f"/files/blobs/{blob.sha256}?filename={quote(filename)}"
+        }
+    )
+
 @router.get("/search/{filename}")
 async def search_file(filename: str):
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    
-    if not os.path.exists(file_path):
+    document = await run_in_threadpool(DocumentRepository.find_latest_by_file_name, filename)
+    if not document:
         return JSONResponse(content={"error": "File not found"}, status_code=404)
     
-    return JSONResponse(content={"file_url": f"http://192.168.0.196/uploads/{filename}"})
+    return JSONResponse(content={
+        "document_id": document["id"],
+        "file_url": f"/files/blobs/{document['blob_sha256']}?filename={quote(filename)}"
+    })
 
-@router.get("/download/{filename}")
-async def download_file(filename: str):
-    file_path = os.path.join(UPLOAD_DIR, filename)
+@router.api_route("/download/{filename}", methods=["GET", "HEAD"])
+async def download_file(request: Request, filename: str):
+    """같은 이름의 문서가 여러 개면 가장 최근에 업로드된 문서의 파일을 내려줍니다."""
+    document = await run_in_threadpool(DocumentRepository.find_latest_by_file_name, filename)
+    if not document:
+        return JSONResponse(content={"error": "File not found"}, status_code=404)
 
-    if not os.path.exists(file_path):
+    blob_store = get_blob_store()
+    if not await run_in_threadpool(blob_store.exists, document["blob_sha256"]):
         return JSONResponse(content={"error": "File not found"}, status_code=404)
 
-    return FileResponse(path=file_path, filename=filename, media_type="application/octet-stream")
+    file_path = await run_in_threadpool(blob_store.local_path, document["blob_sha256"])
+    return file_download_response(
+        request, file_path, etag=document["blob_sha256"],
+        media_type=guess_media_type(filename),
+        filename=filename
+    )
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends, Path, Query
+from fastapi.concurrency import run_in_threadpool
 from services.keypoint_result_service import KeypointResultService
 from auth.jwt_utils import get_current_user
-from typing import List, Dict, Any
-from models import AIKeypointResultCreate, KeypointResultCreate
+from typing import List, Dict, Any, Optional
+from models import AIKeypointResultCreate, AIKeypointResultBulkCreate, KeypointResultCreate
 
 router = APIRouter()
 
@@ -48,6 +49,52 @@ async def add_keypoint_result_by_ai(
     except Exception as e:
         raise HTTPException(status_code=500, detail="서버 오류가 발생했습니다.")
 
+@router.post("/add-by-ai/bulk", response_model=Dict[str, Any])
+async def add_keypoint_results_by_ai_bulk(
+    request: AIKeypointResultBulkCreate
+):
+    """AI가 계약서의 키포인트 결과 전체를 한 번에 추가합니다 (top_k / min_match_rate로 저장 대상 제한 가능)."""
+    try:
+        counts = KeypointResultService.add_by_ai_bulk(
+            contract_id=request.contract_id,
+            matches=request.matches,
+            top_k=request.top_k,
+            min_match_rate=request.min_match_rate,
+            replace=request.replace
+        )
+        return {"message": "AI 키포인트 결과가 성공적으로 저장되었습니다.", "contract_id": request.contract_id, **counts}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="서버 오류가 발생했습니다.")
+
+@router.post("/match-local/{contract_id}", response_model=Dict[str, Any])
+async def match_keypoint_results_locally(
+    contract_id: int = Path(..., description="매칭할 계약서 ID"),
+    top_k: Optional[int] = Query(None, ge=1, description="매치 레이트 상위 K개만 저장"),
+    min_match_rate: Optional[float] = Query(None, ge=0.0, le=100.0, description="이 값 이상만 저장"),
+    replace: bool = Query(False, description="이번에 저장하지 않은 기존 AI 결과 삭제 여부"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """계약서 OCR 텍스트와 약관제한목록을 서버 내에서 비교하여 키포인트 결과를 저장합니다."""
+    try:
+        # DB 조회와 행렬 계산은 블로킹 작업이므로 스레드풀에서 실행
+        counts = await run_in_threadpool(
+            KeypointResultService.match_local,
+            user_id=current_user["id"],
+            contract_id=contract_id,
+            top_k=top_k,
+            min_match_rate=min_match_rate,
+            replace=replace
+        )
+        return {"message": "키포인트 결과가 성공적으로 저장되었습니다.", "contract_id": contract_id, **counts}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="서버 오류가 발생했습니다.")
+
 @router.get("/get-by-contract/{contract_id}", response_model=Dict[str, Any])
 async def get_keypoint_results_by_contract(
     contract_id: int = Path(..., description="결과를 조회할 계약서 ID"),
@@ -1,13 +1,41 @@
 # routes/ocr_routes.py (신규 파일)
 import os
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Dict, Any
+import json
+import asyncio
+import mimetypes
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from typing import Dict, Any, Optional
 from services.contract_service import ContractService
+from services.ocr_service import get_ocr_service
+from services.ocr_events import get_ocr_event_broker, TERMINAL_EVENTS
 from models import OcrResultResponse
 from repositories.ocr_repository import OcrRepository
+from services.file_download import etag_matches
 
 router = APIRouter(prefix="/ocr", tags=["OCR"])
 
+# 이벤트가 없을 때 연결 유지 및 DB 상태 재확인 주기 (초)
+SSE_HEARTBEAT_SECONDS = 15
+
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _snapshot_event(ocr_file: Dict[str, Any]) -> Dict[str, Any]:
+    """DB에 저장된 OCR 파일 상태를 이벤트 형식으로 변환합니다."""
+    ocr_status = ocr_file["ocr_file_status"].lower()
+    return {
+        "event": ocr_status if ocr_status in TERMINAL_EVENTS else "status",
+        "data": {
+            "ocr_file_id": ocr_file["id"],
+            "ocr_status": ocr_status,
+            "total_pages": ocr_file.get("total_page", 0)
+        }
+    }
+
 @router.get("/status/{ocr_file_id}", response_model=Dict[str, Any])
 async def get_ocr_status(ocr_file_id: int):
     """
@@ -23,6 +51,55 @@ async def get_ocr_status(ocr_file_id: int):
         "file_info": ocr_file
     }
 
+@router.get("/events/{ocr_file_id}")
+async def stream_ocr_events(ocr_file_id: int, request: Request):
+    """
+    OCR 처리 진행 상황을 Server-Sent Events로 전달합니다.
+    페이지 처리 완료(page), 처리 완료(complete), 오류(error) 이벤트를 전송하며
+    완료 또는 오류 이벤트 이후 스트림을 종료합니다.
+    """
+    broker = get_ocr_event_broker()
+    # 구독을 먼저 등록한 뒤 현재 상태를 조회해야 그 사이 발행된 이벤트를 놓치지 않음
+    queue, last_event = broker.subscribe(ocr_file_id)
+    
+    ocr_file = OcrRepository.get_ocr_file_by_id(ocr_file_id)
+    if not ocr_file:
+        broker.unsubscribe(ocr_file_id, queue)
+        raise HTTPException(status_code=404, detail="존재하지 않는 OCR 파일입니다.")
+    
+    async def event_stream():
+        try:
+            initial = last_event or _snapshot_event(ocr_file)
+            yield _format_sse(initial["event"], initial["data"])
+            if initial["event"] in TERMINAL_EVENTS:
+                return
+            
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # 다른 워커 프로세스에서 처리 중인 파일은 이 프로세스에 이벤트가 오지 않으므로
+                    # 하트비트 주기마다 한 번 DB 상태를 확인
+                    current = await run_in_threadpool(OcrRepository.get_ocr_file_by_id, ocr_file_id)
+                    if current and current["ocr_file_status"].lower() in TERMINAL_EVENTS:
+                        snapshot = _snapshot_event(current)
+                        yield _format_sse(snapshot["event"], snapshot["data"])
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                yield _format_sse(message["event"], message["data"])
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            broker.unsubscribe(ocr_file_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/result/{contract_id}", response_model=OcrResultResponse)
 async def get_ocr_result(contract_id: int):
     """
@@ -33,4 +110,34 @@ async def get_ocr_result(contract_id: int):
     if not result.success and result.ocr_status == "not_found":
         raise HTTPException(status_code=404, detail=result.message)
     
-    return result
\ No newline at end of file
+    return result
+
+@router.get("/page-image/{ocr_page_id}")
+async def get_ocr_page_image(
+    ocr_page_id: int,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    OCR 처리된 페이지 이미지를 조회합니다.
+    이미지는 로컬 캐시에서 제공되며 ETag/Cache-Control 헤더를 포함합니다.
+    """
+    page = OcrRepository.get_ocr_page_by_id(ocr_page_id)
+    if not page or not page.get("page_file_data"):
+        raise HTTPException(status_code=404, detail="존재하지 않는 OCR 페이지입니다.")
+    
+    page_file_data = page["page_file_data"]
+    ocr_service = get_ocr_service()
+    headers = {"Cache-Control": "private, max-age=86400"}
+    
+    # 캐시된 이미지와 ETag가 같으면 본문 없이 304 반환
+    cached_etag = ocr_service.get_page_image_etag(page_file_data)
+    if cached_etag and etag_matches(if_none_match, f'"{cached_etag}"'):
+        return Response(status_code=304, headers={**headers, "ETag": f'"{cached_etag}"'})
+    
+    try:
+        image, etag = await run_in_threadpool(ocr_service.get_page_image, page_file_data)
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    media_type = mimetypes.guess_type(page_file_data)[0] or "image/png"
+    return Response(content=image, media_type=media_type, headers={**headers, "ETag": f'"{etag}"'})
\ No newline at end of file
@@ -1,150 +1,72 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status, Query
 from fastapi.responses import JSONResponse
 from services.pef_service import PEFService
 from services.user_service import UserService
 from auth.jwt_utils import get_current_user
+from services.blob_store import get_blob_store
+from services.file_writer import FileTooLargeError
+from services.ai_worker import AnalysisQueueFullError
+from fastapi.concurrency import run_in_threadpool
 import os
-import shutil
 from typing import List, Dict, Any, Optional
-from models import InstructionPEF, TransactionHistory
+from models import InstructionPEF, InstructionPEFDetail, TransactionHistory, AiJobStatus
 import uuid
-from datetime import datetime
+from datetime import datetime, date
 
 # from utils.ai_client import send_to_ai_server  # AI 서버 통신 유틸리티 가정
 
 router = APIRouter()
-UPLOAD_DIR = "./pefs/original"
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-@router.post("/pef-start", status_code=status.HTTP_201_CREATED)
+@router.post("/pef-start", status_code=status.HTTP_202_ACCEPTED)
 async def upload_process_pef(
     file: UploadFile = File(...),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    운용지시서-PEF 파일 업로드 및 
-    AI 서버로 파일 전송해서 결과값 두가지 받음.
-    1. InstructionPEF - is_fund_item('T' or 'F'), company_detail(text), other_specs_text(text) 
-    2. Optional[List[TransactionHistory]]
-    받아온 값들로 한번에 instruction_pef, transaction_history에 데이터 저장하는 로직.
+    운용지시서-PEF 파일 업로드 후 AI 분석 요청.
+    파일을 저장하고 분석 대기(PENDING) 상태의 instruction_pef를 만든 뒤 바로 응답하며,
+    AI 서버 분석과 instruction_pef / transaction_history 저장은 백그라운드 작업자에서 진행됩니다.
+    진행 상태는 /pefs/{pef_id}/status 로 확인합니다.
     """
     user_id = current_user["id"]
     
-    # 파일 저장을 위한 고유 파일명 생성
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    
-    # 파일 저장
+    # 파일 저장 (내용 해시 기준 blob 저장소, 같은 내용은 한 번만 저장됨)
+    blob_store = get_blob_store()
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        blob = await run_in_threadpool(blob_store.put_stream, file.file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"파일 저장 중 오류가 발생했습니다: {str(e)}"
         )
     
-    # AI 서버로 파일 전송하여 분석 결과 받기
     try:
-        
-        # ai_result = await send_to_ai_server(file_path)
-
-        ai_result = {
-            "pef_data": {
-                "is_fund_item": "F",
-                "company_detail": "",
-                "other_specs_text": "CMA매도 및 원천징수 이자 발급"
-            },
-            "transaction_data": [
-                {
-                    "deal_type": "입금",
-                    "deal_object": "CMA 매도",
-                    "bank_name": "유리은행",
-                    "account_number": "110-143-14678941777",
-                    "holder_name": "앨리초이",
-                    "amount": "279,620,789",
-                    "process_date": "2025.12.31"
-                },
-                {
-                    "deal_type": "입금",
-                    "deal_object": "CMA 이자",
-                    "bank_name": "유리은행",
-                    "account_number": "110-143-14678941777",
-                    "holder_name": "앨리초이",
-                    "amount": "379,211",
-                    "process_date": "2025.12.31"
-                }
-            ]
-        }
-        
-        # AI 결과에서 InstructionPEF 및 TransactionHistory 정보 추출
-        pef_data = ai_result.get("pef_data", {})
-        transaction_data_list = ai_result.get("transaction_data", [])
-        print(transaction_data_list)
-        # InstructionPEF 객체 생성 - 명시적으로 모든 필드 설정
-        pef = InstructionPEF(
-            performer_id=user_id,
-            file_name=file.filename,
-            created_at=datetime.now(),  # 현재 시간으로 명시적 설정
-            is_fund_item=pef_data.get("is_fund_item", "F"),
-            company_detail=pef_data.get("company_detail", ""),
-            other_specs_text=pef_data.get("other_specs_text", "")
-        )
-        
-        # TransactionHistory 목록 생성
-        transactions = []
-        if transaction_data_list:
-            for tx_data in transaction_data_list:
-                # 문자열 날짜를 datetime.date 객체로 변환
-                process_date_str = tx_data.get("process_date", "")
-                try:
-                    if process_date_str:
-                        process_date = datetime.strptime(process_date_str, "%Y.%m.%d").date()
-                    else:
-                        process_date = datetime.now().date()
-                except ValueError:
-                    process_date = datetime.now().date()
-                
-                transaction = TransactionHistory(
-                    deal_type=tx_data.get("deal_type", ""),
-                    deal_object=tx_data.get("deal_object", ""),
-                    bank_name=tx_data.get("bank_name", ""),
-                    account_number=tx_data.get("account_number", ""),
-                    holder_name=tx_data.get("holder_name", ""),
-                    amount=tx_data.get("amount", 0),
-                    process_date=process_date
-                )
-                transactions.append(transaction)
-        
-        # PEF 지시서 및 거래 내역 생성
-        instruction_pef_id = PEFService.create_pef_with_transactions(
-            user_id=user_id,
-            pef=pef,
-            transactions=transactions if transactions else None
+        instruction_pef_id = await PEFService.start_pef_analysis(user_id, file.filename, blob.sha256)
+    except AnalysisQueueFullError as e:
+        await run_in_threadpool(blob_store.release, blob.sha256)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
         )
-        
-        return {
-            "status": "success",
-            "message": "PEF 지시서가 성공적으로 처리되었습니다.",
-            "instruction_pef_id": instruction_pef_id
-        }
-        
     except Exception as e:
-        # 에러 발생 시 저장한 파일 삭제
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            
-        # 예외 추적 정보를 로그에 기록하고 사용자에게는 간략한 메시지만 제공
-        import traceback
-        print(f"Error details: {traceback.format_exc()}")
-        
+        # 에러 발생 시 저장한 파일 참조 해제
+        await run_in_threadpool(blob_store.release, blob.sha256)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"AI 서버 처리 중 오류가 발생했습니다: {str(e)}"
+            detail=f"PEF 지시서 분석 요청 중 오류가 발생했습니다: {str(e)}"
         )
 
+    return {
+        "status": "accepted",
+        "message": "PEF 지시서가 등록되었습니다. AI 분석 결과는 상태 조회로 확인하세요.",
+        "instruction_pef_id": instruction_pef_id,
+        "analysis_status": AiJobStatus.PENDING.value,
+        "status_url": f"/pefs/{instruction_pef_id}/status"
+    }
+
 @router.get("/all")
 async def get_all_pefs(
     current_user: Dict[str, Any] = Depends(get_current_user)
@@ -176,6 +98,36 @@ async def get_all_pefs(
     
     return result  # 정렬된 리스트 반환
 
+@router.get("/transactions/summary")
+async def get_transaction_summary(
+    group_by: List[str] = Query([], description="그룹 기준 (deal_type, bank_name, holder_name, process_date), 여러 번 지정 가능"),
+    pef_id: Optional[int] = Query(None, description="특정 PEF 지시서로 한정"),
+    deal_type: Optional[str] = Query(None),
+    bank_name: Optional[str] = Query(None),
+    holder_name: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None, description="처리일 시작 (포함)"),
+    date_to: Optional[date] = Query(None, description="처리일 끝 (포함)"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    거래 내역 금액 합계/건수 집계 (DB에서 계산)
+    unparsed_count는 금액을 숫자로 변환하지 못해 합계에서 빠진 건수입니다.
+    """
+    user_id = current_user["id"]
+    try:
+        return PEFService.summarize_transactions(
+            user_id=user_id,
+            group_by=group_by,
+            instruction_pef_id=pef_id,
+            deal_type=deal_type,
+            bank_name=bank_name,
+            holder_name=holder_name,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 @router.get("/{pef_id}", response_model=Optional[InstructionPEF])
 async def get_pef_by_id(
     pef_id: int,
@@ -195,6 +147,44 @@ async def get_pef_by_id(
     
     return pef_instruction
 
+@router.get("/{pef_id}/detail", response_model=InstructionPEFDetail)
+async def get_pef_detail(
+    pef_id: int,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    특정 PEF 지시서와 거래 내역을 함께 조회
+    """
+    user_id = current_user["id"]
+    pef_detail = PEFService.get_pef_instruction_detail(user_id, pef_id)
+
+    if not pef_detail:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID가 {pef_id}인 PEF 지시서를 찾을 수 없습니다."
+        )
+
+    return pef_detail
+
+@router.get("/{pef_id}/status")
+async def get_pef_analysis_status(
+    pef_id: int,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    PEF 지시서의 AI 분석 상태 조회 (PENDING, RUNNING, COMPLETE, ERROR)
+    """
+    user_id = current_user["id"]
+    analysis = PEFService.get_pef_analysis_status(user_id, pef_id)
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID가 {pef_id}인 PEF 지시서를 찾을 수 없습니다."
+        )
+
+    return analysis
+
 @router.get("/{pef_id}/transactions", response_model=List[TransactionHistory])
 async def get_transactions_by_pef_id(
     pef_id: int,
@@ -234,6 +224,39 @@ async def add_transaction(
         "message": "거래 내역이 성공적으로 추가되었습니다."
     }
 
+@router.post("/{pef_id}/transactions/bulk", status_code=status.HTTP_201_CREATED)
+async def add_transactions_bulk(
+    pef_id: int,
+    transactions: List[TransactionHistory],
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    기존 PEF 지시서에 여러 거래 내역을 한 번에 추가 (하나의 트랜잭션으로 저장)
+    """
+    user_id = current_user["id"]
+
+    if not transactions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="추가할 거래 내역이 없습니다."
+        )
+
+    try:
+        inserted = PEFService.add_transactions_to_pef(user_id, pef_id, transactions)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"거래 내역 일괄 추가 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    return {
+        "status": "success",
+        "message": f"거래 내역 {inserted}건이 성공적으로 추가되었습니다.",
+        "inserted_count": inserted
+    }
+
 @router.put("/transactions/{transaction_id}", status_code=status.HTTP_200_OK)
 async def update_transaction(
     transaction_id: int,
@@ -1,90 +1,94 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status, Query, Path, Request, Header
 from fastapi.responses import JSONResponse
 from services.special_service import SpecialService
 from services.user_service import UserService
 from auth.jwt_utils import get_current_user
+from services.blob_store import get_blob_store
+from services.file_writer import FileTooLargeError
+from services.ai_worker import AnalysisQueueFullError
+from services.json_patch import JsonPatchError, JsonPatchTestFailed
+from repositories.special_repository import ResultVersionConflictError
+import json
+from fastapi.concurrency import run_in_threadpool
 import os
-import shutil
 from typing import List, Dict, Any, Optional
-from models import InstructionSpecial, InstructionSpecialResult, Attachment
+from models import InstructionSpecial, InstructionSpecialResult, Attachment, AiJobStatus
 import uuid
 from datetime import datetime
 # from utils.ai_client import send_to_ai_server  # AI 서버 통신 유틸리티 가정
 
 router = APIRouter()
-UPLOAD_DIR = "./special/original"
-ATTACHMENT_DIR = "./special/attachments"
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(ATTACHMENT_DIR, exist_ok=True)
-
-@router.post("/special-start", status_code=status.HTTP_201_CREATED)
+@router.post("/special-start", status_code=status.HTTP_202_ACCEPTED)
 async def upload_process_special_instruction(
     file: UploadFile = File(...),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
+    """
+    특별자산 운용지시서 업로드 후 AI 분석 요청.
+    파일 저장 후 바로 응답하며, AI 분석 결과는 백그라운드에서 instruction_special_result에 저장됩니다.
+    AI 분석 대기열이 가득 찬 경우 503을 반환합니다.
+    """
     user_id = current_user["id"]
 
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-
-    # 파일 저장
+    # 파일 저장 (내용 해시 기준 blob 저장소, 같은 내용은 한 번만 저장됨)
+    blob_store = get_blob_store()
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        blob = await run_in_threadpool(blob_store.put_stream, file.file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"파일 저장 중 오류가 발생했습니다: {str(e)}"
         )
     
-    # AI 서버로 파일 전송하여 분석 결과 받기
     try:
-        # ai_result = await send_to_ai_server(file_path)
-
-        # 일단, 예시로 더미데이터 생성
-        ai_result = {
-            "content": "분석된 내용 예시",
-            "quality": "Unknown dpi",
-            "average_quality": "Unknown dpi",
-            "saved_json": "{}"
-        }
-        
-        # 특별 지시서 객체 생성
-        special = InstructionSpecial(
-            performer_id=user_id,
-            file_name=file.filename
+        instruction_special_id = await SpecialService.start_special_analysis(
+            user_id, file.filename, blob.sha256
         )
-        
-        # 결과 객체 생성
-        result = InstructionSpecialResult(
-            result_content=ai_result.get("content", ""),
-            all_qualities=ai_result.get("quality", "Unknown dpi"),
-            average_quality=ai_result.get("average_quality", "Unknown dpi"),
-            saved_json=ai_result.get("saved_json", "{}")
-        )
-        
-        # 지시서와 결과 저장
-        instruction_special_id = SpecialService.create_special_instruction_with_result(
-            user_id=user_id,
-            special=special,
-            result=result
+    except AnalysisQueueFullError as e:
+        await run_in_threadpool(blob_store.release, blob.sha256)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
         )
-        
-        return {
-            "message": "특별 지시서가 성공적으로 업로드되었습니다.",
-            "instruction_special_id": instruction_special_id
-        }
-        
     except Exception as e:
-        # 파일 저장에 성공했지만 처리 중 오류가 발생한 경우, 저장된 파일 삭제
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # 파일 저장에 성공했지만 처리 중 오류가 발생한 경우, 저장된 파일 참조 해제
+        await run_in_threadpool(blob_store.release, blob.sha256)
             
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"파일 처리 중 오류가 발생했습니다: {str(e)}"
         )
 
+    return {
+        "message": "특별 지시서가 업로드되었습니다. AI 분석 결과는 상태 조회로 확인하세요.",
+        "instruction_special_id": instruction_special_id,
+        "analysis_status": AiJobStatus.PENDING.value,
+        "status_url": f"/special/{instruction_special_id}/status"
+    }
+
+@router.get("/{instruction_special_id}/status", status_code=status.HTTP_200_OK)
+async def get_special_analysis_status(
+    instruction_special_id: int = Path(..., description="특별 지시서 ID"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    특별 지시서의 AI 분석 상태 조회 (PENDING, RUNNING, COMPLETE, ERROR)
+    """
+    user_id = current_user["id"]
+    analysis = SpecialService.get_special_analysis_status(user_id, instruction_special_id)
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID가 {instruction_special_id}인 특별 지시서를 찾을 수 없습니다."
+        )
+
+    return analysis
+
 @router.post("/{instruction_special_id}/attachment", status_code=status.HTTP_201_CREATED)
 async def upload_attachment(
     instruction_special_id: int = Path(..., description="특별 지시서 ID"),
@@ -93,14 +97,12 @@ async def upload_attachment(
 ):
     user_id = current_user["id"]
     
-    # 고유한 파일명 생성
-    # unique_filename = f"{uuid.uuid4()}_{file.filename}"
-    file_path = os.path.join(ATTACHMENT_DIR, file.filename)
-    
-    # 파일 저장
+    # 파일 저장 (내용 해시 기준 blob 저장소, 같은 이름의 파일도 서로 덮어쓰지 않음)
+    blob_store = get_blob_store()
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        blob = await run_in_threadpool(blob_store.put_stream, file.file)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -111,7 +113,8 @@ async def upload_attachment(
         # 첨부 파일 객체 생성
         attachment = Attachment(
             instruction_special_id=instruction_special_id,
-            file_name=unique_filename
+            file_name=file.filename,
+            blob_sha256=blob.sha256
         )
         
         # DB에 첨부 파일 정보 저장
@@ -124,18 +127,47 @@ async def upload_attachment(
         return {
             "message": "첨부 파일이 성공적으로 업로드되었습니다.",
             "attachment_id": attachment_id,
-            "file_name": unique_filename
+            "file_name": file.filename,
+            "sha256": blob.sha256
         }
     except Exception as e:
-        # 파일 저장에 성공했지만 DB 저장 중 오류가 발생한 경우, 저장된 파일 삭제
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # 파일 저장에 성공했지만 DB 저장 중 오류가 발생한 경우, 저장된 파일 참조 해제
+        blob_store.release(blob.sha256)
             
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"첨부 파일 처리 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.post("/{instruction_special_id}/attachments", status_code=status.HTTP_201_CREATED)
+async def upload_attachments(
+    instruction_special_id: int = Path(..., description="특별 지시서 ID"),
+    files: List[UploadFile] = File(...),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    여러 첨부 파일을 한 번에 업로드.
+    파일별 저장 결과를 반환하며, 일부 파일이 거절되어도 나머지는 저장됩니다.
+    """
+    user_id = current_user["id"]
+
+    try:
+        entries = [(os.path.basename(upload.filename), upload.file) for upload in files]
+        # 파일 저장과 DB 작업은 블로킹 작업이므로 스레드풀에서 실행
+        return await run_in_threadpool(
+            SpecialService.upload_attachments, user_id, instruction_special_id, entries
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"첨부 파일 처리 중 오류가 발생했습니다: {str(e)}"
+        )
+    finally:
+        for upload in files:
+            await upload.close()
+
 @router.post("/{instruction_special_id}/result", status_code=status.HTTP_201_CREATED)
 async def create_another_result(
     instruction_special_id: int = Path(..., description="특별 지시서 ID"),
@@ -213,34 +245,41 @@ async def get_all_special_instructions(
 @router.get("/{instruction_special_id}", status_code=status.HTTP_200_OK)
 async def get_special_instruction_details(
     instruction_special_id: int = Path(..., description="특별 지시서 ID"),
+    include_content: bool = Query(True, description="결과의 result_content 포함 여부"),
+    include_json: bool = Query(True, description="결과의 saved_json 포함 여부"),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     user_id = current_user["id"]
     
     try:
-        # 결과 목록 조회
-        results = SpecialService.get_all_results_by_special_instruction_id(
-            user_id=user_id,
-            instruction_special_id=instruction_special_id
-        )
-        
-        # 첨부 파일 목록 조회
-        attachments = SpecialService.get_attachments_by_instruction_id(
+        # 지시서, 결과 목록, 첨부 파일 목록을 한 번에 조회
+        detail = SpecialService.get_special_instruction_detail(
             user_id=user_id,
-            instruction_special_id=instruction_special_id
+            instruction_special_id=instruction_special_id,
+            include_content=include_content,
+            include_json=include_json
         )
-        
-        return {
-            "instruction_special_id": instruction_special_id,
-            "results": results,
-            "attachments": attachments
-        }
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"지시서 상세 조회 중 오류가 발생했습니다: {str(e)}"
         )
 
+    if not detail:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID가 {instruction_special_id}인 특별 지시서를 찾을 수 없습니다."
+        )
+
+    results = detail.pop("results")
+    attachments = detail.pop("attachments")
+    return {
+        "instruction_special_id": instruction_special_id,
+        "instruction": detail,
+        "results": results,
+        "attachments": attachments
+    }
+
 @router.get("/result/{result_id}", status_code=status.HTTP_200_OK)
 async def get_result_details(
     result_id: int = Path(..., description="결과 ID"),
@@ -269,6 +308,42 @@ async def get_result_details(
             detail=f"결과 조회 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.get("/result/{result_id}/payload", status_code=status.HTTP_200_OK)
+async def get_result_payload(
+    result_id: int = Path(..., description="결과 ID"),
+    field: str = Query("saved_json", description="조회할 값 (result_content 또는 saved_json)"),
+    keys: List[str] = Query([], description="saved_json에서 꺼낼 키 경로 (예: items.0.name), 여러 번 지정 가능"),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    결과의 큰 값(result_content, saved_json)만 따로 조회.
+    keys를 지정하면 saved_json 전체 대신 요청한 경로의 값만 반환합니다.
+    """
+    user_id = current_user["id"]
+
+    try:
+        payload = SpecialService.get_result_payload(
+            user_id=user_id,
+            result_id=result_id,
+            field=field,
+            keys=keys
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"결과 조회 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 결과를 찾을 수 없습니다."
+        )
+
+    return payload
+
 @router.put("/{instruction_special_id}/result/{result_id}/content", status_code=status.HTTP_200_OK)
 async def update_result_content(
     instruction_special_id: int = Path(..., description="특별 지시서 ID"),
@@ -372,6 +447,80 @@ async def update_result_json(
             detail=f"결과 업데이트 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.patch("/{instruction_special_id}/result/{result_id}/json", status_code=status.HTTP_200_OK)
+async def patch_result_json(
+    request: Request,
+    instruction_special_id: int = Path(..., description="특별 지시서 ID"),
+    result_id: int = Path(..., description="결과 ID"),
+    version: Optional[int] = Query(None, description="수정 전 결과 버전 (If-Match 헤더로도 지정 가능)"),
+    if_match: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    saved_json 변경분만 적용.
+    - Content-Type: application/json-patch+json → RFC 6902 연산 배열
+    - Content-Type: application/merge-patch+json → RFC 7396 merge patch
+    버전(If-Match: "<version>" 또는 ?version=)을 지정하면 그 사이 다른 수정이 있을 때 409를 반환합니다.
+    """
+    user_id = current_user["id"]
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        patch = json.loads(await request.body())
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="요청 본문이 올바른 JSON이 아닙니다.")
+    if content_type == "application/merge-patch+json":
+        merge = True
+    elif content_type == "application/json-patch+json":
+        merge = False
+    else:
+        # Content-Type이 일반 JSON이면 본문 형태로 판단 (배열: JSON Patch, 객체: merge patch)
+        merge = not isinstance(patch, list)
+
+    expected_version = version
+    if if_match and if_match.strip() != "*":
+        try:
+            expected_version = int(if_match.strip().removeprefix("W/").strip('"'))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="If-Match 헤더는 결과 버전이어야 합니다.")
+
+    try:
+        new_version = await run_in_threadpool(
+            SpecialService.patch_result_json,
+            user_id=user_id,
+            instruction_special_id=instruction_special_id,
+            result_id=result_id,
+            patch=patch,
+            merge=merge,
+            expected_version=expected_version
+        )
+    except ResultVersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED if if_match else status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"ETag": f'"{e.current_version}"'}
+        )
+    except JsonPatchTestFailed as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except JsonPatchError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"결과 업데이트 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    if new_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="결과를 찾을 수 없습니다."
+        )
+
+    return JSONResponse(
+        content={"message": "결과 JSON이 성공적으로 업데이트되었습니다.", "version": new_version},
+        headers={"ETag": f'"{new_version}"'}
+    )
+
 @router.delete("/result/{result_id}", status_code=status.HTTP_200_OK)
 async def delete_result(
     result_id: int = Path(..., description="결과 ID"),
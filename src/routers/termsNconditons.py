@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, Query
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Header, Response, status
 from models import User, TermsNConditions
 from services.termsNconditions_service import TermsNConditionsService
 from auth.jwt_utils import get_current_user
-from typing import List, Dict, Any
+from services.file_download import etag_matches
+from typing import List, Dict, Any, Optional
 
 router = APIRouter()
 
@@ -28,13 +29,26 @@ async def add_termsNconditions(
 
     
 @router.get("/get-all", response_model=List[Dict[str, Any]])
-async def get_all_termsNconditions(current_user: Dict[str, Any] = Depends(get_current_user)):
-    """모든 약관제한목록 항목을 조회합니다."""
+async def get_all_termsNconditions(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    모든 약관제한목록 항목을 조회합니다.
+    응답의 ETag를 If-None-Match로 보내면 목록이 바뀌지 않은 경우 304를 반환합니다.
+    """
     try:
-        return TermsNConditionsService.get_all_querys()
+        items, etag = TermsNConditionsService.get_all_querys_with_etag()
     except Exception as e:
         raise HTTPException(status_code=500, detail="서버 오류가 발생했습니다.")
 
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return items
+
 @router.put("/edit", response_model=Dict[str, str])
 async def update_termsNconditions(
     termsNcondition: TermsNConditions,
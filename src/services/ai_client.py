@@ -0,0 +1,268 @@
+# services/ai_client.py
+import os
+import re
+import base64
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from config import (
+    AI_SERVER_URL, AI_MAX_CONNECTIONS, AI_MAX_KEEPALIVE_CONNECTIONS,
+    AI_KEEPALIVE_EXPIRY, AI_CONNECT_TIMEOUT, AI_READ_TIMEOUT, AI_DOWNLOAD_RETRIES,
+    MAX_UPLOAD_BYTES
+)
+from services.blob_store import StoredBlob, get_blob_store
+from services.file_writer import FileTooLargeError
+
+logger = logging.getLogger(__name__)
+
+
+class AiServerError(Exception):
+    """AI 서버가 오류 응답을 반환한 경우"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"AI 서버 오류 ({status_code}): {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AiDownloadIntegrityError(Exception):
+    """내려받은 파일의 크기나 해시가 서버가 알려준 값과 다른 경우"""
+
+
+class _IncompleteDownload(Exception):
+    """연결이 끊겨 응답 본문을 끝까지 받지 못한 경우 (재시도 대상)"""
+
+
+def _expected_sha256(headers: httpx.Headers) -> Optional[str]:
+    """
+    응답 헤더에서 서버가 알려준 SHA-256 값을 찾습니다.
+    X-Content-SHA256(hex), Content-Digest(RFC 9530), Digest(RFC 3230)를 지원합니다.
+    """
+    value = headers.get("x-content-sha256")
+    if value:
+        return value.strip().lower()
+
+    for header, pattern in (("content-digest", r"sha-256=:([^:]+):"), ("digest", r"sha-256=([^,\s]+)")):
+        value = headers.get(header)
+        if value:
+            match = re.search(pattern, value, re.IGNORECASE)
+            if match:
+                return base64.b64decode(match.group(1)).hex()
+    return None
+
+
+def _range_start(response: httpx.Response) -> Optional[int]:
+    """206 응답의 Content-Range에서 시작 위치를 읽습니다."""
+    match = re.match(r"bytes (\d+)-\d+/", response.headers.get("content-range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _write_chunk(f, digest, chunk: bytes):
+    f.write(chunk)
+    digest.update(chunk)
+
+
+def _total_size(response: httpx.Response) -> Optional[int]:
+    if response.status_code == 206:
+        content_range = response.headers.get("content-range", "")
+        match = re.match(r"bytes \d+-\d+/(\d+)", content_range)
+        return int(match.group(1)) if match else None
+    content_length = response.headers.get("content-length")
+    return int(content_length) if content_length else None
+
+
+class AiClient:
+    """
+    AI 서버와 통신하는 애플리케이션 수명 단위의 HTTP 클라이언트.
+
+    요청마다 AsyncClient를 새로 만들지 않고 하나의 연결 풀을 공유하여
+    keep-alive 연결을 재사용합니다. 애플리케이션 시작/종료 시 start()/close()를 호출합니다.
+    """
+
+    def __init__(self, base_url: str = AI_SERVER_URL):
+        self.base_url = base_url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=AI_MAX_CONNECTIONS,
+                max_keepalive_connections=AI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=AI_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(AI_READ_TIMEOUT, connect=AI_CONNECT_TIMEOUT)
+        )
+        logger.info(f"AI 서버 클라이언트 시작: {self.base_url}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("AI 서버 클라이언트 종료")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("AI 서버 클라이언트가 시작되지 않았습니다.")
+        return self._client
+
+    async def process_document(self, file_path: str, filename: str, source_type: str) -> Dict[str, Any]:
+        """
+        문서를 AI 서버로 전송하여 처리 결과를 받습니다.
+
+        Args:
+            file_path: 전송할 로컬 파일 경로
+            filename: AI 서버에 전달할 파일 이름
+            source_type: 문서 종류 ("운용지시서" 또는 "계약서")
+        Returns:
+            Dict: AI 서버 처리 결과
+        Raises:
+            AiServerError: AI 서버가 오류 응답을 반환한 경우
+            httpx.HTTPError: 연결/타임아웃 오류
+        """
+        with open(file_path, "rb") as f:
+            response = await self.client.post(
+                "/process/",
+                files={"file": (filename, f, "application/pdf")},
+                data={"source_type": source_type}
+            )
+
+        if response.status_code != 200:
+            raise AiServerError(response.status_code, response.text)
+        return response.json()
+
+    async def download_result(self, filename: str) -> StoredBlob:
+        """
+        AI 서버의 결과 파일을 청크 단위로 내려받아 blob 저장소에 저장합니다.
+
+        응답 전체를 메모리에 올리지 않고 스테이징 파일에 바로 기록하며, 기록하면서
+        SHA-256을 계산합니다. 연결이 끊기면 받은 위치부터 Range 요청으로 이어받고,
+        서버가 Range를 지원하지 않거나 요청한 위치와 다른 구간을 보내면 처음부터 다시 받습니다.
+        Range 위치가 전송 바이트 기준이 되도록 압축 없는(identity) 응답만 받습니다.
+
+        Args:
+            filename: AI 서버의 결과 파일 이름
+        Returns:
+            StoredBlob: 저장된 blob 해시와 크기
+        Raises:
+            AiServerError: AI 서버가 오류 응답을 반환한 경우
+            AiDownloadIntegrityError: 크기나 해시가 일치하지 않거나 압축된 응답인 경우
+            FileTooLargeError: 결과 파일이 MAX_UPLOAD_BYTES를 넘는 경우
+            httpx.TransportError: 재시도 후에도 연결에 실패한 경우
+        """
+        blob_store = get_blob_store()
+        staging_path = blob_store.new_staging_path()
+        digest = hashlib.sha256()
+        received = 0
+        expected_size: Optional[int] = None
+        expected_sha256: Optional[str] = None
+        etag: Optional[str] = None
+        attempt = 0
+
+        try:
+            f = await run_in_threadpool(open, staging_path, "wb")
+            try:
+                while True:
+                    headers = {"Accept-Encoding": "identity"}
+                    if received:
+                        headers["Range"] = f"bytes={received}-"
+                        if etag:
+                            # 그 사이 파일이 바뀌었으면 서버가 전체(200)를 다시 보냄
+                            headers["If-Range"] = etag
+
+                    try:
+                        async with self.client.stream("GET", f"/results/{filename}", headers=headers) as response:
+                            if response.status_code not in (200, 206):
+                                detail = (await response.aread()).decode("utf-8", "replace")
+                                raise AiServerError(response.status_code, detail)
+                            if response.headers.get("content-encoding", "identity").lower() != "identity":
+                                raise AiDownloadIntegrityError(
+                                    f"압축된 응답은 받을 수 없습니다: {response.headers['content-encoding']}"
+                                )
+
+                            # 200은 처음부터, 206은 Content-Range의 시작 위치부터의 본문
+                            start = _range_start(response) if response.status_code == 206 else 0
+                            if start != received:
+                                logger.info(
+                                    f"AI 결과 이어받기 불가 (요청 {received}, 응답 {start}), 처음부터 다시 받음: {filename}"
+                                )
+                                await run_in_threadpool(f.seek, 0)
+                                await run_in_threadpool(f.truncate)
+                                digest = hashlib.sha256()
+                                received = 0
+                                if start != 0:
+                                    raise _IncompleteDownload("요청한 위치와 다른 구간 응답")
+
+                            if not received:
+                                expected_size = _total_size(response)
+                                expected_sha256 = _expected_sha256(response.headers)
+                                etag = response.headers.get("etag")
+                                if expected_size is not None and expected_size > MAX_UPLOAD_BYTES:
+                                    raise FileTooLargeError(
+                                        f"파일 크기가 허용 범위({MAX_UPLOAD_BYTES} bytes)를 초과했습니다."
+                                    )
+
+                            async for chunk in response.aiter_raw():
+                                if received + len(chunk) > MAX_UPLOAD_BYTES:
+                                    raise FileTooLargeError(
+                                        f"파일 크기가 허용 범위({MAX_UPLOAD_BYTES} bytes)를 초과했습니다."
+                                    )
+                                await run_in_threadpool(_write_chunk, f, digest, chunk)
+                                received += len(chunk)
+
+                        if expected_size is not None and received < expected_size:
+                            raise _IncompleteDownload(f"{received}/{expected_size} bytes")
+                        break
+
+                    except (httpx.TransportError, _IncompleteDownload) as e:
+                        attempt += 1
+                        if attempt > AI_DOWNLOAD_RETRIES:
+                            raise
+                        logger.warning(
+                            f"AI 결과 다운로드 중단 ({received} bytes 수신), 재시도 {attempt}/{AI_DOWNLOAD_RETRIES}: {str(e)}"
+                        )
+                        await asyncio.sleep(2 ** (attempt - 1))
+            finally:
+                await run_in_threadpool(f.close)
+
+            sha256 = digest.hexdigest()
+            if expected_size is not None and received != expected_size:
+                raise AiDownloadIntegrityError(f"파일 크기 불일치: {received} != {expected_size}")
+            if expected_sha256 and sha256 != expected_sha256:
+                raise AiDownloadIntegrityError(f"파일 해시 불일치: {sha256} != {expected_sha256}")
+
+            return await run_in_threadpool(blob_store.put_staged, staging_path, sha256, received)
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
+    async def post_callback(self, callback_url: str, payload: Dict[str, Any]):
+        """
+        작업 완료 콜백을 전송합니다. 콜백 실패는 작업 결과에 영향을 주지 않습니다.
+        """
+        try:
+            response = await self.client.post(
+                callback_url, json=payload, timeout=AI_CONNECT_TIMEOUT, follow_redirects=False
+            )
+            if response.status_code >= 400:
+                logger.warning(f"콜백 응답 오류: {callback_url}, {response.status_code}")
+        except httpx.HTTPError as e:
+            logger.warning(f"콜백 전송 실패: {callback_url}, {str(e)}")
+
+
+_ai_client = AiClient()
+
+
+def get_ai_client() -> AiClient:
+    """
+    프로세스 전역 AI 서버 클라이언트를 반환합니다.
+    """
+    return _ai_client
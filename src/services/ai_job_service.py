@@ -0,0 +1,184 @@
+# services/ai_job_service.py
+import json
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+from fastapi.concurrency import run_in_threadpool
+
+from base_service import BaseService
+from config import AI_CALLBACK_ALLOWED_HOSTS
+from models import AiJob, AiJobStatus
+from repositories.ai_job_repository import AiJobRepository
+from services.ai_client import get_ai_client
+
+logger = logging.getLogger(__name__)
+
+
+class AiJobService(BaseService):
+    """
+    AI 서버 처리 작업을 비동기 작업으로 실행합니다.
+
+    HTTP 요청은 작업을 등록하고 곧바로 작업 ID를 반환하며, 실제 처리는
+    이벤트 루프의 백그라운드 태스크에서 수행됩니다. 클라이언트는 작업 상태를
+    조회(polling)하거나, 등록 시 지정한 callback_url로 완료 알림을 받습니다.
+    """
+
+    # 실행 중인 태스크 (가비지 컬렉션 방지 및 종료 시 정리용)
+    _tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def validate_callback_url(callback_url: str):
+        """
+        콜백 주소가 허용된 호스트(AI_CALLBACK_ALLOWED_HOSTS)의 http(s) 주소인지 확인합니다.
+        서버가 임의의 내부 주소로 요청을 보내지 않도록 등록 시점과 전송 시점에 모두 확인합니다.
+
+        Raises:
+            ValueError: 허용되지 않은 콜백 주소인 경우
+        """
+        try:
+            parts = urlsplit(callback_url)
+            port = parts.port
+        except ValueError:
+            raise ValueError("콜백 주소 형식이 올바르지 않습니다.")
+        if parts.scheme not in ("http", "https") or not parts.hostname or parts.username or parts.password:
+            raise ValueError("콜백 주소는 인증 정보 없는 http(s) 주소여야 합니다.")
+        host = parts.hostname.lower()
+        if host not in AI_CALLBACK_ALLOWED_HOSTS and (port is None or f"{host}:{port}" not in AI_CALLBACK_ALLOWED_HOSTS):
+            raise ValueError("허용되지 않은 콜백 주소입니다.")
+
+    @staticmethod
+    async def submit(
+        job_type: str,
+        run: Callable[[], Awaitable[Any]],
+        requested_by: Optional[int] = None,
+        request: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None
+    ) -> AiJob:
+        """
+        작업을 등록하고 백그라운드에서 실행합니다.
+
+        Args:
+            job_type: 작업 종류 (예: process_document)
+            run: 실제 처리를 수행하는 코루틴 함수 (결과는 JSON 직렬화 가능해야 함)
+            requested_by: 요청한 사용자 ID
+            request: 기록해 둘 요청 정보
+            callback_url: 완료 시 결과를 POST로 받을 주소 (허용된 호스트만 가능)
+        Returns:
+            AiJob: 등록된 작업 (PENDING 상태)
+        Raises:
+            ValueError: 허용되지 않은 콜백 주소인 경우
+        """
+        if callback_url:
+            AiJobService.validate_callback_url(callback_url)
+
+        job_id = str(uuid.uuid4())
+        await run_in_threadpool(
+            AiJobRepository.create_job,
+            job_id, job_type, requested_by,
+            json.dumps(request, ensure_ascii=False) if request is not None else None,
+            callback_url
+        )
+
+        task = asyncio.create_task(AiJobService._run(job_id, job_type, run, callback_url))
+        AiJobService._tasks.add(task)
+        task.add_done_callback(AiJobService._tasks.discard)
+
+        logger.info(f"AI 작업 등록: {job_id} ({job_type})")
+        return AiJob(
+            id=job_id,
+            job_type=job_type,
+            job_status=AiJobStatus.PENDING,
+            requested_by=requested_by,
+            callback_url=callback_url
+        )
+
+    @staticmethod
+    async def _run(job_id: str, job_type: str, run: Callable[[], Awaitable[Any]],
+                   callback_url: Optional[str]):
+        payload: Dict[str, Any] = {"job_id": job_id, "job_type": job_type}
+        try:
+            await run_in_threadpool(AiJobRepository.update_status, job_id, AiJobStatus.RUNNING)
+            result = await run()
+            await run_in_threadpool(
+                AiJobRepository.update_status, job_id, AiJobStatus.COMPLETE,
+                json.dumps(result, ensure_ascii=False, default=str)
+            )
+            payload.update({"job_status": AiJobStatus.COMPLETE.value, "result": result})
+            logger.info(f"AI 작업 완료: {job_id}")
+        except asyncio.CancelledError:
+            await run_in_threadpool(
+                AiJobRepository.update_status, job_id, AiJobStatus.ERROR, None,
+                "서버 종료로 작업이 중단되었습니다."
+            )
+            raise
+        except Exception as e:
+            logger.error(f"AI 작업 실패: {job_id}, {str(e)}", exc_info=True)
+            await run_in_threadpool(
+                AiJobRepository.update_status, job_id, AiJobStatus.ERROR, None, str(e)[:4000]
+            )
+            payload.update({"job_status": AiJobStatus.ERROR.value, "error_message": str(e)})
+
+        if callback_url:
+            await AiJobService._send_callback(job_id, callback_url, payload)
+
+    @staticmethod
+    async def _send_callback(job_id: str, callback_url: str, payload: Dict[str, Any]):
+        try:
+            AiJobService.validate_callback_url(callback_url)
+        except ValueError as e:
+            logger.warning(f"콜백 전송 생략: {job_id}, {str(e)}")
+            return
+        await get_ai_client().post_callback(callback_url, payload)
+
+    @staticmethod
+    async def fail_interrupted_jobs() -> int:
+        """
+        애플리케이션 시작 시 이전 프로세스에서 끝나지 못한 작업을 ERROR로 기록합니다.
+        작업 상태를 조회하는 클라이언트가 끝나지 않는 작업을 계속 기다리지 않도록 하며,
+        콜백 주소가 있는 작업에는 실패 알림을 보냅니다.
+
+        Returns:
+            int: ERROR로 기록한 작업 수
+        """
+        error_message = "서버 재시작으로 작업이 중단되었습니다. 다시 요청해주세요."
+        rows = await run_in_threadpool(AiJobRepository.fail_unfinished_jobs, error_message)
+        for row in rows:
+            if row["callback_url"]:
+                await AiJobService._send_callback(row["id"], row["callback_url"], {
+                    "job_id": row["id"],
+                    "job_type": row["job_type"],
+                    "job_status": AiJobStatus.ERROR.value,
+                    "error_message": error_message
+                })
+        if rows:
+            logger.info(f"중단된 AI 작업 {len(rows)}건을 ERROR로 기록")
+        return len(rows)
+
+    @staticmethod
+    def get_job(user_id: int, job_id: str) -> Optional[AiJob]:
+        """
+        작업 상태와 결과를 조회합니다. 다른 사용자가 등록한 작업은 없는 작업과 같이 취급합니다.
+        """
+        BaseService.validate_user(user_id)
+
+        row = AiJobRepository.find_by_id(job_id)
+        if not row or row["requested_by"] != user_id:
+            return None
+
+        result_json = row.pop("result_json", None)
+        row.pop("request_json", None)
+        return AiJob(**row, result=json.loads(result_json) if result_json else None)
+
+    @staticmethod
+    async def shutdown():
+        """
+        애플리케이션 종료 시 실행 중인 작업을 취소합니다 (작업은 ERROR 상태로 기록됨).
+        """
+        tasks = list(AiJobService._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,114 @@
+# services/ai_worker.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from config import AI_ANALYSIS_CONCURRENCY, AI_ANALYSIS_MAX_PENDING
+
+logger = logging.getLogger(__name__)
+
+AnalysisTask = Callable[[], Awaitable[None]]
+
+
+class AnalysisQueueFullError(RuntimeError):
+    """대기 중인 분석 작업이 max_pending에 도달하여 새 작업을 받을 수 없는 경우"""
+
+
+class AiAnalysisWorker:
+    """
+    업로드된 운용지시서의 AI 분석을 백그라운드에서 실행하는 작업자.
+
+    고정된 수의 작업 태스크가 대기열에서 분석 작업을 꺼내 실행하므로
+    AI 서버에 동시에 보내는 요청 수가 concurrency를 넘지 않습니다.
+    대기열은 max_pending건까지만 받으며, 가득 차면 업로드를 거절하여 적체가 무한히 늘지 않도록 합니다.
+    """
+
+    def __init__(self, concurrency: int = AI_ANALYSIS_CONCURRENCY,
+                 max_pending: int = AI_ANALYSIS_MAX_PENDING):
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max(1, max_pending)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [
+            asyncio.create_task(self._run(idx)) for idx in range(self.concurrency)
+        ]
+        logger.info(f"AI 분석 작업자 시작: 동시 처리 {self.concurrency}건")
+
+    async def stop(self):
+        """
+        작업자를 멈춥니다. 실행 중이던 작업과 대기열에 남은 작업은 각각의 on_drop을 호출하여
+        다음 시작 때 다시 분석할 수 있는 상태로 돌려 놓습니다.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, on_drop = self._queue.get_nowait()
+                await self._drop(on_drop)
+        self._queue = None
+
+    def submit(self, task: AnalysisTask, on_drop: Optional[AnalysisTask] = None):
+        """
+        분석 작업을 대기열에 등록합니다. 이벤트 루프 스레드에서 호출해야 합니다.
+
+        Args:
+            task: 실행할 분석 작업
+            on_drop: 작업자 종료로 작업이 실행되지 못하거나 중간에 취소될 때 호출할 정리 작업
+        Raises:
+            AnalysisQueueFullError: 대기 중인 작업이 max_pending에 도달한 경우
+        """
+        if self._queue is None:
+            raise RuntimeError("AI 분석 작업자가 시작되지 않았습니다.")
+        try:
+            self._queue.put_nowait((task, on_drop))
+        except asyncio.QueueFull:
+            raise AnalysisQueueFullError(
+                f"AI 분석 대기 작업이 {self.max_pending}건을 넘어 잠시 후 다시 시도해야 합니다."
+            )
+
+    def is_full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    def pending_count(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _drop(self, on_drop: Optional[AnalysisTask]):
+        if on_drop is None:
+            return
+        try:
+            await on_drop()
+        except Exception:
+            logger.error("취소된 AI 분석 작업 정리 중 오류 발생", exc_info=True)
+
+    async def _run(self, idx: int):
+        while True:
+            task, on_drop = await self._queue.get()
+            try:
+                await task()
+            except asyncio.CancelledError:
+                await self._drop(on_drop)
+                raise
+            except Exception:
+                # 작업별 상태 기록은 각 작업에서 처리하며, 여기서는 작업자가 멈추지 않도록 기록만 함
+                logger.error(f"AI 분석 작업 {idx} 실행 중 오류 발생", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+
+_worker = AiAnalysisWorker()
+
+
+def get_ai_worker() -> AiAnalysisWorker:
+    """
+    프로세스 전역 AI 분석 작업자를 반환합니다.
+    """
+    return _worker
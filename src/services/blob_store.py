@@ -0,0 +1,249 @@
+# services/blob_store.py
+import os
+import uuid
+import logging
+import threading
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from config import (
+    BLOB_STORE_BACKEND, BLOB_STORE_DIR, BLOB_S3_BUCKET, BLOB_S3_ENDPOINT_URL,
+    BLOB_S3_ACCESS_KEY, BLOB_S3_SECRET_KEY, BLOB_S3_REGION, MAX_UPLOAD_BYTES
+)
+from repositories.blob_repository import BlobRepository
+from services.file_writer import write_stream_atomic, CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class StoredBlob(NamedTuple):
+    sha256: str
+    size: int
+
+
+def shard_path(sha256: str) -> str:
+    """해시 앞 4자리로 2단계 디렉토리를 나눈 상대 경로 (ab/cd/abcd...)"""
+    return os.path.join(sha256[:2], sha256[2:4], sha256)
+
+
+class LocalDiskBackend:
+    """로컬 디스크에 blob을 저장하는 백엔드"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.root, shard_path(sha256))
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path(sha256))
+
+    def commit(self, staging_path: str, sha256: str):
+        """스테이징 파일을 최종 위치로 옮깁니다. 이미 같은 내용이 있으면 스테이징 파일만 지웁니다."""
+        target = self.path(sha256)
+        if os.path.exists(target):
+            os.remove(staging_path)
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(staging_path, target)
+
+    def open(self, sha256: str) -> BinaryIO:
+        return open(self.path(sha256), "rb")
+
+    def size(self, sha256: str) -> int:
+        return os.path.getsize(self.path(sha256))
+
+    def delete(self, sha256: str):
+        try:
+            os.remove(self.path(sha256))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, sha256: str) -> str:
+        return self.path(sha256)
+
+
+class S3Backend:
+    """
+    S3 호환 스토리지(AWS S3, MinIO 등)에 blob을 저장하는 백엔드.
+    boto3가 설치되어 있어야 합니다.
+    """
+
+    def __init__(self, bucket: str, cache_dir: str, endpoint_url: Optional[str] = None,
+                 access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 region: Optional[str] = None):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("S3 저장소를 사용하려면 boto3를 설치해야 합니다: pip install boto3") from e
+
+        self.bucket = bucket
+        self._client_error = ClientError
+        self._client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=region
+        )
+        # OCR 엔진처럼 로컬 경로가 필요한 경우를 위한 캐시
+        self._cache = LocalDiskBackend(cache_dir)
+
+    def _key(self, sha256: str) -> str:
+        return shard_path(sha256).replace(os.sep, "/")
+
+    def exists(self, sha256: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+            return True
+        except self._client_error:
+            return False
+
+    def commit(self, staging_path: str, sha256: str):
+        try:
+            if not self.exists(sha256):
+                self._client.upload_file(staging_path, self.bucket, self._key(sha256))
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
+    def open(self, sha256: str) -> BinaryIO:
+        response = self._client.get_object(Bucket=self.bucket, Key=self._key(sha256))
+        return response["Body"]
+
+    def size(self, sha256: str) -> int:
+        response = self._client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+        return response["ContentLength"]
+
+    def delete(self, sha256: str):
+        self._client.delete_object(Bucket=self.bucket, Key=self._key(sha256))
+        self._cache.delete(sha256)
+
+    def local_path(self, sha256: str) -> str:
+        if not self._cache.exists(sha256):
+            staging_path = os.path.join(self._cache.root, f"{uuid.uuid4().hex}.part")
+            self._client.download_file(self.bucket, self._key(sha256), staging_path)
+            self._cache.commit(staging_path, sha256)
+        return self._cache.path(sha256)
+
+
+class BlobStore:
+    """
+    계약서, PEF/특별자산 운용지시서, 첨부 파일을 위한 내용 주소 기반 저장소.
+
+    - 파일은 SHA-256 해시로 식별되며 같은 내용은 한 번만 저장됩니다.
+    - 참조 수는 DB의 file_blob 테이블에서 관리되고, 마지막 참조가 해제되면 내용을 삭제합니다.
+    - 저장 백엔드는 로컬 디스크와 S3 호환 스토리지 중에서 선택할 수 있습니다.
+    """
+
+    def __init__(self, backend, staging_dir: str):
+        self.backend = backend
+        self.staging_dir = staging_dir
+        os.makedirs(staging_dir, exist_ok=True)
+
+    def put_stream(self, stream: BinaryIO, max_bytes: Optional[int] = MAX_UPLOAD_BYTES) -> StoredBlob:
+        """
+        스트림을 저장하고 참조를 하나 추가합니다.
+
+        Args:
+            stream: 저장할 바이너리 스트림
+            max_bytes: 허용 최대 크기
+        Returns:
+            StoredBlob: blob 해시와 크기
+        Raises:
+            FileTooLargeError: 허용 크기를 넘은 경우
+        """
+        staging_path = self.new_staging_path()
+        written = write_stream_atomic(stream, staging_path, max_bytes=max_bytes)
+        return self.put_staged(staging_path, written.sha256, written.size)
+
+    def new_staging_path(self) -> str:
+        """저장소와 같은 파일 시스템에 있는 임시 파일 경로를 만듭니다."""
+        return os.path.join(self.staging_dir, f"{uuid.uuid4().hex}.blob")
+
+    def put_staged(self, staging_path: str, sha256: str, size: int) -> StoredBlob:
+        """
+        해시를 이미 계산해 둔 스테이징 파일을 저장소로 옮기고 참조를 하나 추가합니다.
+        스테이징 파일은 성공/실패와 관계없이 정리됩니다.
+        """
+        try:
+            # 참조를 먼저 기록해야 동시에 진행 중인 삭제와 겹치지 않음
+            BlobRepository.add_ref(sha256, size)
+        except Exception:
+            os.remove(staging_path)
+            raise
+
+        try:
+            self.backend.commit(staging_path, sha256)
+        except Exception:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            self.release(sha256)
+            raise
+
+        logger.info(f"blob 저장: {sha256}, {size} bytes")
+        return StoredBlob(sha256=sha256, size=size)
+
+    def open(self, sha256: str) -> BinaryIO:
+        """blob을 읽기 스트림으로 엽니다."""
+        return self.backend.open(sha256)
+
+    def iter_chunks(self, sha256: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """blob을 청크 단위로 읽습니다 (StreamingResponse 용)."""
+        with self.backend.open(sha256) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def exists(self, sha256: str) -> bool:
+        return self.backend.exists(sha256)
+
+    def size(self, sha256: str) -> int:
+        return self.backend.size(sha256)
+
+    def local_path(self, sha256: str) -> str:
+        """로컬 파일 경로가 필요한 처리(OCR 등)를 위한 경로를 반환합니다."""
+        return self.backend.local_path(sha256)
+
+    def release(self, sha256: Optional[str]):
+        """
+        참조를 하나 해제하고, 남은 참조가 없으면 내용을 삭제합니다.
+        """
+        if not sha256:
+            return
+        try:
+            if BlobRepository.release_ref(sha256) <= 0:
+                BlobRepository.delete_if_unreferenced(sha256, self.backend.delete)
+        except Exception as e:
+            # 참조 해제 실패는 저장 공간만 남기므로 요청 자체를 실패시키지 않음
+            logger.error(f"blob 참조 해제 실패: {sha256}, {str(e)}", exc_info=True)
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    설정(BLOB_STORE_BACKEND)에 따라 프로세스 전역 blob 저장소를 반환합니다.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            staging_dir = os.path.join(BLOB_STORE_DIR, "tmp")
+            if BLOB_STORE_BACKEND == "s3":
+                backend = S3Backend(
+                    bucket=BLOB_S3_BUCKET,
+                    cache_dir=os.path.join(BLOB_STORE_DIR, "s3-cache"),
+                    endpoint_url=BLOB_S3_ENDPOINT_URL,
+                    access_key=BLOB_S3_ACCESS_KEY,
+                    secret_key=BLOB_S3_SECRET_KEY,
+                    region=BLOB_S3_REGION
+                )
+            else:
+                backend = LocalDiskBackend(os.path.join(BLOB_STORE_DIR, "data"))
+            _store = BlobStore(backend, staging_dir)
+        return _store
@@ -1,7 +1,7 @@
 from repositories.checklist_result_repository import ChecklistResultRepository
 from repositories.user_repository import UserRepository
 from typing import List, Dict, Any, Optional
-from models import Checklist_Result_Value
+from models import Checklist_Result_Value, Checklist_Result_Bulk_Item
 from base_service import BaseService
 
 class ChecklistResultService:
@@ -42,6 +42,41 @@ class ChecklistResultService:
         except Exception as e:
             raise e
 
+    @staticmethod
+    def create_results_bulk(
+        user_id: int,
+        contract_id: int,
+        items: List[Checklist_Result_Bulk_Item],
+        replace_values: bool = False
+    ) -> Dict[int, int]:
+        """
+        한 계약서의 체크리스트 결과를 한 번에 생성/갱신합니다.
+        
+        Args:
+            user_id: 요청한 사용자 ID
+            contract_id: 계약서 ID
+            items: 체크리스트별 메모와 결과 값 목록
+            replace_values: True면 기존 결과 값을 지우고 새 값으로 교체
+            
+        Returns:
+            Dict[int, int]: checklist_id -> checklist_result_id
+            
+        Raises:
+            ValueError: 사용자가 존재하지 않거나 저장할 결과가 없는 경우
+            PermissionError: 사용자 계정이 비활성화된 경우
+        """
+        # 사용자 유효성 검증 (전체 요청에 대해 한 번만)
+        BaseService.validate_user(user_id)
+
+        if not items:
+            raise ValueError("저장할 체크리스트 결과가 없습니다.")
+
+        return ChecklistResultRepository.create_results_bulk(
+            contract_id=contract_id,
+            items=items,
+            replace_values=replace_values
+        )
+
     @staticmethod
     def update_memo(user_id: int, checklist_result_id: int, memo: str) -> bool:
         """
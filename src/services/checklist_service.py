@@ -1,8 +1,9 @@
 from repositories.checklist_repository import ChecklistRepository
 from repositories.user_repository import UserRepository
 from models import User, Checklist
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from base_service import BaseService
+from services.reference_cache import checklist_cache
 
 class ChecklistService:
 
@@ -29,6 +30,7 @@ class ChecklistService:
             raise ValueError("이미 등록된 질문입니다.")
         
         if ChecklistRepository.create_question(question=question):
+            checklist_cache.invalidate()
             return {"message": "체크리스트 문항이 성공적으로 등록되었습니다."}
         else:
             raise ValueError("체크리스트 문항 등록 중 오류가 발생했습니다.")
@@ -56,6 +58,7 @@ class ChecklistService:
             raise ValueError(f"{checklist_id}번 문항을 찾을 수 없습니다.")
             
         if ChecklistRepository.update_question(checklist_id, question):
+            checklist_cache.invalidate()
             return {"message": f"{checklist_id}번 문항이 성공적으로 수정되었습니다."}
         else:
             raise ValueError(f"{checklist_id}번 문항 수정 중 오류가 발생했습니다.")
@@ -82,18 +85,28 @@ class ChecklistService:
             raise ValueError(f"{checklist_id}번 문항을 찾을 수 없습니다.")
             
         if ChecklistRepository.delete_question(checklist_id):
+            checklist_cache.invalidate()
             return {"message": f"{checklist_id}번 문항이 성공적으로 삭제되었습니다."}
         else:
             raise ValueError(f"{checklist_id}번 문항 삭제 중 오류가 발생했습니다.")
     
     @staticmethod
-    def get_all_questions() -> List[Dict[str, Any]]:
+    def get_all_questions() -> List[Checklist]:
         """
         모든 체크리스트 항목을 조회합니다.
         
         Returns:
-            List[Dict[str, Any]]: 모든 체크리스트 항목 목록
+            List[Checklist]: 모든 체크리스트 항목 목록
         """
-        raw_data = ChecklistRepository.get_all_questions()
-        # (id, question) 튜플을 딕셔너리로 변환
-        return [Checklist(**raw) for raw in raw_data]
\ No newline at end of file
+        return ChecklistService.get_all_questions_with_etag()[0]
+
+    @staticmethod
+    def get_all_questions_with_etag() -> Tuple[List[Checklist], str]:
+        """
+        모든 체크리스트 항목과 그 목록의 ETag를 함께 조회합니다.
+        
+        Returns:
+            Tuple[List[Checklist], str]: 체크리스트 항목 목록, ETag
+        """
+        entry = checklist_cache.get()
+        return [Checklist(**raw) for raw in entry.data], entry.etag
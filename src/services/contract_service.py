@@ -9,16 +9,20 @@ import shutil
 import asyncio
 
 import os
+import uuid
 import logging
 import shutil
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, BinaryIO
 from pydantic import BaseModel
 from base_service import BaseService
 from repositories.contract_repository import ContractRepository
+from repositories.contract_summary_repository import ContractSummaryRepository
 from repositories.user_repository import UserRepository
 from services.ocr_service import OcrService
-from models import OcrProcessResponse, OcrResultResponse
+from services.file_writer import FileTooLargeError
+from services.blob_store import get_blob_store
+from models import OcrProcessResponse, OcrResultResponse, OcrPriority
 from config import OCR_LICENSE_KEY, OCR_SERVER_ADDR
 
 logger = logging.getLogger(__name__)
@@ -28,11 +32,22 @@ class ContractUploadResponse(BaseModel):
     message: str
     file_path: str
     contract_id: int
+    file_size: int = 0
+    sha256: Optional[str] = None
     ocr_result: OcrProcessResponse
 
+class ContractBatchUploadResponse(BaseModel):
+    message: str
+    batch_id: str
+    total_files: int
+    stored: int
+    rejected: int
+    items: List[Dict[str, Any]]
+
 class ContractService:
     @staticmethod
-    def upload_contract(uploader_id: int, contract_name: str, file_name: str, file_path: str) -> ContractUploadResponse:
+    def upload_contract(uploader_id: int, contract_name: str, file_name: str, file: BinaryIO,
+                        priority: OcrPriority = OcrPriority.NORMAL) -> ContractUploadResponse:
         """
         새로운 계약서를 업로드하고 OCR 처리를 수행합니다.
         모든 사용자가 업로드 할 수 있습니다.
@@ -41,11 +56,13 @@ class ContractService:
             uploader_id: 현재 로그인하여 파일을 업로드한 사용자 ID
             contract_name: 사용자가 지정한 계약 이름
             file_name: 업로드한 파일 이름
-            file_path: 업로드된 파일의 임시 경로
+            file: 업로드된 파일 스트림 (blob 저장소에 한 번만 청크 단위로 기록됨)
+            priority: OCR 처리 우선순위
         Returns:
             ContractUploadResponse: 파일 저장 경로 및 OCR 처리 상태 정보
         Raises:
             PermissionError: 활성화된 사용자 여부
+            FileTooLargeError: 허용 크기를 넘는 파일인 경우
             ValueError: 파일 저장 경로 (contract_name, file_name이 모두 중복되는 경우) 중복 또는 등록 실패
         """
         # 사용자 유효성 검사
@@ -55,29 +72,33 @@ class ContractService:
         if ContractRepository.find_by_file_path(contract_name=contract_name, file_name=file_name):
             raise ValueError("이미 존재하는 파일 입니다. 삭제 후 다시 업로드 해 주세요.")
         
-        # 계약서 저장 디렉토리 경로
-        target_dir = os.path.join("contracts", "original")
-        os.makedirs(target_dir, exist_ok=True)
-        
-        # 최종 저장 경로
-        target_path = os.path.join(target_dir, f"{contract_name}_{file_name}")
-        
-        # 파일 복사
-        shutil.copy2(file_path, target_path)
+        # 업로드 스트림을 내용 해시 기준으로 저장 (같은 내용은 한 번만 저장됨)
+        blob_store = get_blob_store()
+        blob = blob_store.put_stream(file)
+        if blob.size <= 0:
+            blob_store.release(blob.sha256)
+            raise ValueError("파일이 비어있습니다.")
         
         # 계약서 정보 저장
-        contract_id = ContractRepository.create_contract(
-            uploader_id=uploader_id, 
-            contract_name=contract_name, 
-            file_name=file_name
-        )
+        try:
+            contract_id = ContractRepository.create_contract(
+                uploader_id=uploader_id, 
+                contract_name=contract_name, 
+                file_name=file_name,
+                blob_sha256=blob.sha256
+            )
+        except Exception:
+            blob_store.release(blob.sha256)
+            raise
         
         if not contract_id:
-            # 파일 저장에 실패한 경우 업로드된 파일 삭제
-            if os.path.exists(target_path):
-                os.remove(target_path)
+            # 계약서 정보 저장에 실패한 경우 파일 참조 해제
+            blob_store.release(blob.sha256)
             raise ValueError("계약서 정보 저장에 실패했습니다.")
         
+        # OCR 엔진은 로컬 파일 경로가 필요함
+        target_path = blob_store.local_path(blob.sha256)
+        
         # OCR 처리 수행
         ocr_result = {
             "success": False,
@@ -90,7 +111,9 @@ class ContractService:
             ocr_service = get_ocr_service()
             
             # OCR 처리 시작
-            ocr_response = ocr_service.process_file(target_path, contract_id)
+            ocr_response = ocr_service.process_file(
+                target_path, contract_id, uploader_id=uploader_id, priority=priority
+            )
             
             # 응답 처리 - 타입 검사하여 안전하게 변환
             if hasattr(ocr_response, "dict") and callable(getattr(ocr_response, "dict")):
@@ -119,11 +142,164 @@ class ContractService:
         
         return ContractUploadResponse(
             message="새로운 계약서가 성공적으로 업로드 되었습니다.", 
-            file_path=f"contracts/original/{contract_name}_{file_name}",
+            file_path=target_path,
             contract_id=contract_id,
+            file_size=blob.size,
+            sha256=blob.sha256,
             ocr_result=ocr_result
         )
     
+    @staticmethod
+    def upload_contracts_batch(uploader_id: int, files: List[Tuple[str, str, BinaryIO]],
+                               priority: OcrPriority = OcrPriority.LOW) -> ContractBatchUploadResponse:
+        """
+        여러 계약서를 한 번에 업로드하고 OCR 처리를 일괄 등록합니다.
+        각 파일은 청크 단위로 blob 저장소에 기록되며, 계약서 정보는 하나의
+        INSERT 문으로 저장됩니다. 파일별 결과는 배치 ID로 다시 조회할 수 있습니다.
+
+        Args:
+            uploader_id: 현재 로그인하여 파일을 업로드한 사용자 ID
+            files: (contract_name, file_name, 파일 스트림) 목록
+            priority: OCR 처리 우선순위 (기본값 LOW - 대량 이관 작업이 단건 업로드를 밀어내지 않도록)
+        Returns:
+            ContractBatchUploadResponse: 배치 ID와 파일별 처리 결과
+        Raises:
+            PermissionError: 활성화된 사용자 여부
+            ValueError: 업로드할 파일이 없는 경우
+        """
+        BaseService.validate_user(uploader_id)
+
+        if not files:
+            raise ValueError("업로드할 파일이 없습니다.")
+
+        blob_store = get_blob_store()
+
+        # 기존 계약서와의 중복은 한 번의 조회로 확인
+        existing = ContractRepository.find_existing_file_paths(
+            [(contract_name, file_name) for contract_name, file_name, _ in files]
+        )
+
+        items: List[Dict[str, Any]] = []
+        stored: List[Dict[str, Any]] = []
+        seen = set()
+
+        for contract_name, file_name, stream in files:
+            item = {
+                "contract_name": contract_name,
+                "file_name": file_name,
+                "contract_id": None,
+                "upload_status": "REJECTED",
+                "message": None
+            }
+            items.append(item)
+
+            key = (contract_name, file_name)
+            if key in existing or key in seen:
+                item["message"] = "이미 존재하는 파일 입니다."
+                continue
+            seen.add(key)
+
+            try:
+                blob = blob_store.put_stream(stream)
+            except FileTooLargeError as e:
+                item["message"] = str(e)
+                continue
+            except OSError as e:
+                logger.error(f"일괄 업로드 파일 저장 실패: {file_name}, {str(e)}")
+                item["message"] = f"파일 저장에 실패했습니다: {str(e)}"
+                continue
+
+            if blob.size <= 0:
+                blob_store.release(blob.sha256)
+                item["message"] = "파일이 비어있습니다."
+                continue
+
+            item["blob_sha256"] = blob.sha256
+            stored.append(item)
+
+        if stored:
+            try:
+                contract_ids = ContractRepository.create_contracts(
+                    uploader_id=uploader_id,
+                    contracts=[(item["contract_name"], item["file_name"], item["blob_sha256"]) for item in stored]
+                )
+            except Exception as e:
+                logger.error(f"계약서 일괄 저장 실패: {str(e)}", exc_info=True)
+                for item in stored:
+                    blob_store.release(item["blob_sha256"])
+                    item["message"] = "계약서 정보 저장에 실패했습니다."
+                stored = []
+            else:
+                for item, contract_id in zip(stored, contract_ids):
+                    item["contract_id"] = contract_id
+                    item["upload_status"] = "STORED"
+
+        if stored:
+            ocr_results = get_ocr_service().process_files(
+                [(blob_store.local_path(item["blob_sha256"]), item["contract_id"]) for item in stored],
+                uploader_id=uploader_id,
+                priority=priority
+            )
+            for item, ocr_result in zip(stored, ocr_results):
+                item["ocr_result"] = ocr_result
+                if not ocr_result.get("success"):
+                    item["message"] = ocr_result.get("message")
+
+        batch_id = str(uuid.uuid4())
+        ContractRepository.create_upload_batch(batch_id=batch_id, uploader_id=uploader_id, items=items)
+
+        logger.info(f"계약서 일괄 업로드: batch={batch_id}, 저장 {len(stored)}건 / 전체 {len(items)}건")
+
+        return ContractBatchUploadResponse(
+            message="계약서 일괄 업로드가 완료되었습니다.",
+            batch_id=batch_id,
+            total_files=len(items),
+            stored=len(stored),
+            rejected=len(items) - len(stored),
+            items=items
+        )
+
+    @staticmethod
+    def get_upload_batch(user_id: int, batch_id: str) -> Dict[str, Any]:
+        """
+        일괄 업로드 배치의 파일별 업로드/OCR 상태를 조회합니다.
+        본인이 올린 배치만 조회할 수 있습니다.
+
+        Raises:
+            ValueError: 존재하지 않거나 다른 사용자가 올린 배치인 경우
+        """
+        BaseService.validate_user(user_id)
+        batch = ContractRepository.get_upload_batch(batch_id, uploader_id=user_id)
+        if not batch:
+            raise ValueError("존재하지 않는 업로드 배치입니다.")
+        return batch
+
+    @staticmethod
+    def get_contract_file(user_id: int, contract_id: int) -> Tuple[str, str, str]:
+        """
+        계약서 원본 파일의 로컬 경로, 내용 해시, 파일 이름을 조회합니다.
+
+        Args:
+            user_id: 요청한 사용자 ID
+            contract_id: 계약서 ID
+        Returns:
+            Tuple[str, str, str]: (로컬 파일 경로, sha256, 파일 이름)
+        Raises:
+            ValueError: 계약서나 원본 파일이 없는 경우
+        """
+        BaseService.validate_user(user_id)
+
+        contract = ContractRepository.find_by_id(contract_id)
+        if not contract:
+            raise ValueError("존재하지 않는 계약서입니다.")
+
+        blob_sha256 = contract.get("blob_sha256")
+        blob_store = get_blob_store()
+        if not blob_sha256 or not blob_store.exists(blob_sha256):
+            raise ValueError("계약서 원본 파일이 없습니다.")
+
+        return blob_store.local_path(blob_sha256), blob_sha256, contract["file_name"]
+
     @staticmethod
     def get_contract_ocr_result(contract_id: int) -> OcrResultResponse:
         """
@@ -237,4 +413,43 @@ class ContractService:
 
         
         # Contract 모델로 객체 생성
-        return [Contract(**data) for data in raw_data]
\ No newline at end of file
+        return [Contract(**data) for data in raw_data]
+
+    @staticmethod
+    def get_review_summaries(user_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """
+        대시보드용 계약서별 검토 요약(체크리스트 결과/값 수, 키포인트 매치 수, 최고 매치 레이트)을 조회합니다.
+
+        Args:
+            user_id: 요청한 사용자 ID
+            limit: 조회할 최대 계약서 수
+            offset: 건너뛸 계약서 수
+        Returns:
+            Dict[str, Any]: 전체 계약서 수(total)와 요약 목록(items)
+        Raises:
+            ValueError: 사용자가 존재하지 않는 경우
+            PermissionError: 사용자 계정이 비활성화된 경우
+        """
+        BaseService.validate_user(user_id)
+        return {
+            "total": ContractSummaryRepository.count_contracts(),
+            "limit": limit,
+            "offset": offset,
+            "items": ContractSummaryRepository.list_summaries(limit=limit, offset=offset)
+        }
+
+    @staticmethod
+    def rebuild_review_summaries(user_id: int) -> Dict[str, Any]:
+        """
+        모든 계약서의 검토 요약을 결과 테이블로부터 다시 계산합니다.
+        시스템 관리자 (SYSTEM) 권한을 가진 사용자만 실행할 수 있습니다.
+
+        Returns:
+            Dict[str, Any]: 성공 메시지와 갱신된 계약서 수
+        Raises:
+            PermissionError: 권한이 없는 경우
+        """
+        BaseService.check_system_admin(user_id)
+        count = ContractSummaryRepository.rebuild_all()
+        logger.info(f"계약서 검토 요약 재계산 완료: {count}건")
+        return {"message": "계약서 검토 요약을 다시 계산했습니다.", "contracts": count}
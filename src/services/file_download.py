@@ -0,0 +1,219 @@
+# services/file_download.py
+import os
+import re
+import hashlib
+import logging
+import mimetypes
+from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# 일반 전송 시 한 번에 읽는 크기
+CHUNK_SIZE = 256 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """요청한 Range가 파일 범위를 벗어난 경우"""
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 byte range 헤더를 해석합니다.
+
+    Args:
+        range_header: Range 헤더 값 (예: bytes=0-1023, bytes=1024-, bytes=-500)
+        size: 파일 크기
+    Returns:
+        Optional[Tuple[int, int]]: (시작, 끝) 바이트 위치 (끝 포함). 여러 구간 요청 등
+        해석할 수 없는 경우 None을 반환하여 전체 파일을 보내도록 합니다.
+    Raises:
+        RangeNotSatisfiable: 범위가 파일 크기를 벗어난 경우
+    """
+    match = _RANGE_RE.match(range_header.strip())
+    if not match:
+        return None
+
+    start_text, end_text = match.groups()
+    if not start_text and not end_text:
+        return None
+
+    if not start_text:
+        # 마지막 N바이트 (빈 파일에는 보낼 구간이 없음)
+        length = int(end_text)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 확인합니다.
+    헤더는 쉼표로 구분된 ETag 목록 또는 "*"이며, 약한 비교이므로 W/ 접두사는 무시합니다.
+
+    Args:
+        if_none_match: If-None-Match 헤더 값
+        etag: 응답의 ETag (따옴표 포함)
+    Returns:
+        bool: 일치하면 True (304 응답 대상)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def guess_media_type(filename: Optional[str]) -> str:
+    """파일 이름으로 Content-Type을 추정합니다 (PDF 뷰어가 application/pdf를 받도록)."""
+    if filename:
+        media_type, _ = mimetypes.guess_type(filename)
+        if media_type:
+            return media_type
+    return "application/octet-stream"
+
+
+@lru_cache(maxsize=1024)
+def _file_sha256(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    """
+    blob 저장소 밖의 파일에 대한 내용 해시. 수정 시각과 크기가 같으면 다시 계산하지 않습니다.
+    """
+    stat = os.stat(path)
+    return _file_sha256(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _content_disposition(filename: str) -> str:
+    # 한글 파일 이름은 RFC 5987 형식으로 함께 전달
+    ascii_name = filename.encode("ascii", "ignore").decode("ascii") or "download"
+    return f"inline; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+class RangeFileResponse(Response):
+    """
+    파일의 전체 또는 일부 구간을 전송하는 응답.
+
+    ASGI 서버가 http.response.zerocopy 확장을 지원하면 파일 디스크립터를 넘겨
+    sendfile로 커널에서 바로 전송하고, 지원하지 않으면 스레드에서 청크 단위로 읽어 전송합니다.
+    """
+
+    def __init__(self, path: str, start: int, end: int, status_code: int, headers: dict,
+                 media_type: str, send_body: bool = True):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.count = max(end - start + 1, 0)
+        self.send_body = send_body
+        self.headers["content-length"] = str(self.count)
+
+    async def __call__(self, scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        if not self.send_body or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        # 네트워크 파일 시스템 등에서는 open도 블로킹될 수 있으므로 스레드에서 열고 닫음
+        f = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            if "http.response.zerocopy" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": f.fileno(),
+                    "offset": self.start,
+                    "count": self.count,
+                    "more_body": False,
+                })
+                return
+
+            await anyio.to_thread.run_sync(f.seek, self.start)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(f.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # 전송 중 파일이 줄어든 경우에도 응답을 닫음
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await anyio.to_thread.run_sync(f.close)
+
+
+def file_download_response(request: Request, path: str, etag: str,
+                           media_type: str = "application/octet-stream",
+                           filename: Optional[str] = None,
+                           cache_control: str = "private, no-cache") -> Response:
+    """
+    Range / If-None-Match / If-Range를 처리하는 파일 다운로드 응답을 만듭니다.
+
+    Args:
+        request: 요청 객체 (조건부/범위 헤더 확인용)
+        path: 로컬 파일 경로
+        etag: 파일 내용 해시 (따옴표 없이)
+        media_type: Content-Type
+        filename: Content-Disposition에 넣을 파일 이름
+        cache_control: Cache-Control 헤더 값
+    Returns:
+        Response: 200(전체), 206(부분), 304(변경 없음), 416(범위 오류) 응답
+    """
+    quoted_etag = f'"{etag}"'
+    headers = {
+        "ETag": quoted_etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+    }
+    if filename:
+        headers["Content-Disposition"] = _content_disposition(filename)
+
+    if etag_matches(request.headers.get("if-none-match"), quoted_etag):
+        return Response(status_code=304, headers=headers)
+
+    size = os.path.getsize(path)
+    send_body = request.method != "HEAD"
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == quoted_etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return RangeFileResponse(path, start, end, 206, headers, media_type, send_body)
+
+    return RangeFileResponse(path, 0, size - 1, 200, headers, media_type, send_body)
@@ -0,0 +1,69 @@
+# services/file_writer.py
+import os
+import uuid
+import hashlib
+import logging
+from typing import BinaryIO, NamedTuple, Optional
+
+from config import MAX_UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 스트림을 디스크로 옮기는 단위
+CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """업로드 파일이 허용 크기를 넘은 경우"""
+
+
+class WrittenFile(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+def write_stream_atomic(stream: BinaryIO, target_path: str,
+                        max_bytes: Optional[int] = MAX_UPLOAD_BYTES) -> WrittenFile:
+    """
+    스트림을 청크 단위로 읽어 최종 경로에 원자적으로 저장합니다.
+
+    같은 디렉토리의 임시 파일에 기록한 뒤 os.replace로 교체하므로, 실패하거나
+    크기 제한을 넘으면 최종 경로에 부분 파일이 남지 않습니다. SHA-256과 크기는
+    기록하는 동안 함께 계산하여 파일을 다시 읽지 않습니다.
+
+    Args:
+        stream: 읽을 바이너리 스트림 (UploadFile.file, ZIP 멤버 등)
+        target_path: 최종 저장 경로
+        max_bytes: 허용 최대 크기 (None이면 제한 없음)
+    Returns:
+        WrittenFile: 저장 경로, 크기, SHA-256 해시
+    Raises:
+        FileTooLargeError: 허용 크기를 넘은 경우
+        OSError: 파일 기록에 실패한 경우
+    """
+    target_dir = os.path.dirname(target_path)
+    if target_dir:
+        os.makedirs(target_dir, exist_ok=True)
+
+    part_path = f"{target_path}.{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_path, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise FileTooLargeError(f"파일 크기가 허용 범위({max_bytes} bytes)를 초과했습니다.")
+                digest.update(chunk)
+                out.write(chunk)
+        os.replace(part_path, target_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    logger.debug(f"파일 저장 완료: {target_path}, {size} bytes")
+    return WrittenFile(path=target_path, size=size, sha256=digest.hexdigest())
@@ -0,0 +1,162 @@
+# services/json_patch.py
+import copy
+from typing import Any, List, Dict
+
+
+class JsonPatchError(ValueError):
+    """패치 문서가 잘못되었거나 대상 문서에 적용할 수 없는 경우"""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """RFC 6902 test 연산의 값이 일치하지 않는 경우"""
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    """JSON Pointer(RFC 6901)를 토큰 목록으로 변환합니다."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"잘못된 JSON Pointer입니다: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _array_index(container: list, token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"배열 인덱스가 올바르지 않습니다: {token}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"배열 인덱스가 범위를 벗어났습니다: {token}")
+    return index
+
+
+def _resolve_parent(document: Any, tokens: List[str]):
+    """마지막 토큰의 부모 컨테이너를 찾습니다."""
+    current = document
+    for token in tokens[:-1]:
+        if isinstance(current, dict):
+            if token not in current:
+                raise JsonPatchError(f"경로가 존재하지 않습니다: /{'/'.join(tokens)}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_array_index(current, token, allow_end=False)]
+        else:
+            raise JsonPatchError(f"경로가 존재하지 않습니다: /{'/'.join(tokens)}")
+    return current
+
+
+def _get(document: Any, pointer: str) -> Any:
+    tokens = _parse_pointer(pointer)
+    if not tokens:
+        return document
+    parent = _resolve_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"경로가 존재하지 않습니다: {pointer}")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_array_index(parent, token, allow_end=False)]
+    raise JsonPatchError(f"경로가 존재하지 않습니다: {pointer}")
+
+
+def _add(document: Any, pointer: str, value: Any) -> Any:
+    tokens = _parse_pointer(pointer)
+    if not tokens:
+        return value
+    parent = _resolve_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"값을 추가할 수 없는 경로입니다: {pointer}")
+    return document
+
+
+def _remove(document: Any, pointer: str) -> Any:
+    tokens = _parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("문서 전체는 삭제할 수 없습니다.")
+    parent = _resolve_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"경로가 존재하지 않습니다: {pointer}")
+        del parent[token]
+    elif isinstance(parent, list):
+        del parent[_array_index(parent, token, allow_end=False)]
+    else:
+        raise JsonPatchError(f"경로가 존재하지 않습니다: {pointer}")
+    return document
+
+
+def apply_json_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    RFC 6902 JSON Patch를 적용합니다. 원본 문서는 바꾸지 않고 새 문서를 반환합니다.
+
+    Args:
+        document: 대상 JSON 문서
+        operations: add, remove, replace, move, copy, test 연산 목록
+    Returns:
+        Any: 패치를 적용한 문서
+    Raises:
+        JsonPatchError: 연산이 잘못되었거나 경로가 없는 경우 (연산은 전부 적용되거나 전부 적용되지 않음)
+        JsonPatchTestFailed: test 연산이 실패한 경우
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("JSON Patch 문서는 연산 배열이어야 합니다.")
+
+    result = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise JsonPatchError(f"잘못된 연산입니다: {operation}")
+        op, path = operation["op"], operation["path"]
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"{op} 연산에는 value가 필요합니다.")
+        if op in ("move", "copy") and "from" not in operation:
+            raise JsonPatchError(f"{op} 연산에는 from이 필요합니다.")
+
+        if op == "add":
+            result = _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            result = _remove(result, path)
+        elif op == "replace":
+            _get(result, path)
+            if path == "":
+                result = copy.deepcopy(operation["value"])
+            else:
+                result = _add(_remove(result, path), path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            from_path = operation["from"]
+            if path.startswith(from_path + "/"):
+                raise JsonPatchError("값을 자신의 하위 경로로 옮길 수 없습니다.")
+            value = _get(result, from_path)
+            result = _add(_remove(result, from_path), path, value)
+        elif op == "copy":
+            result = _add(result, path, copy.deepcopy(_get(result, operation["from"])))
+        elif op == "test":
+            if _get(result, path) != operation["value"]:
+                raise JsonPatchTestFailed(f"test 연산이 실패했습니다: {path}")
+        else:
+            raise JsonPatchError(f"지원하지 않는 연산입니다: {op}")
+    return result
+
+
+def apply_merge_patch(document: Any, patch: Any) -> Any:
+    """
+    RFC 7396 JSON Merge Patch를 적용합니다. null 값은 해당 키를 삭제합니다.
+    """
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(document) if isinstance(document, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
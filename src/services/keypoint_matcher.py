@@ -0,0 +1,112 @@
+# services/keypoint_matcher.py
+import re
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from services.reference_cache import terms_cache
+
+logger = logging.getLogger(__name__)
+
+# 문자 n-gram 길이 범위 (한글은 띄어쓰기 오류가 잦아 공백을 제거한 뒤 2~3글자 단위로 비교)
+NGRAM_RANGE = (2, 3)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Set[str]:
+    """공백을 제거하고 소문자로 바꾼 텍스트에서 문자 n-gram 집합을 만듭니다."""
+    normalized = _WHITESPACE.sub("", text or "").lower()
+    grams: Set[str] = set()
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        grams.update(normalized[i:i + n] for i in range(len(normalized) - n + 1))
+    return grams
+
+
+class KeypointMatcher:
+    """
+    약관제한목록(termsNconditions) 질의를 문자 n-gram TF-IDF 행렬로 색인하고,
+    계약서 OCR 텍스트와의 매치 레이트를 한 번의 희소 행렬 곱으로 계산합니다.
+
+    - 각 질의 행은 TF-IDF 가중치를 합이 1이 되도록 정규화해 둡니다.
+    - 문서는 n-gram 존재 여부(0/1) 벡터로 만들고, 질의 행렬과 곱하면
+      "질의의 가중 n-gram 중 문서에 나타난 비율"이 되므로 ×100 하여 매치 레이트로 사용합니다.
+    """
+
+    def __init__(self, terms: Iterable[Dict[str, Any]], ngram_range: Tuple[int, int] = NGRAM_RANGE):
+        self.ngram_range = ngram_range
+        self.term_ids: List[int] = []
+        self.vocabulary: Dict[str, int] = {}
+
+        rows: List[int] = []
+        cols: List[int] = []
+        for term in terms:
+            grams = char_ngrams(term.get("query") or "", ngram_range)
+            if not grams:
+                continue
+            row = len(self.term_ids)
+            self.term_ids.append(term["id"])
+            for gram in grams:
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(gram, len(self.vocabulary)))
+
+        shape = (len(self.term_ids), len(self.vocabulary))
+        presence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=shape
+        )
+
+        # 많은 질의에 공통으로 나오는 n-gram(예: "투자", "한도")은 가중치를 낮춤
+        doc_freq = np.asarray(presence.sum(axis=0)).ravel()
+        idf = np.log((1.0 + shape[0]) / (1.0 + doc_freq)) + 1.0
+        weighted = presence.multiply(idf).tocsr()
+
+        row_sums = np.asarray(weighted.sum(axis=1)).ravel()
+        row_sums[row_sums == 0] = 1.0
+        self.matrix = sparse.diags(1.0 / row_sums).dot(weighted).tocsr()
+
+    def __len__(self) -> int:
+        return len(self.term_ids)
+
+    def score(self, text: str) -> List[Tuple[int, float]]:
+        """
+        텍스트와 모든 약관 질의의 매치 레이트를 계산합니다.
+
+        Args:
+            text: 계약서 OCR 전체 텍스트
+        Returns:
+            List[Tuple[int, float]]: (termsNconditions_id, 0.0~100.0 매치 레이트) 목록
+        """
+        if not self.term_ids:
+            return []
+        doc = np.zeros(len(self.vocabulary), dtype=np.float64)
+        columns = [self.vocabulary[g] for g in char_ngrams(text, self.ngram_range) if g in self.vocabulary]
+        if columns:
+            doc[columns] = 1.0
+        rates = np.clip(self.matrix.dot(doc) * 100.0, 0.0, 100.0)
+        return [(term_id, round(float(rate), 2)) for term_id, rate in zip(self.term_ids, rates)]
+
+
+_matcher: Optional[KeypointMatcher] = None
+_matcher_etag: Optional[str] = None
+_matcher_lock = threading.Lock()
+
+
+def get_keypoint_matcher() -> KeypointMatcher:
+    """
+    약관제한목록 전체로 만든 색인을 반환합니다.
+    약관제한목록 캐시의 내용이 바뀐 경우에만 다시 만들고, 그 외에는 재사용합니다.
+    """
+    global _matcher, _matcher_etag
+    terms = terms_cache.get()
+    with _matcher_lock:
+        if _matcher is None or _matcher_etag != terms.etag:
+            _matcher = KeypointMatcher(terms.data)
+            _matcher_etag = terms.etag
+            logger.info(
+                f"키포인트 색인 생성: 약관 {len(_matcher)}건, n-gram {len(_matcher.vocabulary)}개"
+            )
+        return _matcher
@@ -1,6 +1,9 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from repositories.keypoint_result_repository import KeypointResultRepository
+from repositories.ocr_repository import OcrRepository
+from services.keypoint_matcher import get_keypoint_matcher
 from base_service import BaseService
+from models import AIKeypointMatch
 
 class KeypointResultService:
 
@@ -40,6 +43,102 @@ class KeypointResultService:
         except Exception as e:
             raise e
 
+    @staticmethod
+    def add_by_ai_bulk(
+        contract_id: int,
+        matches: List[AIKeypointMatch],
+        top_k: Optional[int] = None,
+        min_match_rate: Optional[float] = None,
+        replace: bool = False
+    ) -> Dict[str, int]:
+        """
+        AI가 계산한 계약서-약관 매치 레이트 전체를 한 번에 저장
+        
+        Args:
+            contract_id: 계약서 ID
+            matches: 약관별 매치 레이트 목록
+            top_k: 지정하면 매치 레이트 상위 K개만 저장
+            min_match_rate: 지정하면 이 값 이상인 결과만 저장
+            replace: True면 이번에 저장하지 않은 기존 AI 결과 삭제
+            
+        Returns:
+            Dict[str, int]: received(받은 수), stored(저장한 수), removed(삭제한 기존 결과 수)
+            
+        Raises:
+            ValueError: 매치 레이트가 유효하지 않은 범위인 경우
+            Exception: 데이터베이스 오류 등 기타 예외
+        """
+        invalid = [m.termsNconditions_id for m in matches if not (0.0 <= m.match_rate <= 100.0)]
+        if invalid:
+            raise ValueError(f"매치 레이트는 0.0에서 100.0 사이의 값이어야 합니다. (약관 ID: {invalid})")
+
+        # 같은 약관이 여러 번 오면 가장 높은 값 사용
+        best: Dict[int, float] = {}
+        for m in matches:
+            if m.termsNconditions_id not in best or m.match_rate > best[m.termsNconditions_id]:
+                best[m.termsNconditions_id] = m.match_rate
+
+        selected = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        if min_match_rate is not None:
+            selected = [item for item in selected if item[1] >= min_match_rate]
+        if top_k is not None:
+            selected = selected[:top_k]
+
+        removed = KeypointResultRepository.upsert_results_by_ai(
+            contract_id=contract_id,
+            matches=selected,
+            replace=replace
+        )
+        return {"received": len(matches), "stored": len(selected), "removed": removed}
+
+    @staticmethod
+    def match_local(
+        user_id: int,
+        contract_id: int,
+        top_k: Optional[int] = None,
+        min_match_rate: Optional[float] = None,
+        replace: bool = False
+    ) -> Dict[str, int]:
+        """
+        AI 서버를 거치지 않고 계약서 OCR 텍스트와 약관제한목록을 직접 비교해 키포인트 결과 저장
+        매치 레이트가 0인 약관(공통 n-gram이 하나도 없는 약관)은 매칭으로 보지 않아 저장하지 않습니다.
+        
+        Args:
+            user_id: 요청한 사용자 ID
+            contract_id: 계약서 ID
+            top_k: 지정하면 매치 레이트 상위 K개만 저장
+            min_match_rate: 지정하면 이 값 이상인 결과만 저장
+            replace: True면 이번에 저장하지 않은 기존 AI 결과 삭제
+            
+        Returns:
+            Dict[str, int]: received(비교한 약관 수), stored(저장한 수), removed(삭제한 기존 결과 수)
+            
+        Raises:
+            ValueError: 사용자가 존재하지 않거나 계약서의 OCR 결과가 없는 경우
+            PermissionError: 사용자 계정이 비활성화된 경우
+        """
+        BaseService.validate_user(user_id)
+
+        text = OcrRepository.get_full_text_by_contract_id(contract_id)
+        if not text:
+            raise ValueError(f"계약서 ID {contract_id}의 OCR 결과를 찾을 수 없습니다.")
+
+        scores = get_keypoint_matcher().score(text)
+        matches = [
+            AIKeypointMatch(termsNconditions_id=terms_id, match_rate=rate)
+            for terms_id, rate in scores
+            if rate > 0
+        ]
+        counts = KeypointResultService.add_by_ai_bulk(
+            contract_id=contract_id,
+            matches=matches,
+            top_k=top_k,
+            min_match_rate=min_match_rate,
+            replace=replace
+        )
+        counts["received"] = len(scores)
+        return counts
+
     @staticmethod
     def add_by_ai(match_rate: float, contract_id: int, termsNconditions_id: int) -> bool:
         """
@@ -0,0 +1,83 @@
+# services/ocr_events.py
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 종료 이벤트 (이 이벤트 이후 스트림을 닫음)
+TERMINAL_EVENTS = ("complete", "error")
+
+
+class OcrEventBroker:
+    """
+    OCR 처리 진행 이벤트를 위한 프로세스 내 pub/sub 브로커.
+
+    OCR 워커 스레드에서 publish()로 이벤트를 발행하면, 해당 OCR 파일을
+    구독 중인 이벤트 루프의 큐로 전달됩니다.
+    """
+
+    def __init__(self, max_retained: int = 1000):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        # 새 구독자에게 즉시 보내 줄 파일별 마지막 이벤트
+        self._last_events: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._max_retained = max_retained
+
+    def publish(self, ocr_file_id: int, event: str, data: Dict[str, Any]):
+        """
+        이벤트를 발행합니다. 어느 스레드에서나 호출할 수 있습니다.
+
+        Args:
+            ocr_file_id: OCR 파일 ID
+            event: 이벤트 종류 (processing, page, complete, error)
+            data: 이벤트 데이터
+        """
+        message = {"event": event, "data": {"ocr_file_id": ocr_file_id, **data}}
+
+        with self._lock:
+            self._last_events[ocr_file_id] = message
+            self._last_events.move_to_end(ocr_file_id)
+            while len(self._last_events) > self._max_retained:
+                self._last_events.popitem(last=False)
+            subscribers = list(self._subscribers.get(ocr_file_id, []))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 구독자
+                logger.debug(f"종료된 구독자에게 이벤트 전달 실패: 파일 ID {ocr_file_id}")
+
+    def subscribe(self, ocr_file_id: int) -> Tuple[asyncio.Queue, Optional[Dict[str, Any]]]:
+        """
+        현재 이벤트 루프에서 OCR 파일 이벤트를 구독합니다.
+
+        Returns:
+            Tuple[asyncio.Queue, Optional[Dict]]: 이벤트 큐와 마지막으로 발행된 이벤트
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(ocr_file_id, []).append((loop, queue))
+            last_event = self._last_events.get(ocr_file_id)
+        return queue, last_event
+
+    def unsubscribe(self, ocr_file_id: int, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(ocr_file_id, [])
+            self._subscribers[ocr_file_id] = [(l, q) for l, q in subscribers if q is not queue]
+            if not self._subscribers[ocr_file_id]:
+                del self._subscribers[ocr_file_id]
+
+
+_broker = OcrEventBroker()
+
+
+def get_ocr_event_broker() -> OcrEventBroker:
+    """
+    프로세스 전역 OCR 이벤트 브로커를 반환합니다.
+    """
+    return _broker
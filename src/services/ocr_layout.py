@@ -0,0 +1,100 @@
+# services/ocr_layout.py
+import logging
+from typing import List
+
+import numpy as np
+
+from models import OcrBox, OcrLine, OcrParagraph, OcrLayout
+
+logger = logging.getLogger(__name__)
+
+# 같은 줄로 판단하는 세로 중심 간격 (박스 높이 중앙값 대비 비율)
+LINE_TOLERANCE = 0.5
+# 문단을 나누는 줄 사이 간격 (줄 높이 중앙값 대비 비율)
+PARAGRAPH_GAP = 1.2
+
+
+def build_layout(boxes: List[OcrBox],
+                 line_tolerance: float = LINE_TOLERANCE,
+                 paragraph_gap: float = PARAGRAPH_GAP) -> OcrLayout:
+    """
+    OCR 박스를 읽기 순서(위→아래, 왼쪽→오른쪽)에 따라 줄과 문단으로 묶습니다.
+    모든 좌표 계산은 numpy 배열 연산으로 한 번에 처리합니다.
+
+    Args:
+        boxes: OCR 서버가 반환한 박스 목록 (서버 반환 순서)
+        line_tolerance: 같은 줄로 묶을 세로 중심 간격 비율
+        paragraph_gap: 문단을 나눌 줄 간격 비율
+    Returns:
+        OcrLayout: 줄/문단 구조와 구조화된 텍스트
+    """
+    if not boxes:
+        return OcrLayout()
+
+    # (N, 4, 2) 꼭짓점 좌표 배열
+    coords = np.array([
+        [[b.left_top.x, b.left_top.y], [b.right_top.x, b.right_top.y],
+         [b.right_bottom.x, b.right_bottom.y], [b.left_bottom.x, b.left_bottom.y]]
+        for b in boxes
+    ], dtype=np.float64)
+
+    left = coords[:, :, 0].min(axis=1)
+    right = coords[:, :, 0].max(axis=1)
+    top = coords[:, :, 1].min(axis=1)
+    bottom = coords[:, :, 1].max(axis=1)
+    center = (top + bottom) / 2.0
+    box_height = float(np.median(np.maximum(bottom - top, 1.0)))
+
+    # 1. 세로 중심 기준 정렬 후, 인접 박스 간 간격이 임계값을 넘으면 새 줄로 판단
+    by_center = np.argsort(center, kind="stable")
+    new_line = np.concatenate(([True], np.diff(center[by_center]) > box_height * line_tolerance))
+    line_id = np.empty(len(boxes), dtype=np.int64)
+    line_id[by_center] = np.cumsum(new_line) - 1
+
+    # 2. 줄 번호 → 왼쪽 x 좌표 순으로 읽기 순서 결정
+    reading_order = np.lexsort((left, line_id))
+    sorted_line_id = line_id[reading_order]
+    line_starts = np.flatnonzero(np.concatenate(([True], np.diff(sorted_line_id) != 0)))
+
+    line_left = np.minimum.reduceat(left[reading_order], line_starts)
+    line_right = np.maximum.reduceat(right[reading_order], line_starts)
+    line_top = np.minimum.reduceat(top[reading_order], line_starts)
+    line_bottom = np.maximum.reduceat(bottom[reading_order], line_starts)
+
+    # 3. 줄 사이 세로 간격이 줄 높이 중앙값 대비 클 때 새 문단으로 판단
+    line_height = float(np.median(np.maximum(line_bottom - line_top, 1.0)))
+    line_gaps = line_top[1:] - line_bottom[:-1]
+    new_paragraph = np.concatenate(([True], line_gaps > line_height * paragraph_gap))
+    paragraph_id = np.cumsum(new_paragraph) - 1
+
+    line_ends = np.append(line_starts[1:], len(reading_order))
+    lines: List[OcrLine] = []
+    for idx, (start, end) in enumerate(zip(line_starts, line_ends)):
+        box_indices = [int(i) for i in reading_order[start:end]]
+        text = " ".join(boxes[i].label for i in box_indices if boxes[i].label).strip()
+        lines.append(OcrLine(
+            text=text,
+            box_indices=box_indices,
+            left=int(line_left[idx]),
+            top=int(line_top[idx]),
+            right=int(line_right[idx]),
+            bottom=int(line_bottom[idx])
+        ))
+
+    paragraphs: List[OcrParagraph] = []
+    paragraph_starts = np.flatnonzero(new_paragraph)
+    paragraph_ends = np.append(paragraph_starts[1:], len(lines))
+    for start, end in zip(paragraph_starts, paragraph_ends):
+        line_indices = list(range(int(start), int(end)))
+        paragraphs.append(OcrParagraph(
+            text="\n".join(lines[i].text for i in line_indices if lines[i].text),
+            line_indices=line_indices
+        ))
+
+    logger.debug(f"레이아웃 계산 완료: 박스 {len(boxes)}개, 줄 {len(lines)}개, 문단 {int(paragraph_id[-1]) + 1}개")
+
+    return OcrLayout(
+        lines=lines,
+        paragraphs=paragraphs,
+        text="\n\n".join(p.text for p in paragraphs if p.text)
+    )
@@ -0,0 +1,114 @@
+# services/ocr_scheduler.py
+import logging
+import threading
+import concurrent.futures
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from models import OcrPriority
+
+logger = logging.getLogger(__name__)
+
+# 높은 우선순위부터 처리
+PRIORITY_ORDER = (OcrPriority.HIGH, OcrPriority.NORMAL, OcrPriority.LOW)
+
+Task = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+class _PriorityLevel:
+    """한 우선순위 단계의 업로더별 대기열과 라운드 로빈 순서"""
+
+    def __init__(self):
+        self.queues: Dict[Hashable, Deque[Task]] = {}
+        self.ring: Deque[Hashable] = deque()
+        self.served: Dict[Hashable, int] = {}
+
+
+class FairPageScheduler:
+    """
+    OCR 페이지 작업을 우선순위와 업로더별 공정 분배로 스케줄링합니다.
+
+    - 우선순위 단계 사이에서는 높은 단계의 작업을 항상 먼저 꺼냅니다.
+    - 같은 단계 안에서는 업로더별 대기열을 가중 라운드 로빈으로 순회하여,
+      한 업로더가 대량의 페이지를 등록해도 다른 업로더의 작업이 뒤로 밀리지 않게 합니다.
+
+    작업 순서는 등록 시점이 아니라 실행기 워커가 비는 시점에 결정됩니다.
+    submit()마다 실행기에 "다음 작업 하나 실행"을 등록하므로 등록된 작업 수와
+    실행 횟수가 항상 같습니다.
+    """
+
+    def __init__(self, executor: concurrent.futures.Executor,
+                 weights: Optional[Dict[Hashable, int]] = None):
+        """
+        Args:
+            executor: 작업을 실행할 실행기
+            weights: 업로더별 라운드당 연속 처리 페이지 수 (미지정 업로더는 1)
+        """
+        self._executor = executor
+        self._weights = {owner: max(1, int(weight)) for owner, weight in (weights or {}).items()}
+        self._lock = threading.Lock()
+        self._levels: Dict[OcrPriority, _PriorityLevel] = {p: _PriorityLevel() for p in PRIORITY_ORDER}
+
+    def submit(self, owner: Hashable, priority: OcrPriority, fn: Callable[..., Any], *args: Any):
+        """
+        작업을 업로더 대기열에 등록합니다.
+
+        Args:
+            owner: 공정 분배 단위 (업로더 ID)
+            priority: 작업 우선순위
+            fn: 실행할 함수
+            args: 함수 인자
+        """
+        with self._lock:
+            level = self._levels[OcrPriority(priority)]
+            queue = level.queues.get(owner)
+            if queue is None:
+                queue = level.queues[owner] = deque()
+                level.ring.append(owner)
+                level.served[owner] = 0
+            queue.append((fn, args))
+
+        self._executor.submit(self._run_next)
+
+    def pending_counts(self) -> Dict[str, Dict[str, int]]:
+        """우선순위별, 업로더별 대기 작업 수를 반환합니다."""
+        with self._lock:
+            return {
+                priority.value: {str(owner): len(queue) for owner, queue in level.queues.items()}
+                for priority, level in self._levels.items()
+            }
+
+    def _pop_next(self) -> Optional[Task]:
+        with self._lock:
+            for priority in PRIORITY_ORDER:
+                level = self._levels[priority]
+                if not level.ring:
+                    continue
+
+                owner = level.ring[0]
+                queue = level.queues[owner]
+                task = queue.popleft()
+                level.served[owner] += 1
+
+                if not queue:
+                    # 대기열이 비면 순서에서 제외
+                    level.ring.popleft()
+                    del level.queues[owner]
+                    del level.served[owner]
+                elif level.served[owner] >= self._weights.get(owner, 1):
+                    # 가중치만큼 처리했으면 다음 업로더에게 차례를 넘김
+                    level.served[owner] = 0
+                    level.ring.rotate(-1)
+
+                return task
+        return None
+
+    def _run_next(self):
+        task = self._pop_next()
+        if task is None:
+            return
+        fn, args = task
+        try:
+            fn(*args)
+        except Exception:
+            logger.error("OCR 스케줄러 작업 실행 중 오류 발생", exc_info=True)
@@ -1,18 +1,26 @@
 # services/ocr_service.py (신규 파일)
 import os
+import json
 import logging
 import time
+import threading
 import concurrent.futures
 from datetime import datetime
-from typing import List, Dict, Any, Optional, TypeVar, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Tuple, TypeVar, TYPE_CHECKING
 
 from models import (
-    OcrEngineType, OcrFileStatus, OcrStatus, OcrResult,
+    OcrEngineType, OcrFileStatus, OcrStatus, OcrResult, OcrPriority,
     OcrFileCreate, OcrFileUpdate, OcrProcessResponse
 )
 from services.ocr_engine import OcrEngine
+from services.ocr_layout import build_layout
+from services.page_image_cache import PageImageCache
+from services.ocr_events import get_ocr_event_broker
+from services.ocr_scheduler import FairPageScheduler
 from repositories.ocr_repository import OcrRepository
-from config import OCR_LICENSE_KEY, OCR_SERVER_ADDR
+from config import (
+    OCR_LICENSE_KEY, OCR_SERVER_ADDR, OCR_UPLOADER_WEIGHTS, PAGE_IMAGE_CACHE_DIR, PAGE_IMAGE_CACHE_MAX_BYTES
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +28,20 @@ logger = logging.getLogger(__name__)
 # OcrService 타입을 위한 타입 변수 정의
 T = TypeVar('T', bound='OcrService')
 
+
+class _OcrJob:
+    """한 OCR 파일의 페이지 단위 처리 상태"""
+    
+    def __init__(self, ocr_file_id: int, file_path: str, owner: int, priority: OcrPriority):
+        self.ocr_file_id = ocr_file_id
+        self.file_path = file_path
+        self.owner = owner
+        self.priority = priority
+        self.total_pages = 0
+        self.pages_done = 0
+        self.failed = False
+        self.lock = threading.Lock()
+
 class OcrService:
     # 클래스 변수로 싱글톤 인스턴스 저장
     _instance = None
@@ -53,6 +75,9 @@ class OcrService:
         self.max_workers = max_workers
         self._engine = OcrEngine.create_ocr_engine(license_key, server_addr)
         self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._scheduler = FairPageScheduler(self._executor, weights=OCR_UPLOADER_WEIGHTS)
+        self._image_cache = PageImageCache(PAGE_IMAGE_CACHE_DIR, PAGE_IMAGE_CACHE_MAX_BYTES)
+        self._events = get_ocr_event_broker()
     
 
             
@@ -62,13 +87,18 @@ class OcrService:
             logger.info(f"OCR 서버 연결 성공: {message}")
         else:
             logger.warning(f"OCR 서버 연결 확인 필요: {message}")
-    def process_file(self, file_path: str, contract_id: Optional[int] = None) -> OcrProcessResponse:
+    def process_file(self, file_path: str, contract_id: Optional[int] = None,
+                     uploader_id: Optional[int] = None,
+                     priority: OcrPriority = OcrPriority.NORMAL) -> OcrProcessResponse:
         """
         파일 OCR 처리를 시작합니다.
+        페이지 단위 작업은 우선순위별로, 같은 우선순위 안에서는 업로더별로 공정하게 처리됩니다.
         
         Args:
             file_path: OCR 처리할 파일 경로
             contract_id: 연결된 계약서 ID (선택 사항)
+            uploader_id: 업로더 ID (공정 분배 단위, 없으면 시스템 작업으로 처리)
+            priority: OCR 처리 우선순위
             
         Returns:
             OcrProcessResponse: OCR 처리 요청 결과 정보
@@ -114,8 +144,9 @@ class OcrService:
                     ocr_status="failed"
                 )
             
-            # 비동기 OCR 처리 시작
-            self._executor.submit(self._process_ocr, file_path, ocr_file_id)
+            # 비동기 OCR 처리 시작 (첫 페이지 처리 후 나머지 페이지를 스케줄러에 등록)
+            job = _OcrJob(ocr_file_id, file_path, uploader_id or 0, priority)
+            self._scheduler.submit(job.owner, job.priority, self._process_ocr, job)
             
             return {
                 "success": True,
@@ -131,26 +162,108 @@ class OcrService:
                 "message": f"OCR 처리 요청 중 오류 발생: {str(e)}",
                 "ocr_status": "failed"
             }
+
+    def process_files(self, files: List[Tuple[str, Optional[int]]],
+                      uploader_id: Optional[int] = None,
+                      priority: OcrPriority = OcrPriority.LOW) -> List[Dict[str, Any]]:
+        """
+        여러 파일의 OCR 처리를 한 번에 시작합니다.
+        OCR 파일 정보를 한 번의 INSERT로 저장한 뒤 모든 작업을 스케줄러에 등록합니다.
+
+        Args:
+            files: (파일 경로, 계약서 ID) 목록
+            uploader_id: 업로더 ID (공정 분배 단위)
+            priority: OCR 처리 우선순위 (기본값은 대량 작업용 LOW)
+        Returns:
+            List[Dict]: 입력 순서대로의 OCR 처리 요청 결과
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        ocr_files: List[OcrFileCreate] = []
+        indices: List[int] = []
+        created_date = datetime.now()
+
+        for idx, (file_path, contract_id) in enumerate(files):
+            if not os.path.exists(file_path) or os.path.getsize(file_path) <= 0:
+                results[idx] = {
+                    "success": False,
+                    "message": f"파일이 존재하지 않거나 비어있습니다: {file_path}",
+                    "ocr_status": "failed"
+                }
+                continue
+            ocr_files.append(OcrFileCreate(
+                file_name=os.path.basename(file_path),
+                file_path=file_path,
+                engine_type=OcrEngineType.GMS,
+                ocr_file_status=OcrFileStatus.READY,
+                created_date=created_date,
+                contract_id=contract_id
+            ))
+            indices.append(idx)
+
+        ocr_file_ids = OcrRepository.save_ocr_files(ocr_files) if ocr_files else []
+        if ocr_files and not ocr_file_ids:
+            for idx in indices:
+                results[idx] = {
+                    "success": False,
+                    "message": "OCR 파일 정보 저장에 실패했습니다.",
+                    "ocr_status": "failed"
+                }
+            return results
+
+        for idx, ocr_file_id in zip(indices, ocr_file_ids):
+            job = _OcrJob(ocr_file_id, files[idx][0], uploader_id or 0, priority)
+            self._scheduler.submit(job.owner, job.priority, self._process_ocr, job)
+            results[idx] = {
+                "success": True,
+                "message": "OCR 처리가 시작되었습니다.",
+                "ocr_file_id": ocr_file_id,
+                "ocr_status": "processing"
+            }
+
+        logger.info(f"OCR 일괄 처리 요청: {len(ocr_file_ids)}/{len(files)}건 등록")
+        return results
+
+    def get_page_image(self, page_file_data: str) -> Tuple[bytes, str]:
+        """
+        OCR 처리된 페이지 이미지를 반환합니다.
+        로컬 캐시에 있으면 OCR 서버에 요청하지 않으며, 같은 페이지에 대한
+        동시 요청은 한 번의 다운로드로 처리됩니다.
+        
+        Args:
+            page_file_data: OCR 서버의 페이지 이미지 경로 (ocr_pages.page_file_data)
+        Returns:
+            Tuple[bytes, str]: 이미지 바이트와 ETag 값
+        """
+        return self._image_cache.get_or_fetch(
+            page_file_data,
+            lambda: self._engine.download_img(page_file_data)
+        )
+    
+    def get_page_image_etag(self, page_file_data: str) -> Optional[str]:
+        """캐시된 페이지 이미지의 ETag를 반환합니다. 캐시에 없으면 None을 반환합니다."""
+        return self._image_cache.get_etag(page_file_data)
     
-    def _process_ocr(self, file_path: str, ocr_file_id: int):
+    def _process_ocr(self, job: _OcrJob):
         """
-        실제 OCR 처리를 수행하는 내부 메서드 (비동기 실행)
+        첫 페이지 OCR 처리를 수행하고, 전체 페이지 수를 확인한 뒤
+        나머지 페이지를 페이지 단위 작업으로 스케줄러에 등록합니다. (비동기 실행)
         
         Args:
-            file_path: OCR 처리할 파일 경로
-            ocr_file_id: 저장된 OCR 파일 ID
+            job: OCR 파일 처리 상태
         """
+        ocr_file_id = job.ocr_file_id
         try:
             # 상태 업데이트: 처리 중
             OcrRepository.update_ocr_file(
                 file_id=ocr_file_id,
                 update_data=OcrFileUpdate(ocr_file_status=OcrFileStatus.PROCESSING)
             )
+            self._events.publish(ocr_file_id, "processing", {"ocr_status": "processing"})
             
             # 첫 페이지 OCR 처리
             start_time = time.time()
             ocr_result = self._engine.ocr(
-                image_file=file_path,
+                image_file=job.file_path,
                 page_index="0",
                 file_type="local",
             )
@@ -164,62 +277,121 @@ class OcrService:
                     fid=ocr_result.fid
                 )
             )
+            job.total_pages = max(ocr_result.total_pages, 1)
             
             # 첫 페이지 저장
-            page_id = OcrRepository.save_ocr_page(
-                ocr_file_id=ocr_file_id,
-                page=1,  # 1-based page number
-                full_text=ocr_result.full_text,
-                executed_at=datetime.now(),
-                execute_seconds=execution_time,
-                ocr_status=OcrStatus.SUCCESS,
-                page_file_data=ocr_result.page_file_data,
-                rotate=ocr_result.rotate
-            )
+            self._save_page(ocr_file_id, 1, ocr_result, execution_time)  # 1-based page number
             
-            if page_id and ocr_result.boxes:
-                OcrRepository.save_ocr_boxes(page_id, ocr_result.boxes)
-            
-            # 추가 페이지 처리 (있는 경우)
+            # 추가 페이지는 페이지 단위로 스케줄링 (있는 경우)
             for page_idx in range(1, ocr_result.total_pages):
-                start_time = time.time()
-                page_result = self._engine.ocr(
-                    image_file=file_path,
-                    page_index=str(page_idx),
-                    file_type="local"
-                )
-                execution_time = time.time() - start_time
-                
-                page_id = OcrRepository.save_ocr_page(
-                    ocr_file_id=ocr_file_id,
-                    page=page_idx + 1,  # 1-based page number
-                    full_text=page_result.full_text,
-                    executed_at=datetime.now(),
-                    execute_seconds=execution_time,
-                    ocr_status=OcrStatus.SUCCESS,
-                    page_file_data=page_result.page_file_data,
-                    rotate=page_result.rotate
-                )
-                
-                if page_id and page_result.boxes:
-                    OcrRepository.save_ocr_boxes(page_id, page_result.boxes)
+                self._scheduler.submit(job.owner, job.priority, self._process_page, job, page_idx)
             
-            # 상태 업데이트: 완료
-            OcrRepository.update_ocr_file(
-                file_id=ocr_file_id,
-                update_data=OcrFileUpdate(ocr_file_status=OcrFileStatus.COMPLETE)
+            self._complete_page(job, 1)
+            
+        except Exception as e:
+            self._fail_job(job, e)
+
+    def _process_page(self, job: _OcrJob, page_idx: int):
+        """
+        한 페이지의 OCR 처리를 수행합니다. (비동기 실행)
+        
+        Args:
+            job: OCR 파일 처리 상태
+            page_idx: 처리할 페이지 인덱스 (0부터 시작)
+        """
+        if job.failed:
+            return
+        
+        try:
+            start_time = time.time()
+            page_result = self._engine.ocr(
+                image_file=job.file_path,
+                page_index=str(page_idx),
+                file_type="local"
             )
+            execution_time = time.time() - start_time
             
-            logger.info(f"OCR 처리 완료: 파일 ID {ocr_file_id}, 총 {ocr_result.total_pages}페이지")
+            self._save_page(job.ocr_file_id, page_idx + 1, page_result, execution_time)  # 1-based page number
+            self._complete_page(job, page_idx + 1)
             
         except Exception as e:
-            logger.error(f"OCR 처리 중 오류 발생: 파일 ID {ocr_file_id}", exc_info=True)
-            
-            # 상태 업데이트: 오류
-            OcrRepository.update_ocr_file(
-                file_id=ocr_file_id,
-                update_data=OcrFileUpdate(ocr_file_status=OcrFileStatus.ERROR)
-            )
+            self._fail_job(job, e)
+
+    def _complete_page(self, job: _OcrJob, page: int):
+        """페이지 처리 완료를 기록하고, 모든 페이지가 끝나면 파일을 완료 상태로 변경합니다."""
+        with job.lock:
+            job.pages_done += 1
+            pages_done = job.pages_done
+            finished = pages_done >= job.total_pages and not job.failed
+        
+        self._events.publish(job.ocr_file_id, "page", {
+            "ocr_status": "processing",
+            "page": page,
+            "pages_done": pages_done,
+            "total_pages": job.total_pages
+        })
+        
+        if not finished:
+            return
+        
+        # 상태 업데이트: 완료
+        OcrRepository.update_ocr_file(
+            file_id=job.ocr_file_id,
+            update_data=OcrFileUpdate(ocr_file_status=OcrFileStatus.COMPLETE)
+        )
+        self._events.publish(job.ocr_file_id, "complete", {
+            "ocr_status": "complete",
+            "total_pages": job.total_pages
+        })
+        
+        logger.info(f"OCR 처리 완료: 파일 ID {job.ocr_file_id}, 총 {job.total_pages}페이지")
+
+    def _fail_job(self, job: _OcrJob, error: Exception):
+        """파일을 오류 상태로 변경합니다. 남은 페이지 작업은 실행되지 않습니다."""
+        with job.lock:
+            if job.failed:
+                return
+            job.failed = True
+        
+        logger.error(f"OCR 처리 중 오류 발생: 파일 ID {job.ocr_file_id}", exc_info=error)
+        
+        # 상태 업데이트: 오류
+        OcrRepository.update_ocr_file(
+            file_id=job.ocr_file_id,
+            update_data=OcrFileUpdate(ocr_file_status=OcrFileStatus.ERROR)
+        )
+        self._events.publish(job.ocr_file_id, "error", {"ocr_status": "error", "message": str(error)})
+
+    def _save_page(self, ocr_file_id: int, page: int, ocr_result: OcrResult, execution_time: float):
+        """
+        OCR 페이지 결과를 읽기 순서 레이아웃과 함께 저장합니다.
+        레이아웃은 수집 시점에 한 번만 계산하여 이후 조회 시 재계산하지 않습니다.
+        
+        Args:
+            ocr_file_id: 저장된 OCR 파일 ID
+            page: 페이지 번호 (1부터 시작)
+            ocr_result: 해당 페이지의 OCR 결과
+            execution_time: OCR 수행 시간 (초)
+        """
+        layout = build_layout(ocr_result.boxes)
+        
+        page_id = OcrRepository.save_ocr_page(
+            ocr_file_id=ocr_file_id,
+            page=page,
+            full_text=ocr_result.full_text,
+            executed_at=datetime.now(),
+            execute_seconds=execution_time,
+            ocr_status=OcrStatus.SUCCESS,
+            page_file_data=ocr_result.page_file_data,
+            rotate=ocr_result.rotate,
+            layout_text=layout.text,
+            layout_json=json.dumps(layout.dict(), ensure_ascii=False)
+        )
+        
+        if page_id and ocr_result.boxes:
+            OcrRepository.save_ocr_boxes(page_id, ocr_result.boxes)
+        
+        return page_id
 
 
 # 클래스 외부에 helper 함수 정의
@@ -0,0 +1,187 @@
+# services/page_image_cache.py
+import os
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PageImageCache:
+    """
+    OCR 서버에서 내려받은 페이지 이미지를 로컬 디스크에 캐시합니다.
+
+    - 키(page_file_data 경로)는 sha256 해시로 keys/ 아래에 기록되고,
+      실제 이미지는 내용 해시 기준으로 blobs/ 아래에 한 번만 저장됩니다.
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 키부터 제거합니다.
+    - 같은 키에 대한 동시 요청은 하나의 다운로드만 수행하고 결과를 공유합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._key_dir = os.path.join(cache_dir, "keys")
+        self._blob_dir = os.path.join(cache_dir, "blobs")
+        os.makedirs(self._key_dir, exist_ok=True)
+        os.makedirs(self._blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # key_hash -> content_hash (LRU 순서: 앞쪽이 가장 오래됨)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._blob_refs: Dict[str, int] = {}
+        self._blob_sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+
+        self._load_index()
+
+    def _load_index(self):
+        """재시작 시 디스크에 남아 있는 캐시 항목을 마지막 사용 시각 순으로 복원합니다."""
+        key_files = []
+        for name in os.listdir(self._key_dir):
+            path = os.path.join(self._key_dir, name)
+            try:
+                with open(path, "r") as f:
+                    content_hash = f.read().strip()
+                blob_path = self._blob_path(content_hash)
+                if not content_hash or not os.path.exists(blob_path):
+                    os.remove(path)
+                    continue
+                key_files.append((os.path.getmtime(path), name, content_hash))
+            except OSError:
+                continue
+
+        for _, key_hash, content_hash in sorted(key_files):
+            self._add_entry(key_hash, content_hash, os.path.getsize(self._blob_path(content_hash)))
+
+        logger.info(f"페이지 이미지 캐시 복원: {len(self._entries)}건, {self._total_bytes} bytes")
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self._blob_dir, content_hash)
+
+    def _key_path(self, key_hash: str) -> str:
+        return os.path.join(self._key_dir, key_hash)
+
+    def _add_entry(self, key_hash: str, content_hash: str, size: int):
+        """잠금을 잡은 상태에서 호출해야 합니다."""
+        self._entries[key_hash] = content_hash
+        self._entries.move_to_end(key_hash)
+        if content_hash not in self._blob_refs:
+            self._blob_refs[content_hash] = 0
+            self._blob_sizes[content_hash] = size
+            self._total_bytes += size
+        self._blob_refs[content_hash] += 1
+
+    def _drop_entry(self, key_hash: str):
+        """잠금을 잡은 상태에서 호출해야 합니다."""
+        content_hash = self._entries.pop(key_hash, None)
+        if content_hash is None:
+            return
+        try:
+            os.remove(self._key_path(key_hash))
+        except OSError:
+            pass
+
+        self._blob_refs[content_hash] -= 1
+        if self._blob_refs[content_hash] <= 0:
+            del self._blob_refs[content_hash]
+            self._total_bytes -= self._blob_sizes.pop(content_hash, 0)
+            try:
+                os.remove(self._blob_path(content_hash))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """잠금을 잡은 상태에서 호출해야 합니다. 가장 최근 항목 하나는 남겨 둡니다."""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            logger.debug(f"페이지 이미지 캐시 제거: {oldest_key}")
+            self._drop_entry(oldest_key)
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get_etag(self, key: str) -> Optional[str]:
+        """
+        캐시된 항목의 ETag(내용 해시)를 반환합니다. 캐시에 없으면 None을 반환합니다.
+        이미지를 읽지 않으므로 If-None-Match 확인에 사용합니다.
+        """
+        key_hash = self._hash(key.encode("utf-8"))
+        with self._lock:
+            return self._entries.get(key_hash)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """
+        캐시에서 이미지를 반환하거나, 없으면 fetch()로 내려받아 저장한 뒤 반환합니다.
+
+        Args:
+            key: 캐시 키 (OCR 서버의 page_file_data 경로)
+            fetch: 캐시에 없을 때 이미지를 내려받는 함수
+        Returns:
+            Tuple[bytes, str]: 이미지 바이트와 ETag(내용 sha256)
+        """
+        key_hash = self._hash(key.encode("utf-8"))
+
+        with self._lock:
+            content_hash = self._entries.get(key_hash)
+            if content_hash is not None:
+                self._entries.move_to_end(key_hash)
+            else:
+                future = self._inflight.get(key_hash)
+                is_leader = future is None
+                if is_leader:
+                    future = concurrent.futures.Future()
+                    self._inflight[key_hash] = future
+
+        if content_hash is not None:
+            try:
+                with open(self._blob_path(content_hash), "rb") as f:
+                    data = f.read()
+                os.utime(self._key_path(key_hash))
+                return data, content_hash
+            except OSError:
+                # 디스크에서 사라진 항목은 정리 후 다시 내려받음
+                with self._lock:
+                    self._drop_entry(key_hash)
+                return self.get_or_fetch(key, fetch)
+
+        if not is_leader:
+            # 이미 진행 중인 다운로드 결과를 기다림
+            return future.result()
+
+        try:
+            data = fetch()
+            content_hash = self._hash(data)
+
+            # 디스크 쓰기는 잠금 밖에서 수행하여 캐시 적중 요청이 기다리지 않게 함
+            # (이 키의 다운로드는 이 스레드만 수행하므로 키 파일을 다른 스레드가 건드리지 않음)
+            blob_path = self._blob_path(content_hash)
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, data)
+            self._write_atomic(self._key_path(key_hash), content_hash.encode("ascii"))
+
+            with self._lock:
+                if content_hash not in self._blob_refs and not os.path.exists(blob_path):
+                    # 쓰기와 잠금 사이에 같은 내용의 다른 항목이 제거되면서 파일이 지워진 경우
+                    self._write_atomic(blob_path, data)
+                self._add_entry(key_hash, content_hash, len(data))
+                self._evict()
+
+            future.set_result((data, content_hash))
+            return data, content_hash
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key_hash, None)
@@ -1,10 +1,48 @@
 # src/services/pef_service.py
 
-from repositories.pef_repository import PEFRepository
-from typing import Optional, List
-from models import TransactionHistory, InstructionPEF
+import copy
+import logging
+from datetime import datetime, date
+from repositories.pef_repository import PEFRepository, TRANSACTION_GROUP_COLUMNS
+from typing import Optional, List, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from models import TransactionHistory, InstructionPEF, InstructionPEFDetail, AiJobStatus
 from base_service import BaseService
+from services.blob_store import get_blob_store
+from services.ai_worker import get_ai_worker, AnalysisQueueFullError
+from services.ai_client import get_ai_client
+from config import AI_ANALYSIS_USE_DUMMY_RESULT
 
+logger = logging.getLogger(__name__)
+
+# AI 서버 연동 전 사용하는 PEF 분석 예시 결과
+_DUMMY_PEF_RESULT: Dict[str, Any] = {
+    "pef_data": {
+        "is_fund_item": "F",
+        "company_detail": "",
+        "other_specs_text": "CMA매도 및 원천징수 이자 발급"
+    },
+    "transaction_data": [
+        {
+            "deal_type": "입금",
+            "deal_object": "CMA 매도",
+            "bank_name": "유리은행",
+            "account_number": "110-143-14678941777",
+            "holder_name": "앨리초이",
+            "amount": "279,620,789",
+            "process_date": "2025.12.31"
+        },
+        {
+            "deal_type": "입금",
+            "deal_object": "CMA 이자",
+            "bank_name": "유리은행",
+            "account_number": "110-143-14678941777",
+            "holder_name": "앨리초이",
+            "amount": "379,211",
+            "process_date": "2025.12.31"
+        }
+    ]
+}
 
 
 class PEFService(BaseService):
@@ -35,11 +73,179 @@ class PEFService(BaseService):
             is_fund_item=pef.is_fund_item,
             company_detail=pef.company_detail,
             other_specs_text=pef.other_specs_text,
-            transactions=transactions
+            transactions=transactions,
+            blob_sha256=pef.blob_sha256
         )
         
         return instruction_pef_id
 
+    @staticmethod
+    async def start_pef_analysis(user_id: int, file_name: str, blob_sha256: str) -> int:
+        """
+        PEF 지시서를 분석 대기 상태로 등록하고 AI 분석을 백그라운드 작업자에 맡깁니다.
+
+        Args:
+            user_id: 요청하는 사용자 ID
+            file_name: 업로드한 파일 이름
+            blob_sha256: blob 저장소에 저장된 원본 파일 해시
+
+        Returns:
+            생성된 instruction_pef의 ID (분석 결과는 /pefs/{id}/status로 확인)
+
+        Raises:
+            AnalysisQueueFullError: AI 분석 대기열이 가득 찬 경우 (지시서는 등록되지 않음)
+        """
+        # 사용자 검증
+        await run_in_threadpool(BaseService.validate_user, user_id)
+
+        worker = get_ai_worker()
+        if worker.is_full():
+            raise AnalysisQueueFullError("AI 분석 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+        instruction_pef_id = await run_in_threadpool(
+            PEFRepository.create_pending_instruction, user_id, file_name, blob_sha256
+        )
+
+        try:
+            PEFService._submit_analysis(worker, user_id, instruction_pef_id, file_name, blob_sha256)
+        except AnalysisQueueFullError:
+            # 지시서 등록 사이에 대기열이 찬 경우, 분석되지 않을 지시서를 남기지 않음
+            await run_in_threadpool(PEFRepository.delete_instruction_pef, instruction_pef_id)
+            raise
+        return instruction_pef_id
+
+    @staticmethod
+    def _submit_analysis(worker, user_id: int, instruction_pef_id: int, file_name: str, blob_sha256: str):
+        async def task():
+            await PEFService.run_pef_analysis(user_id, instruction_pef_id, file_name, blob_sha256)
+
+        async def on_drop():
+            # 서버 종료로 실행되지 못한 분석은 대기 상태로 되돌려 다음 시작 때 다시 분석
+            await run_in_threadpool(PEFRepository.update_analysis_status, instruction_pef_id, AiJobStatus.PENDING)
+
+        worker.submit(task, on_drop=on_drop)
+
+    @staticmethod
+    async def recover_pef_analyses() -> int:
+        """
+        서버 재시작 전에 끝나지 않은(PENDING/RUNNING) PEF 지시서 분석을 다시 대기열에 등록합니다.
+        대기열이 가득 차 등록하지 못한 지시서는 ERROR 상태로 남깁니다.
+
+        Returns:
+            int: 다시 등록한 분석 수
+        """
+        worker = get_ai_worker()
+        rows = await run_in_threadpool(PEFRepository.find_unfinished_analyses)
+        requeued = 0
+        for row in rows:
+            try:
+                PEFService._submit_analysis(
+                    worker, row["performer_id"], row["id"], row["file_name"], row["blob_sha256"]
+                )
+                requeued += 1
+            except AnalysisQueueFullError:
+                await run_in_threadpool(
+                    PEFRepository.update_analysis_status, row["id"], AiJobStatus.ERROR,
+                    "서버 재시작 후 AI 분석 대기열이 가득 차 분석을 다시 시작하지 못했습니다. 다시 업로드해주세요."
+                )
+        if rows:
+            logger.info(f"중단된 PEF 지시서 분석 복구: {requeued}/{len(rows)}건 재등록")
+        return requeued
+
+    @staticmethod
+    async def run_pef_analysis(user_id: int, instruction_pef_id: int, file_name: str, blob_sha256: str):
+        """
+        AI 서버로 PEF 지시서를 분석하고 결과를 instruction_pef / transaction_history에 저장합니다.
+        실패하면 지시서를 ERROR 상태로 남깁니다.
+        """
+        if not await run_in_threadpool(PEFRepository.claim_analysis, instruction_pef_id):
+            logger.info(f"PEF 지시서 {instruction_pef_id}는 이미 분석 중이거나 대기 상태가 아니어서 건너뜀")
+            return
+
+        try:
+
+            ai_result = await PEFService._extract_pef(file_name, blob_sha256)
+            pef_data = ai_result["pef_data"]
+            transactions = PEFService._parse_transactions(ai_result["transaction_data"])
+
+            await run_in_threadpool(
+                PEFRepository.create_with_transactions,
+                performer_id=user_id,
+                file_name=file_name,
+                is_fund_item=pef_data.get("is_fund_item", "F"),
+                company_detail=pef_data.get("company_detail", ""),
+                other_specs_text=pef_data.get("other_specs_text", ""),
+                transactions=transactions or None,
+                blob_sha256=blob_sha256,
+                instruction_pef_id=instruction_pef_id
+            )
+            logger.info(f"PEF 지시서 분석 완료: {instruction_pef_id}, 거래 내역 {len(transactions)}건")
+        except Exception as e:
+            logger.error(f"PEF 지시서 분석 실패: {instruction_pef_id}, {str(e)}", exc_info=True)
+            await run_in_threadpool(
+                PEFRepository.update_analysis_status, instruction_pef_id, AiJobStatus.ERROR, str(e)[:4000]
+            )
+
+    @staticmethod
+    async def _extract_pef(file_name: str, blob_sha256: str) -> Dict[str, Any]:
+        """
+        AI 서버에서 PEF 지시서 정보와 거래 내역을 추출합니다.
+        AI_ANALYSIS_USE_DUMMY_RESULT가 켜져 있으면 AI 서버 대신 고정된 예시 결과를 반환합니다.
+
+        Raises:
+            ValueError: AI 서버 응답에 pef_data / transaction_data가 없는 경우
+                        (빈 결과가 분석 완료로 저장되지 않도록 분석을 ERROR로 남김)
+        """
+        if AI_ANALYSIS_USE_DUMMY_RESULT:
+            return copy.deepcopy(_DUMMY_PEF_RESULT)
+        file_path = await run_in_threadpool(get_blob_store().local_path, blob_sha256)
+        result = await get_ai_client().process_document(file_path, file_name, "운용지시서")
+        if not isinstance(result.get("pef_data"), dict) or not isinstance(result.get("transaction_data"), list):
+            raise ValueError("AI 서버 응답에 PEF 추출 결과(pef_data, transaction_data)가 없습니다.")
+        return result
+
+    @staticmethod
+    def _parse_transactions(transaction_data_list: List[Dict[str, Any]]) -> List[TransactionHistory]:
+        """AI 결과의 거래 내역을 TransactionHistory 목록으로 변환"""
+        transactions = []
+        for tx_data in transaction_data_list or []:
+            # 문자열 날짜를 datetime.date 객체로 변환
+            process_date_str = tx_data.get("process_date", "")
+            try:
+                if process_date_str:
+                    process_date = datetime.strptime(process_date_str, "%Y.%m.%d").date()
+                else:
+                    process_date = datetime.now().date()
+            except ValueError:
+                process_date = datetime.now().date()
+
+            transactions.append(TransactionHistory(
+                deal_type=tx_data.get("deal_type", ""),
+                deal_object=tx_data.get("deal_object", ""),
+                bank_name=tx_data.get("bank_name", ""),
+                account_number=tx_data.get("account_number", ""),
+                holder_name=tx_data.get("holder_name", ""),
+                amount=tx_data.get("amount", 0),
+                process_date=process_date
+            ))
+        return transactions
+
+    @staticmethod
+    def get_pef_analysis_status(user_id: int, instruction_pef_id: int) -> Optional[Dict[str, Any]]:
+        """
+        PEF 지시서의 AI 분석 상태 조회
+
+        Args:
+            user_id: 요청하는 사용자 ID
+            instruction_pef_id: PEF 지시서 ID
+
+        Returns:
+            id, file_name, analysis_status, analysis_error 또는 None
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id)
+        return PEFRepository.get_analysis_status(instruction_pef_id)
+
     @staticmethod
     def add_transaction_to_pef(
         user_id: int,
@@ -72,6 +278,34 @@ class PEFService(BaseService):
             process_date=transaction.process_date
         )
 
+    @staticmethod
+    def add_transactions_to_pef(
+        user_id: int,
+        instruction_pef_id: int,
+        transactions: List[TransactionHistory]
+    ) -> int:
+        """
+        기존 PEF 지시서에 여러 거래 내역을 한 번에 추가 (전부 저장되거나 전부 저장되지 않음)
+        
+        Args:
+            user_id: 요청하는 사용자 ID
+            instruction_pef_id: PEF 지시서 ID
+            transactions: 거래 내역 목록
+            
+        Returns:
+            추가된 거래 내역 수
+
+        Raises:
+            ValueError: PEF 지시서가 존재하지 않는 경우
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id)
+
+        if not PEFRepository.get_pef_instruction_by_id(instruction_pef_id):
+            raise ValueError(f"ID가 {instruction_pef_id}인 PEF 지시서를 찾을 수 없습니다.")
+
+        return PEFRepository.create_transaction_histories(instruction_pef_id, transactions)
+
     @staticmethod
     def get_all_pef_instructions(user_id: int) -> List[InstructionPEF]:
         """
@@ -98,7 +332,9 @@ class PEFService(BaseService):
                 is_fund_item=pef_data.get('is_fund_item'),
                 company_detail=pef_data.get('company_detail'),
                 other_specs_text=pef_data.get('other_specs_text'),
-                created_at=pef_data.get('created_at')
+                created_at=pef_data.get('created_at'),
+                analysis_status=pef_data.get('analysis_status'),
+                analysis_error=pef_data.get('analysis_error')
             )
             pef_instructions.append(pef_instruction)
             
@@ -119,24 +355,54 @@ class PEFService(BaseService):
         # 사용자 검증
         BaseService.validate_user(user_id)
         
-        # 모든 지시서 중에서 해당 ID의 지시서 찾기
-        # 실제로는 리포지토리에 get_by_id 함수가 있으면 좋지만, 현재 예시에서는 모든 지시서를 가져와서 필터링
-        pef_data_list = PEFRepository.get_all_pef_instructions()
+        # 기본 키로 해당 지시서만 조회
+        pef_data = PEFRepository.get_pef_instruction_by_id(instruction_pef_id)
+        if not pef_data:
+            return None
+
+        return InstructionPEF(
+            id=pef_data.get('id'),
+            performer_id=pef_data.get('performer_id'),
+            file_name=pef_data.get('file_name'),
+            is_fund_item=pef_data.get('is_fund_item'),
+            company_detail=pef_data.get('company_detail'),
+            other_specs_text=pef_data.get('other_specs_text'),
+            created_at=pef_data.get('created_at'),
+            analysis_status=pef_data.get('analysis_status'),
+            analysis_error=pef_data.get('analysis_error')
+        )
+
+    @staticmethod
+    def get_pef_instruction_detail(user_id: int, instruction_pef_id: int) -> Optional[InstructionPEFDetail]:
+        """
+        PEF 지시서와 거래 내역을 함께 조회 (DB 왕복 1회)
         
-        for pef_data in pef_data_list:
-            if pef_data.get('id') == instruction_pef_id:
-                return InstructionPEF(
-                    id=pef_data.get('id'),
-                    performer_id=pef_data.get('performer_id'),
-                    file_name=pef_data.get('file_name'),
-                    is_fund_item=pef_data.get('is_fund_item'),
-                    company_detail=pef_data.get('company_detail'),
-                    other_specs_text=pef_data.get('other_specs_text'),
-                    created_at=pef_data.get('created_at')
-                )
-                
-        # 해당 ID의 지시서가 없을 경우 None 반환
-        return None
+        Args:
+            user_id: 요청하는 사용자 ID
+            instruction_pef_id: 조회할 PEF 지시서 ID
+            
+        Returns:
+            InstructionPEFDetail 객체 또는 None
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id)
+
+        pef_data = PEFRepository.get_pef_instruction_with_transactions(instruction_pef_id)
+        if not pef_data:
+            return None
+
+        return InstructionPEFDetail(
+            id=pef_data.get('id'),
+            performer_id=pef_data.get('performer_id'),
+            file_name=pef_data.get('file_name'),
+            is_fund_item=pef_data.get('is_fund_item'),
+            company_detail=pef_data.get('company_detail'),
+            other_specs_text=pef_data.get('other_specs_text'),
+            created_at=pef_data.get('created_at'),
+            analysis_status=pef_data.get('analysis_status'),
+            analysis_error=pef_data.get('analysis_error'),
+            transactions=[TransactionHistory(**tx) for tx in pef_data.get('transactions', [])]
+        )
 
     @staticmethod
     def get_transaction_histories_by_pef_id(
@@ -170,12 +436,68 @@ class PEFService(BaseService):
                 account_number=tx_data.get('account_number'),
                 holder_name=tx_data.get('holder_name'),
                 amount=tx_data.get('amount'),
+                amount_value=tx_data.get('amount_value'),
                 process_date=tx_data.get('process_date')
             )
             transaction_histories.append(transaction)
             
         return transaction_histories
     
+    @staticmethod
+    def summarize_transactions(
+        user_id: int,
+        group_by: List[str],
+        instruction_pef_id: Optional[int] = None,
+        deal_type: Optional[str] = None,
+        bank_name: Optional[str] = None,
+        holder_name: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        거래 내역 금액 합계와 건수를 그룹별로 집계
+        
+        Args:
+            user_id: 요청하는 사용자 ID
+            group_by: 그룹 기준 (deal_type, bank_name, holder_name, process_date)
+            instruction_pef_id, deal_type, bank_name, holder_name: 필터 조건
+            date_from, date_to: 처리일 범위 (양 끝 포함)
+            
+        Returns:
+            그룹별 total_amount, transaction_count, unparsed_count 목록
+            (total_amount는 JSON 변환 시 float로 바뀌어 자릿수가 손실되지 않도록
+             TransactionHistory.amount_value와 같이 문자열로 반환)
+
+        Raises:
+            ValueError: 지원하지 않는 그룹 기준이거나 날짜 범위가 잘못된 경우
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id)
+
+        invalid = [g for g in group_by if g not in TRANSACTION_GROUP_COLUMNS]
+        if invalid:
+            raise ValueError(
+                f"지원하지 않는 그룹 기준입니다: {', '.join(invalid)} "
+                f"(가능한 값: {', '.join(TRANSACTION_GROUP_COLUMNS)})"
+            )
+        if date_from and date_to and date_from > date_to:
+            raise ValueError("date_from은 date_to보다 늦을 수 없습니다.")
+
+        rows = PEFRepository.aggregate_transactions(
+            group_by=list(dict.fromkeys(group_by)),
+            instruction_pef_id=instruction_pef_id,
+            deal_type=deal_type,
+            bank_name=bank_name,
+            holder_name=holder_name,
+            date_from=date_from,
+            date_to=date_to
+        )
+        for row in rows:
+            row["total_amount"] = str(row["total_amount"])
+            row["transaction_count"] = int(row["transaction_count"])
+            row["unparsed_count"] = int(row["unparsed_count"] or 0)
+        return rows
+
     @staticmethod
     def update_transaction_history(
         user_id: int,
@@ -215,8 +537,12 @@ class PEFService(BaseService):
         # 사용자 검증
         BaseService.validate_user(user_id)
         
-        # PEF 지시서 삭제
-        return PEFRepository.delete_instruction_pef(instruction_pef_id)
+        # PEF 지시서 삭제 후 원본 파일 참조 해제
+        blob_sha256 = PEFRepository.get_blob_sha256(instruction_pef_id)
+        success = PEFRepository.delete_instruction_pef(instruction_pef_id)
+        if success:
+            get_blob_store().release(blob_sha256)
+        return success
 
     @staticmethod
     def delete_transaction(
@@ -0,0 +1,76 @@
+# services/reference_cache.py
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from config import REFERENCE_CACHE_POLL_SECONDS
+from repositories.reference_version_repository import ReferenceVersionRepository
+from repositories.checklist_repository import ChecklistRepository
+from repositories.termsNconditions_repository import TermsNConditionsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CachedReference(NamedTuple):
+    version: int
+    etag: str
+    data: List[Any]
+
+
+class VersionedReferenceCache:
+    """
+    자주 바뀌지 않는 기준 데이터를 프로세스 메모리에 캐시합니다.
+
+    - 데이터가 바뀔 때마다 reference_data_version 테이블의 버전을 올립니다.
+    - 각 프로세스는 최대 poll_seconds마다 DB 버전을 확인하고, 버전이 바뀌었으면 다시 읽습니다.
+      같은 프로세스에서 변경한 경우에는 즉시 다시 읽습니다.
+    - ETag는 읽어 온 데이터 내용의 해시이므로 DB가 초기화되어 버전이 되돌아가도 충돌하지 않습니다.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], List[Any]],
+                 poll_seconds: float = REFERENCE_CACHE_POLL_SECONDS):
+        self.name = name
+        self.loader = loader
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._entry: Optional[CachedReference] = None
+        self._checked_at = 0.0
+
+    def get(self) -> CachedReference:
+        """
+        캐시된 데이터를 반환합니다. 반환된 데이터는 여러 요청이 공유하므로 수정하면 안 됩니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._entry is not None and now - self._checked_at < self.poll_seconds:
+                return self._entry
+
+            version = ReferenceVersionRepository.get_version(self.name)
+            self._checked_at = now
+            if self._entry is None or self._entry.version != version:
+                data = self.loader()
+                digest = hashlib.sha256(
+                    json.dumps(data, default=str, sort_keys=True, ensure_ascii=False).encode("utf-8")
+                ).hexdigest()
+                self._entry = CachedReference(version=version, etag=f'"{self.name}-{digest[:16]}"', data=data)
+                logger.info(f"기준 데이터 캐시 갱신: {self.name}, 버전 {version}, {len(data)}건")
+            return self._entry
+
+    def invalidate(self):
+        """
+        데이터가 변경되었음을 기록합니다. DB 버전을 올려 다른 프로세스도 다음 확인 때 다시 읽도록 합니다.
+        """
+        try:
+            ReferenceVersionRepository.bump_version(self.name)
+        except Exception as e:
+            # 버전 기록에 실패해도 변경 자체는 완료되었으므로 요청을 실패시키지 않음
+            logger.error(f"기준 데이터 버전 갱신 실패: {self.name}, {str(e)}", exc_info=True)
+        with self._lock:
+            self._entry = None
+
+
+checklist_cache = VersionedReferenceCache("checklist", ChecklistRepository.get_all_questions)
+terms_cache = VersionedReferenceCache("termsNconditions", TermsNConditionsRepository.get_all_querys)
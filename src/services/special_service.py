@@ -1,9 +1,28 @@
 # src/services/special_service.py
 
+import json
+import logging
 from repositories.special_repository import SpecialRepository
-from typing import Optional, List, Dict, Any
-from models import InstructionSpecial, InstructionSpecialResult, Attachment
+from typing import Optional, List, Dict, Any, Tuple, BinaryIO
+from fastapi.concurrency import run_in_threadpool
+from models import InstructionSpecial, InstructionSpecialResult, Attachment, AiJobStatus
 from base_service import BaseService
+from services.blob_store import get_blob_store
+from services.file_writer import FileTooLargeError
+from services.ai_worker import get_ai_worker, AnalysisQueueFullError
+from services.json_patch import apply_json_patch, apply_merge_patch, JsonPatchError
+from services.ai_client import get_ai_client
+from config import AI_ANALYSIS_USE_DUMMY_RESULT
+
+logger = logging.getLogger(__name__)
+
+# AI 서버 연동 전 사용하는 특별자산 분석 예시 결과
+_DUMMY_SPECIAL_RESULT: Dict[str, Any] = {
+    "content": "분석된 내용 예시",
+    "quality": "Unknown dpi",
+    "average_quality": "Unknown dpi",
+    "saved_json": "{}"
+}
 
 """
 모든 서비스에서 사용자 검증은 필수 항목이다.
@@ -24,11 +43,138 @@ class SpecialService(BaseService):
         instruction_special_id = SpecialRepository.create_with_result(
             performer_id=user_id,
             file_name=special.file_name,
-            result=result
+            result=result,
+            blob_sha256=special.blob_sha256
         )
 
         return instruction_special_id
     
+    @staticmethod
+    async def start_special_analysis(user_id: int, file_name: str, blob_sha256: str) -> int:
+        """
+        특별자산 지시서를 분석 대기 상태로 등록하고 AI 분석을 백그라운드 작업자에 맡깁니다.
+
+        Args:
+            user_id: 요청하는 사용자 ID
+            file_name: 업로드한 파일 이름
+            blob_sha256: blob 저장소에 저장된 원본 파일 해시
+        Returns:
+            int: 생성된 instruction_special ID (분석 결과는 /special/{id}/status로 확인)
+        Raises:
+            AnalysisQueueFullError: AI 분석 대기열이 가득 찬 경우 (지시서는 등록되지 않음)
+        """
+        # 사용자 검증
+        await run_in_threadpool(BaseService.validate_user, user_id)
+
+        worker = get_ai_worker()
+        if worker.is_full():
+            raise AnalysisQueueFullError("AI 분석 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+        instruction_special_id = await run_in_threadpool(
+            SpecialRepository.create_pending_instruction, user_id, file_name, blob_sha256
+        )
+
+        try:
+            SpecialService._submit_analysis(worker, instruction_special_id, file_name, blob_sha256)
+        except AnalysisQueueFullError:
+            # 지시서 등록 사이에 대기열이 찬 경우, 분석되지 않을 지시서를 남기지 않음
+            await run_in_threadpool(SpecialRepository.delete_special_instruction, instruction_special_id)
+            raise
+        return instruction_special_id
+
+    @staticmethod
+    def _submit_analysis(worker, instruction_special_id: int, file_name: str, blob_sha256: str):
+        async def task():
+            await SpecialService.run_special_analysis(instruction_special_id, file_name, blob_sha256)
+
+        async def on_drop():
+            # 서버 종료로 실행되지 못한 분석은 대기 상태로 되돌려 다음 시작 때 다시 분석
+            await run_in_threadpool(
+                SpecialRepository.update_analysis_status, instruction_special_id, AiJobStatus.PENDING
+            )
+
+        worker.submit(task, on_drop=on_drop)
+
+    @staticmethod
+    async def recover_special_analyses() -> int:
+        """
+        서버 재시작 전에 끝나지 않은(PENDING/RUNNING) 특별자산 지시서 분석을 다시 대기열에 등록합니다.
+        대기열이 가득 차 등록하지 못한 지시서는 ERROR 상태로 남깁니다.
+
+        Returns:
+            int: 다시 등록한 분석 수
+        """
+        worker = get_ai_worker()
+        rows = await run_in_threadpool(SpecialRepository.find_unfinished_analyses)
+        requeued = 0
+        for row in rows:
+            try:
+                SpecialService._submit_analysis(worker, row["id"], row["file_name"], row["blob_sha256"])
+                requeued += 1
+            except AnalysisQueueFullError:
+                await run_in_threadpool(
+                    SpecialRepository.update_analysis_status, row["id"], AiJobStatus.ERROR,
+                    "서버 재시작 후 AI 분석 대기열이 가득 차 분석을 다시 시작하지 못했습니다. 다시 업로드해주세요."
+                )
+        if rows:
+            logger.info(f"중단된 특별자산 지시서 분석 복구: {requeued}/{len(rows)}건 재등록")
+        return requeued
+
+    @staticmethod
+    async def run_special_analysis(instruction_special_id: int, file_name: str, blob_sha256: str):
+        """
+        AI 서버로 특별자산 지시서를 분석하고 결과를 instruction_special_result에 저장합니다.
+        실패하면 지시서를 ERROR 상태로 남깁니다.
+        """
+        if not await run_in_threadpool(SpecialRepository.claim_analysis, instruction_special_id):
+            logger.info(f"특별자산 지시서 {instruction_special_id}는 이미 분석 중이거나 대기 상태가 아니어서 건너뜀")
+            return
+
+        try:
+
+            ai_result = await SpecialService._extract_special(file_name, blob_sha256)
+            result = InstructionSpecialResult(
+                instruction_special_id=instruction_special_id,
+                result_content=ai_result["content"],
+                all_qualities=ai_result["quality"],
+                average_quality=ai_result["average_quality"],
+                saved_json=ai_result["saved_json"]
+            )
+
+            await run_in_threadpool(SpecialRepository.complete_analysis, instruction_special_id, result)
+            logger.info(f"특별자산 지시서 분석 완료: {instruction_special_id}")
+        except Exception as e:
+            logger.error(f"특별자산 지시서 분석 실패: {instruction_special_id}, {str(e)}", exc_info=True)
+            await run_in_threadpool(
+                SpecialRepository.update_analysis_status, instruction_special_id, AiJobStatus.ERROR, str(e)[:4000]
+            )
+
+    @staticmethod
+    async def _extract_special(file_name: str, blob_sha256: str) -> Dict[str, Any]:
+        """
+        AI 서버에서 특별자산 지시서 분석 결과를 받아옵니다.
+        AI_ANALYSIS_USE_DUMMY_RESULT가 켜져 있으면 AI 서버 대신 고정된 예시 결과를 반환합니다.
+
+        Raises:
+            ValueError: AI 서버 응답에 분석 결과 항목이 없는 경우
+                        (빈 결과가 분석 완료로 저장되지 않도록 분석을 ERROR로 남김)
+        """
+        if AI_ANALYSIS_USE_DUMMY_RESULT:
+            return dict(_DUMMY_SPECIAL_RESULT)
+        file_path = await run_in_threadpool(get_blob_store().local_path, blob_sha256)
+        result = await get_ai_client().process_document(file_path, file_name, "운용지시서")
+        missing = [key for key in _DUMMY_SPECIAL_RESULT if result.get(key) is None]
+        if missing:
+            raise ValueError(f"AI 서버 응답에 특별자산 분석 결과 항목이 없습니다: {', '.join(missing)}")
+        return result
+
+    @staticmethod
+    def get_special_analysis_status(user_id: int, instruction_special_id: int) -> Optional[Dict[str, Any]]:
+        # 사용자 검증
+        BaseService.validate_user(user_id=user_id)
+
+        return SpecialRepository.get_analysis_status(instruction_special_id)
+
     @staticmethod
     def create_attachment(
         user_id: int,
@@ -46,6 +192,101 @@ class SpecialService(BaseService):
         
         return attachment_id
     
+    @staticmethod
+    def upload_attachments(
+        user_id: int,
+        instruction_special_id: int,
+        files: List[Tuple[str, BinaryIO]]
+    ) -> Dict[str, Any]:
+        """
+        여러 첨부 파일을 blob 저장소에 차례로 저장하고, 첨부 정보는 하나의 INSERT 문으로 저장합니다.
+
+        Args:
+            user_id: 요청하는 사용자 ID
+            instruction_special_id: 특별 지시서 ID
+            files: (file_name, 파일 스트림) 목록
+        Returns:
+            Dict[str, Any]: 저장/거절 건수와 파일별 결과 (attachment_id, sha256 또는 message)
+        Raises:
+            ValueError: 업로드할 파일이 없거나 지시서가 존재하지 않는 경우
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id=user_id)
+
+        if not files:
+            raise ValueError("업로드할 파일이 없습니다.")
+        if not SpecialRepository.exists(instruction_special_id):
+            raise ValueError(f"ID가 {instruction_special_id}인 특별 지시서를 찾을 수 없습니다.")
+
+        blob_store = get_blob_store()
+
+        # 기존 첨부 파일과의 이름 중복은 한 번의 조회로 확인
+        existing = SpecialRepository.find_existing_attachment_names(
+            instruction_special_id, [file_name for file_name, _ in files]
+        )
+
+        items: List[Dict[str, Any]] = []
+        stored: List[Dict[str, Any]] = []
+        seen = set()
+
+        for file_name, stream in files:
+            item = {"file_name": file_name, "attachment_id": None, "upload_status": "REJECTED", "message": None}
+            items.append(item)
+
+            if file_name in existing or file_name in seen:
+                item["message"] = "이미 존재하는 첨부 파일 이름입니다."
+                continue
+            seen.add(file_name)
+
+            try:
+                blob = blob_store.put_stream(stream)
+            except FileTooLargeError as e:
+                item["message"] = str(e)
+                continue
+            except OSError as e:
+                logger.error(f"첨부 파일 저장 실패: {file_name}, {str(e)}")
+                item["message"] = f"파일 저장에 실패했습니다: {str(e)}"
+                continue
+
+            item["sha256"] = blob.sha256
+            item["size"] = blob.size
+            stored.append(item)
+
+        if stored:
+            try:
+                attachment_ids = SpecialRepository.create_attachments(
+                    instruction_special_id=instruction_special_id,
+                    attachments=[
+                        Attachment(instruction_special_id=instruction_special_id,
+                                   file_name=item["file_name"], blob_sha256=item["sha256"])
+                        for item in stored
+                    ]
+                )
+            except Exception as e:
+                logger.error(f"첨부 파일 일괄 저장 실패: {str(e)}", exc_info=True)
+                for item in stored:
+                    blob_store.release(item["sha256"])
+                    item["message"] = "첨부 파일 정보 저장에 실패했습니다."
+                stored = []
+            else:
+                # 확인 이후 다른 요청이 같은 이름을 먼저 등록한 파일은 거절
+                for item, attachment_id in zip(stored, attachment_ids):
+                    if attachment_id is None:
+                        blob_store.release(item["sha256"])
+                        item["message"] = "이미 존재하는 첨부 파일 이름입니다."
+                    else:
+                        item["attachment_id"] = attachment_id
+                        item["upload_status"] = "STORED"
+                stored = [item for item in stored if item["attachment_id"] is not None]
+
+        return {
+            "instruction_special_id": instruction_special_id,
+            "total_files": len(items),
+            "stored": len(stored),
+            "rejected": len(items) - len(stored),
+            "items": items
+        }
+
     @staticmethod
     def create_another_result(
         user_id: int,
@@ -120,6 +361,49 @@ class SpecialService(BaseService):
         
         return success
     
+    @staticmethod
+    def patch_result_json(
+        user_id: int,
+        instruction_special_id: int,
+        result_id: int,
+        patch: Any,
+        merge: bool = False,
+        expected_version: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        saved_json 전체를 다시 보내지 않고 변경분만 적용합니다.
+
+        Args:
+            user_id: 요청하는 사용자 ID
+            instruction_special_id: 특별 지시서 ID
+            result_id: 결과 ID
+            patch: RFC 6902 연산 목록 또는 RFC 7396 merge patch 문서
+            merge: True면 merge patch로 적용
+            expected_version: 수정 전 버전 (다르면 저장하지 않음)
+        Returns:
+            Optional[int]: 저장 후 버전, 결과가 없으면 None
+        Raises:
+            JsonPatchError: 패치가 잘못되었거나 saved_json이 JSON이 아닌 경우
+            ResultVersionConflictError: 다른 요청이 먼저 수정한 경우
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id=user_id)
+
+        def apply(current: Optional[str]) -> str:
+            try:
+                document = json.loads(current) if current else {}
+            except json.JSONDecodeError:
+                raise JsonPatchError("저장된 saved_json이 올바른 JSON 형식이 아닙니다.")
+            patched = apply_merge_patch(document, patch) if merge else apply_json_patch(document, patch)
+            return json.dumps(patched, ensure_ascii=False)
+
+        return SpecialRepository.patch_result_json(
+            instruction_special_id=instruction_special_id,
+            result_id=result_id,
+            apply_patch=apply,
+            expected_version=expected_version
+        )
+
     @staticmethod
     def get_all_special_instructions(user_id: int) -> List[Dict[str, Any]]:
         # 사용자 검증
@@ -133,14 +417,16 @@ class SpecialService(BaseService):
     @staticmethod
     def get_all_results_by_special_instruction_id(
         user_id: int,
-        instruction_special_id: int
+        instruction_special_id: int,
+        include_payload: bool = True
     ) -> List[Dict[str, Any]]:
         # 사용자 검증
         BaseService.validate_user(user_id=user_id)
         
         # 특정 instruction_special_id에 대한 모든 results 조회
         results = SpecialRepository.get_all_results_by_special_instruction_id(
-            instruction_special_id=instruction_special_id
+            instruction_special_id=instruction_special_id,
+            include_payload=include_payload
         )
         
         return results
@@ -158,6 +444,79 @@ class SpecialService(BaseService):
         
         return result
     
+    @staticmethod
+    def get_special_instruction_detail(
+        user_id: int,
+        instruction_special_id: int,
+        include_content: bool = True,
+        include_json: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        # 사용자 검증 (상세 조회 전체에 대해 한 번만)
+        BaseService.validate_user(user_id=user_id)
+
+        # 지시서, 결과, 첨부 파일을 한 번에 조회
+        return SpecialRepository.get_special_instruction_detail(
+            instruction_special_id=instruction_special_id,
+            include_content=include_content,
+            include_json=include_json
+        )
+
+    @staticmethod
+    def get_result_payload(
+        user_id: int,
+        result_id: int,
+        field: str,
+        keys: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        결과의 result_content 또는 saved_json만 조회합니다.
+
+        Args:
+            user_id: 요청하는 사용자 ID
+            result_id: 결과 ID
+            field: result_content 또는 saved_json
+            keys: saved_json에서 꺼낼 키 경로 목록 (점으로 구분, 배열은 숫자 인덱스. 예: items.0.name)
+        Returns:
+            Optional[Dict[str, Any]]: keys가 없으면 {field: 원문}, 있으면 {field: {경로: 값}}
+            (없는 경로는 null). 결과가 없으면 None
+        Raises:
+            ValueError: 지원하지 않는 field이거나, keys를 지정했는데 saved_json이 JSON이 아닌 경우
+        """
+        # 사용자 검증
+        BaseService.validate_user(user_id=user_id)
+
+        if keys and field != "saved_json":
+            raise ValueError("keys는 saved_json에만 지정할 수 있습니다.")
+
+        row = SpecialRepository.get_result_payload(result_id, field)
+        if not row:
+            return None
+        if not keys:
+            return row
+
+        try:
+            document = json.loads(row[field] or "null")
+        except json.JSONDecodeError:
+            raise ValueError("saved_json이 올바른 JSON 형식이 아닙니다.")
+        row[field] = {path: SpecialService._extract_path(document, path) for path in keys}
+        return row
+
+    @staticmethod
+    def _extract_path(document: Any, path: str) -> Any:
+        """점으로 구분한 키 경로의 값을 꺼냅니다 (없으면 None)."""
+        current = document
+        for key in path.split("."):
+            if isinstance(current, dict):
+                current = current.get(key)
+            elif isinstance(current, list) and key.lstrip("-").isdigit():
+                index = int(key)
+                current = current[index] if -len(current) <= index < len(current) else None
+            else:
+                return None
+            if current is None:
+                return None
+        return current
+
     @staticmethod
     def get_attachments_by_instruction_id(
         user_id: int,
@@ -194,12 +553,17 @@ class SpecialService(BaseService):
         # 사용자 검증
         BaseService.validate_user(user_id=user_id)
         
-        # 특정 instruction_special_id에 대한 special instruction 삭제
-        success = SpecialRepository.delete_special_instruction(
+        # 특정 instruction_special_id에 대한 special instruction 삭제 (첨부 파일은 CASCADE로 함께 삭제)
+        blob_sha256s = SpecialRepository.delete_special_instruction_with_blobs(
             instruction_special_id=instruction_special_id
         )
-        
-        return success
+        if blob_sha256s is None:
+            return False
+
+        blob_store = get_blob_store()
+        for blob_sha256 in blob_sha256s:
+            blob_store.release(blob_sha256)
+        return True
         
     @staticmethod
     def delete_attachment(
@@ -210,8 +574,11 @@ class SpecialService(BaseService):
         BaseService.validate_user(user_id=user_id)
         
         # 특정 attachment_id에 대한 attachment 삭제
+        blob_sha256 = SpecialRepository.get_attachment_blob_sha256(attachment_id)
         success = SpecialRepository.delete_attachment(
             attachment_id=attachment_id
         )
+        if success:
+            get_blob_store().release(blob_sha256)
         
         return success
\ No newline at end of file
@@ -1,6 +1,7 @@
 from repositories.termsNconditions_repository import TermsNConditionsRepository
+from services.reference_cache import terms_cache
 from base_service import BaseService
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 
 class TermsNConditionsService:
@@ -29,6 +30,7 @@ class TermsNConditionsService:
         
         
         if TermsNConditionsRepository.create_query(query=query, code=code):
+            terms_cache.invalidate()
             return {"message": "약관제한목록 제한명이 성공적으로 등록되었습니다."}
         else:
             raise ValueError("약관제한목록 제한명 등록 중 오류가 발생했습니다.")
@@ -59,6 +61,7 @@ class TermsNConditionsService:
             raise ValueError("이미 등록된 질문입니다.")
             
         if TermsNConditionsRepository.update_query(termsNconditions_id=termsNconditions_id, query=query, code=code):
+            terms_cache.invalidate()
             return {"message": f"{termsNconditions_id}번 제한명이 성공적으로 수정되었습니다."}
         else:
             raise ValueError(f"{termsNconditions_id}번 제한명 수정 중 오류가 발생했습니다.")
@@ -84,6 +87,7 @@ class TermsNConditionsService:
             raise ValueError(f"{termsNconditions_id}번 제한명을 찾을 수 없습니다.")
             
         if TermsNConditionsRepository.delete_query(termsNconditions_id):
+            terms_cache.invalidate()
             return {"message": f"{termsNconditions_id}번 제한명이 성공적으로 삭제되었습니다."}
         else:
             raise ValueError(f"{termsNconditions_id}번 제한명 삭제 중 오류가 발생했습니다.")
@@ -96,6 +100,15 @@ class TermsNConditionsService:
         Returns:
             List[Dict[str, Any]]: 모든 약관제한목록 항목 목록
         """
-        raw_data = TermsNConditionsRepository.get_all_querys()
-        # (id, query) 튜플을 딕셔너리로 변환
-        return raw_data
\ No newline at end of file
+        return terms_cache.get().data
+
+    @staticmethod
+    def get_all_querys_with_etag() -> Tuple[List[Dict[str, Any]], str]:
+        """
+        모든 약관제한목록 항목과 그 목록의 ETag를 함께 조회합니다.
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: 약관제한목록 항목 목록, ETag
+        """
+        entry = terms_cache.get()
+        return entry.data, entry.etag
@@ -32,10 +32,26 @@ CREATE TABLE checklist (
     UNIQUE KEY unique_question (question(255))
 );
 
+-- 자주 바뀌지 않는 기준 데이터(체크리스트, 약관제한목록)의 변경 버전
+-- 여러 워커 프로세스가 이 값을 확인하여 메모리 캐시를 무효화함
+CREATE TABLE reference_data_version (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE file_blob (
+    sha256 CHAR(64) PRIMARY KEY COMMENT '파일 내용 SHA-256 해시',
+    size BIGINT NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE contract(
     id INT AUTO_INCREMENT PRIMARY KEY,
     contract_name VARCHAR(4000) NOT NULL,
     file_name VARCHAR(255) NOT NULL,
+    blob_sha256 CHAR(64) DEFAULT NULL,
     embedding_id VARCHAR(4000) DEFAULT NULL,
     uploader_id INT,
     keypoint_processer_id INT DEFAULT NULL,
@@ -51,6 +67,41 @@ CREATE TABLE contract(
     FOREIGN KEY (checklist_processer_id) REFERENCES user(id) ON DELETE SET NULL
 );
 
+CREATE TABLE document (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    document_name VARCHAR(4000) NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    blob_sha256 CHAR(64) DEFAULT NULL COMMENT '파일 내용 SHA-256 해시 (file_blob 참조)',
+    embedding_id VARCHAR(4000) DEFAULT NULL,
+    doc_type VARCHAR(50),
+    user_id INT,
+    current_state INT DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES user(id) ON DELETE SET NULL,
+    INDEX idx_document_file_name (file_name)
+);
+
+CREATE TABLE contract_upload_batch (
+    id VARCHAR(36) PRIMARY KEY,
+    uploader_id INT,
+    total_files INT DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (uploader_id) REFERENCES user(id) ON DELETE SET NULL
+);
+
+CREATE TABLE contract_upload_batch_item (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    batch_id VARCHAR(36) NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    contract_name VARCHAR(4000) NOT NULL,
+    contract_id INT DEFAULT NULL,
+    upload_status VARCHAR(20) NOT NULL COMMENT '업로드 상태 (STORED, REJECTED)',
+    message VARCHAR(1000) DEFAULT NULL,
+    FOREIGN KEY (batch_id) REFERENCES contract_upload_batch(id) ON DELETE CASCADE,
+    FOREIGN KEY (contract_id) REFERENCES contract(id) ON DELETE SET NULL,
+    INDEX idx_batch_id (batch_id)
+);
+
 CREATE TABLE checklist_result(
     id INT AUTO_INCREMENT PRIMARY KEY,
     contract_id INT,
@@ -79,15 +130,30 @@ CREATE TABLE keypoint_result(
     UNIQUE KEY unique_contract_terms (contract_id, termsNconditions_id)
 );
 
+-- 계약서별 체크리스트/키포인트 결과 요약 (결과를 변경하는 트랜잭션에서 함께 갱신됨)
+CREATE TABLE contract_review_summary (
+    contract_id INT PRIMARY KEY,
+    checklist_result_count INT NOT NULL DEFAULT 0,
+    checklist_value_count INT NOT NULL DEFAULT 0,
+    keypoint_match_count INT NOT NULL DEFAULT 0,
+    top_match_rate FLOAT DEFAULT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (contract_id) REFERENCES contract(id) ON DELETE CASCADE
+);
+
 CREATE TABLE instruction_pef (
     id INT AUTO_INCREMENT PRIMARY KEY,
     performer_id INT,
-    file_name VARCHAR(255) UNIQUE NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    blob_sha256 CHAR(64) DEFAULT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_fund_item VARCHAR(1) DEFAULT 'F',
     company_detail VARCHAR(4000) DEFAULT NULL,
     other_specs_text VARCHAR(4000) DEFAULT NULL,
-    FOREIGN KEY (performer_id) REFERENCES user(id)
+    analysis_status VARCHAR(20) NOT NULL DEFAULT 'COMPLETE' COMMENT 'AI 분석 상태 (PENDING, RUNNING, COMPLETE, ERROR)',
+    analysis_error VARCHAR(4000) DEFAULT NULL,
+    FOREIGN KEY (performer_id) REFERENCES user(id),
+    INDEX idx_pef_analysis_status (analysis_status)
 );
 
 
@@ -100,17 +166,26 @@ CREATE TABLE transaction_history (
     account_number VARCHAR(255),
     holder_name VARCHAR(255),
     amount VARCHAR(255),
+    amount_value DECIMAL(20, 2) DEFAULT NULL COMMENT 'amount를 숫자로 변환한 값 (집계용, 변환 실패 시 NULL)',
     process_date DATE,
-    FOREIGN KEY (instruction_pef_id) REFERENCES instruction_pef(id) ON DELETE CASCADE
+    FOREIGN KEY (instruction_pef_id) REFERENCES instruction_pef(id) ON DELETE CASCADE,
+    INDEX idx_tx_process_date (process_date),
+    INDEX idx_tx_deal_type_date (deal_type, process_date),
+    INDEX idx_tx_bank_date (bank_name, process_date),
+    INDEX idx_tx_holder_date (holder_name, process_date)
 );
 
 
 CREATE TABLE instruction_special (
     id INT AUTO_INCREMENT PRIMARY KEY,
     performer_id INT,
-    file_name VARCHAR(255) UNIQUE NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    blob_sha256 CHAR(64) DEFAULT NULL,
     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (performer_id) REFERENCES user(id)
+    analysis_status VARCHAR(20) NOT NULL DEFAULT 'COMPLETE' COMMENT 'AI 분석 상태 (PENDING, RUNNING, COMPLETE, ERROR)',
+    analysis_error VARCHAR(4000) DEFAULT NULL,
+    FOREIGN KEY (performer_id) REFERENCES user(id),
+    INDEX idx_special_analysis_status (analysis_status)
 );
 
 CREATE TABLE instruction_special_result (
@@ -122,18 +197,46 @@ CREATE TABLE instruction_special_result (
     all_qualities VARCHAR(500),
     average_quality VARCHAR(255),
     saved_json VARCHAR(4000),
+    result_content_z MEDIUMBLOB DEFAULT NULL COMMENT '압축 저장된 result_content (크기가 클 때 result_content 대신 사용)',
+    saved_json_z MEDIUMBLOB DEFAULT NULL COMMENT '압축 저장된 saved_json (크기가 클 때 saved_json 대신 사용)',
+    version INT NOT NULL DEFAULT 1 COMMENT '수정할 때마다 1씩 증가 (낙관적 동시성 제어)',
     FOREIGN KEY (instruction_special_id) REFERENCES instruction_special(id) ON DELETE CASCADE
 );
 
 CREATE TABLE attachment (
     id INT AUTO_INCREMENT PRIMARY KEY,
     instruction_special_id INT,
-    file_name VARCHAR(255) UNIQUE NOT NULL,
-    FOREIGN KEY (instruction_special_id) REFERENCES instruction_special(id) ON DELETE CASCADE
+    file_name VARCHAR(255) NOT NULL,
+    blob_sha256 CHAR(64) DEFAULT NULL,
+    FOREIGN KEY (instruction_special_id) REFERENCES instruction_special(id) ON DELETE CASCADE,
+    UNIQUE KEY unique_special_attachment_name (instruction_special_id, file_name)
 );
 
 
 
+CREATE TABLE ai_job (
+    id VARCHAR(36) PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    job_status VARCHAR(20) NOT NULL COMMENT '작업 상태 (PENDING, RUNNING, COMPLETE, ERROR)',
+    requested_by INT DEFAULT NULL,
+    request_json TEXT,
+    result_json MEDIUMTEXT,
+    error_message VARCHAR(4000) DEFAULT NULL,
+    callback_url VARCHAR(2000) DEFAULT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (requested_by) REFERENCES user(id) ON DELETE SET NULL,
+    INDEX idx_job_status (job_status)
+);
+
+CREATE TABLE ai_result_file (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    file_name VARCHAR(255) UNIQUE NOT NULL COMMENT 'AI 서버의 결과 파일 이름',
+    blob_sha256 CHAR(64) NOT NULL,
+    size BIGINT NOT NULL,
+    downloaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
 -- OCR 파일 테이블
 CREATE TABLE IF NOT EXISTS ocr_files (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -162,6 +265,8 @@ CREATE TABLE IF NOT EXISTS ocr_pages (
     ocr_status VARCHAR(20) NOT NULL COMMENT '처리 상태 (SUCCESS, FAIL)',
     page_file_data TEXT COMMENT 'OCR 처리된 이미지 파일 경로',
     rotate FLOAT DEFAULT 0.0,
+    layout_text MEDIUMTEXT COMMENT '읽기 순서로 정렬된 줄/문단 텍스트',
+    layout_json MEDIUMTEXT COMMENT '줄/문단 구조 (JSON)',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (ocr_file_id) REFERENCES ocr_files(id) ON DELETE CASCADE,
     INDEX idx_ocr_file_id (ocr_file_id),